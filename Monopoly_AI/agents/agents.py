@@ -1,18 +1,46 @@
-import gymnasium as gym
-
-# Assurez-vous que le code de registration a déjà été exécuté
-env = gym.make("MonopolyEnv-v1")
+from typing import List, Optional
+import numpy as np
+from environment.board import Board, get_board
 
 
 class AgentPolicy:
+    """
+    Heuristic management decisions from the precomputed valuation tables of the board
+    (`Board.valuation`): each decision is one gather over the candidate properties.
+    """
+
+    def __init__(self, board: Optional[Board] = None):
+        self.board = board or get_board()
+        self.valuation = self.board.valuation
+
+    def _indices(self, props: List[str]) -> np.ndarray:
+        return np.array([self.board.property_index[prop] for prop in props], dtype=np.intp)
+
+    def _houses(self, indices: np.ndarray, state: dict) -> np.ndarray:
+        """Houses built on the candidates, read from the "self_houses" observation when provided."""
+        houses = state.get("self_houses") if state else None
+        if houses is None:
+            return np.zeros(len(indices), dtype=np.intp)
+        return np.asarray(houses, dtype=np.intp)[indices]
+
     def choose_mortgage_property(self, mortgageable_props: List[str], state: dict) -> int:
         """À connecter à votre modèle d'IA"""
-        # Exemple : choisir la propriété la plus chère
-        values = [self._get_property_value(prop) for prop in mortgageable_props]
-        return np.argmax(values)
+        # Exemple : la propriété qui rapporte le plus d'argent par unité de revenu espéré perdu
+        values = self._get_property_value(self._indices(mortgageable_props), state)
+        return int(np.argmax(values))
 
     def choose_build_property(self, buildable_props: List[str], state: dict) -> int:
         """À connecter à votre modèle d'IA"""
         # Exemple : choisir la propriété avec le meilleur ROI
-        roi = [self._calculate_roi(prop) for prop in buildable_props]
-        return np.argmax(roi)
\ No newline at end of file
+        indices = self._indices(buildable_props)
+        roi = self._calculate_roi(indices, self._houses(indices, state))
+        return int(np.argmax(roi))
+
+    def _get_property_value(self, indices: np.ndarray, state: dict) -> np.ndarray:
+        """Mortgage value of the candidates per unit of expected income given up (unbuilt, owned alone)."""
+        valuation = self.valuation
+        return valuation.mortgage_value[indices] / np.maximum(valuation.base_income[indices], 1e-9)
+
+    def _calculate_roi(self, indices: np.ndarray, houses: np.ndarray) -> np.ndarray:
+        """Marginal ROI of the next house on each candidate."""
+        return self.valuation.next_house_roi(indices, houses)
@@ -0,0 +1,321 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from agents.agents import AgentPolicy
+from environment.engine import DecisionPolicy, MonopolyEngine
+from environment.gameV3 import ENV_PHASE
+from environment.opponents import BatchedPolicy, do_nothing
+from environment.vector_env import MonopolyVectorEnv
+
+# Decision kinds searched by the planner; "build" and "mortgage" are loops of one-property decisions
+BUILD = "build"
+MORTGAGE = "mortgage"
+BUY = "buy"
+AUCTION = "auction"
+# Auction bids tried, as fractions of the property price (on top of leaving and the minimal raise)
+BID_FRACTIONS = (0.5, 0.75, 1.0)
+# Visits of an action of a loop decision after which its resulting decision gets its own node
+EXPAND_AFTER = 2
+
+
+class Node:
+    """Statistics of one decision: visits and total playout value of each candidate action."""
+
+    __slots__ = ("actions", "visits", "value")
+
+    def __init__(self, actions: List[Any]):
+        self.actions = actions
+        self.visits = np.zeros(len(actions), dtype=np.int64)
+        self.value = np.zeros(len(actions))
+
+    def select(self, exploration: float) -> int:
+        """UCB1 choice of an action; every action is tried once first."""
+        untried = np.flatnonzero(self.visits == 0)
+        if len(untried):
+            return int(untried[0])
+        mean = self.value / self.visits
+        bonus = exploration * np.sqrt(np.log(self.visits.sum()) / self.visits)
+        return int(np.argmax(mean + bonus))
+
+    def best(self) -> int:
+        """Most visited action, ties broken by mean value."""
+        mean = self.value / np.maximum(self.visits, 1)
+        return int(np.lexsort((mean, self.visits))[-1])
+
+
+class BatchedRollouts:
+    """
+    Playouts of a position on `MonopolyVectorEnv`: the position is copied into every game of the batch, which
+    is then played by `BatchedPolicy` decisions for all seats for `horizon` rounds.
+
+    A playout is worth the share of the searching player in the net worth of the table at its end (money,
+    plus the price of unmortgaged properties, their mortgage value otherwise, and the cost of the houses):
+    1 for a win, 0 after a bankruptcy. The vector env plays simplified rules (no cards, no jail stays), so
+    values are estimates of the engine's game.
+    """
+
+    def __init__(self, policy: Union[BatchedPolicy, str], num_games: int = 32, horizon: int = 40,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            policy: Playout policy of every seat, or the name of a built-in one (`environment.opponents`).
+            num_games (int): Playouts run together.
+            horizon (int): Rounds (learner steps) played before a playout is scored.
+            seed (Optional[int]): Seed of the playout dice.
+        """
+        self.policy = policy
+        self.num_games = num_games
+        self.horizon = horizon
+        self.seed = seed
+        # One batch per searching seat, which the vector env plays as its learner
+        self._envs: Dict[int, MonopolyVectorEnv] = {}
+
+    def _env(self, seat: int) -> MonopolyVectorEnv:
+        env = self._envs.get(seat)
+        if env is None:
+            env = MonopolyVectorEnv(self.num_games, copy=False, opponents=self.policy, learner_seat=seat)
+            env.reset(seed=None if self.seed is None else self.seed + seat)
+            self._policy = env.opponents[0]
+            self._worth = env.price.astype(np.int64), env.mortgage_value.astype(np.int64), env.house_cost
+            self._envs[seat] = env
+        return env
+
+    def value(self, env: MonopolyVectorEnv, seat: int) -> np.ndarray:
+        """float64[num_games], net worth share of `seat` in every game."""
+        state = env.state
+        price, mortgage_value, house_cost = self._worth
+        assets = np.where(state.mortgaged, mortgage_value, price) + state.houses * house_cost
+        owned = state.owner[:, None, :] == np.arange(state.num_players)[:, None]
+        worth = state.money + (owned * assets[:, None, :]).sum(axis=-1)
+        total = worth.sum(axis=1)
+        return worth[:, seat] / np.maximum(total, 1)
+
+    def evaluate(self, snapshot: bytes, seat: int, idle_first: bool = False) -> float:
+        """
+        Mean playout value of a position for a seat.
+
+        Args:
+            snapshot (bytes): Position as `MonopolyRLEnv.snapshot`; the player to move may be anyone.
+            seat (int): Searching seat.
+            idle_first (bool): Whether `seat` skips its management on its first turn (its decision was just
+                               taken).
+
+        Returns:
+            float: Mean value over the batch.
+        """
+        env = self._env(seat)
+        env.load_snapshot(snapshot)
+        state, rows = env.state, np.arange(self.num_games)
+        seats = np.full(self.num_games, seat)
+        values = np.zeros(self.num_games)
+        done = state.bankrupt[:, seat] | (state.bankrupt.sum(axis=1) >= state.num_players - 1)
+        values[done] = self.value(env, seat)[done]
+        for step in range(self.horizon):
+            if done.all():
+                break
+            actions = do_nothing(self.num_games) if idle_first and step == 0 else \
+                self._policy.start_turn(env, rows, seats)
+            _, _, terminated, truncated, _ = env.step(actions)
+            ended = (terminated | truncated) & ~done
+            if ended.any():
+                values[ended] = self.value(env, seat)[ended]
+                done |= ended
+        values[~done] = self.value(env, seat)[~done]
+        return float(values.mean())
+
+
+class MCTSPlanner(DecisionPolicy, AgentPolicy):
+    """
+    Monte Carlo tree search over the decisions of `MonopolyEngine`: building, mortgaging, buying and auction
+    bids (the engine has no trade decision point).
+
+    At each decision, the candidates are applied to a scratch engine restored from `MonopolyEngine.snapshot`,
+    and the resulting positions are scored by batched playouts (`BatchedRollouts`), choosing which candidate
+    to play out next with UCB1. Build and mortgage decisions are loops of one-property choices; a candidate
+    tried `EXPAND_AFTER` times gets a node for the next choice of the loop, so the search deepens along them.
+    Nodes are kept in a table keyed by the decision and the engine's state blob, so a decision reached by an
+    earlier search (e.g. the next house of a build loop) starts from its statistics.
+
+    Usage:
+        engine = MonopolyEngine([MCTSPlanner(node_budget=16), DecisionPolicy(), DecisionPolicy(), DecisionPolicy()])
+        engine.play_game(seed=0)
+    """
+
+    def __init__(self, node_budget: Optional[int] = 16, time_budget: Optional[float] = None,
+                 rollout_policy: Union[BatchedPolicy, str] = "greedy_builder", num_playouts: int = 32,
+                 horizon: int = 40, exploration: float = 0.5, max_nodes: int = 100_000, seed: Optional[int] = None):
+        """
+        Args:
+            node_budget (Optional[int]): Playout batches per decision, or None for no limit.
+            time_budget (Optional[float]): Seconds per decision, or None for no limit. At least one of the budgets
+                                           must be set.
+            rollout_policy: Policy of every seat in the playouts.
+            num_playouts (int): Playouts per batch.
+            horizon (int): Rounds per playout.
+            exploration (float): UCB1 exploration constant (values are net worth shares, in [0, 1]).
+            max_nodes (int): Size of the node table above which it is cleared.
+            seed (Optional[int]): Seed of the playout dice.
+        """
+        if node_budget is None and time_budget is None:
+            raise ValueError("MCTSPlanner needs a node budget or a time budget")
+        AgentPolicy.__init__(self)
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.max_nodes = max_nodes
+        self.rollouts = BatchedRollouts(rollout_policy, num_playouts, horizon, seed)
+        self.nodes: Dict[Tuple, Node] = {}
+        self._scratch: Optional[MonopolyEngine] = None
+
+    # Decision points of the engine
+
+    def start_turn(self, game: Any, player_idx: int) -> None:
+        while True:
+            prop_idx = self.search(game, player_idx, BUILD)
+            if prop_idx is None:
+                return
+            game.build(player_idx, prop_idx)
+
+    def buy_property(self, game: Any, player_idx: int, property_idx: int) -> bool:
+        return self.search(game, player_idx, BUY, property_idx)
+
+    def auction_bid(self, game: Any, player_idx: int, property_idx: int, current_bid: int) -> int:
+        return self.search(game, player_idx, AUCTION, (property_idx, current_bid))
+
+    def raise_funds(self, game: Any, player_idx: int, amount: int) -> None:
+        while game.state.money[player_idx] < amount:
+            prop_idx = self.search(game, player_idx, MORTGAGE, amount)
+            if prop_idx is None:
+                return
+            game.mortgage(player_idx, prop_idx)
+
+    # `AgentPolicy` decision points: `state` must carry the engine as "game" and the deciding seat as "player".
+    # They return the position of a candidate and cannot express "none", so the search runs over the candidates
+    # only, and the heuristic choice of `AgentPolicy` is used if it still returns None ("stop").
+
+    def choose_build_property(self, buildable_props: List[str], state: dict) -> int:
+        if "game" not in state:
+            return super().choose_build_property(buildable_props, state)
+        game = state["game"]
+        indices = self._indices(buildable_props)
+        choice = self.search(game, state["player"], BUILD, candidates=indices.tolist())
+        if choice is None:
+            return super().choose_build_property(buildable_props, {"self_houses": game.state.houses})
+        return int(np.argmax(indices == choice))
+
+    def choose_mortgage_property(self, mortgageable_props: List[str], state: dict) -> int:
+        if "game" not in state:
+            return super().choose_mortgage_property(mortgageable_props, state)
+        game = state["game"]
+        indices = self._indices(mortgageable_props)
+        amount = state.get("amount", int(game.state.money[state["player"]]) + 1)
+        choice = self.search(game, state["player"], MORTGAGE, amount, candidates=indices.tolist())
+        if choice is None:
+            return super().choose_mortgage_property(mortgageable_props, state)
+        return int(np.argmax(indices == choice))
+
+    # Search
+
+    def candidates(self, engine: MonopolyEngine, player_idx: int, kind: str, context: Any) -> List[Any]:
+        """Actions of a decision in the current position of `engine`."""
+        if kind == BUILD:
+            return [None] + engine.buildable_properties(player_idx)
+        if kind == MORTGAGE:
+            if engine.state.money[player_idx] >= context:
+                return [None]
+            return engine.mortgageable_properties(player_idx) or [None]
+        if kind == BUY:
+            return [False, True]
+        property_idx, current_bid = context
+        money = int(engine.state.money[player_idx])
+        price = engine.price[property_idx]
+        bids = {current_bid + 1} | {int(price * fraction) for fraction in BID_FRACTIONS}
+        return [0] + sorted(bid for bid in bids if current_bid < bid <= money)
+
+    def _apply(self, engine: MonopolyEngine, player_idx: int, kind: str, context: Any, action: Any) -> bool:
+        """Plays an action on the scratch engine; returns whether the same decision loop continues."""
+        state = engine.state
+        if kind == BUILD:
+            return action is not None and engine.build(player_idx, action)
+        if kind == MORTGAGE:
+            return action is not None and engine.mortgage(player_idx, action) and state.money[player_idx] < context
+        if kind == BUY:
+            property_idx, price = context, engine.price[context]
+        else:
+            (property_idx, _), price = context, action
+        if action:
+            # A bid is scored as winning the auction at that price
+            state.money[player_idx] -= price
+            state.transfer(property_idx, player_idx)
+        return False
+
+    def _position(self, engine: MonopolyEngine, player_idx: int, kind: str) -> bytes:
+        """Playout start: the player's own turn for builds, made before the dice; the next player's otherwise."""
+        seat = player_idx
+        if kind != BUILD:
+            bankrupt = engine.state.bankrupt
+            for shift in range(1, engine.num_players + 1):
+                seat = (player_idx + shift) % engine.num_players
+                if not bankrupt[seat]:
+                    break
+        return engine.state.snapshot() + ENV_PHASE.pack(seat)
+
+    def search(self, game: MonopolyEngine, player_idx: int, kind: str, context: Any = None,
+               candidates: Optional[List[Any]] = None) -> Any:
+        """
+        Chooses the action of a decision of `player_idx` in the current position of `game`.
+
+        Args:
+            game (MonopolyEngine): The game; it is left untouched.
+            player_idx (int): Deciding seat.
+            kind (str): `BUILD`, `MORTGAGE`, `BUY` or `AUCTION`.
+            context: Property offered (`BUY`), (property, current bid) (`AUCTION`), amount due (`MORTGAGE`).
+            candidates (Optional[List[Any]]): Actions to choose from; all the legal ones when None.
+
+        Returns:
+            The chosen action: a property index or None to stop (`BUILD`, `MORTGAGE`), a bool (`BUY`), a bid
+            (`AUCTION`).
+        """
+        scratch = self._scratch
+        if scratch is None or scratch.num_players != game.num_players:
+            scratch = self._scratch = game.clone()
+        root = game.snapshot()
+        if len(self.nodes) > self.max_nodes:
+            self.nodes.clear()
+        key = (kind, player_idx, context, root[0])
+        node = self.nodes.get(key)
+        if node is None or (candidates is not None and node.actions != candidates):
+            if candidates is None:
+                scratch.restore(root)
+                candidates = self.candidates(scratch, player_idx, kind, context)
+            node = self.nodes[key] = Node(candidates)
+        if len(node.actions) == 1:
+            return node.actions[0]
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        iterations = 0
+        while ((self.node_budget is None or iterations < self.node_budget)
+               and (deadline is None or time.perf_counter() < deadline)):
+            iterations += 1
+            scratch.restore(root)
+            path, current = [], node
+            while True:
+                action_idx = current.select(self.exploration)
+                path.append((current, action_idx))
+                if not self._apply(scratch, player_idx, kind, context, current.actions[action_idx]):
+                    break
+                child_key = (kind, player_idx, context, scratch.snapshot()[0])
+                child = self.nodes.get(child_key)
+                if child is None:
+                    if current.visits[action_idx] + 1 < EXPAND_AFTER:
+                        break
+                    child = self.nodes[child_key] = Node(self.candidates(scratch, player_idx, kind, context))
+                if len(child.actions) == 1 and child.actions[0] is None:
+                    break
+                current = child
+            value = self.rollouts.evaluate(self._position(scratch, player_idx, kind), player_idx,
+                                           idle_first=kind == BUILD)
+            for visited, action_idx in path:
+                visited.visits[action_idx] += 1
+                visited.value[action_idx] += value
+        return node.actions[node.best()]
@@ -1,2 +1,8 @@
-from .board import Board
-from .player import Player
\ No newline at end of file
+from .bitboard import ColorGroupMasks
+from .board import Board, get_board
+from .engine import MonopolyEngine, DecisionPolicy
+from .markov import LandingModel, landing_model
+from .player import Player
+from .selfplay import SelfPlayRunner
+from .state import GameState
+from .valuation import PropertyValuation
\ No newline at end of file
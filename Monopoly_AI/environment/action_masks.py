@@ -0,0 +1,134 @@
+import numpy as np
+from environment.board import Board
+from environment.state import GameState
+
+
+class ActionMasks:
+    """
+    Incrementally maintained mortgage and build masks of every player of a single game.
+
+    The masks follow the legality rules of `MonopolyRLEnv._handle_mortgage` and `_handle_build`:
+      - mortgage: the player owns the property and it is not mortgaged,
+      - build: the player owns the property, it is a street, it is not mortgaged, the player owns every
+        street of its color group, and the player can pay the house cost.
+    Instead of recomputing them for every observation, the game calls `update_property` when the owner,
+    mortgage state or houses of a property change and `update_money` when a player's cash changes; only the
+    cells that can be affected are rewritten. `refresh` rebuilds everything.
+
+    Masks are exposed both as bool arrays (`mortgage`, `build`, shape `(num_players, num_properties)`) and as
+    packed ints (`mortgage_bits`, `build_bits`, bit `i` set when property `i` is allowed).
+    """
+
+    def __init__(self, state: GameState, board: Board):
+        """
+        Builds the per-property tables and computes the initial masks.
+
+        Args:
+            state (GameState): Game state the masks describe (single game).
+            board (Board): Board providing the property data and color groups.
+        """
+        self.state = state
+        num_players = state.num_players
+        num_properties = len(board.property_order)
+        self.num_players = num_players
+
+        self._is_street = board.is_street
+        self._house_cost = board.property_data[:, 8].astype(np.int32)
+        # For each property, the streets whose build mask depends on its owner and mortgage state: its whole
+        # color group for a street, nothing for stations and utilities
+        self._dependents = [
+            board.color_group_members[board.property_color_group[idx]] if self._is_street[idx]
+            else np.empty(0, dtype=np.intp)
+            for idx in range(num_properties)
+        ]
+        # Streets of each property's color group (padded with the property itself)
+        self._group_members = board.property_group_members
+        self._bit_weights = np.left_shift(np.int64(1), np.arange(num_properties, dtype=np.int64))
+        self._bits = [1 << idx for idx in range(num_properties)]
+        self._color_group = [int(group) for group in board.property_color_group]
+        # Player whose mortgage mask holds each property, and player owning each color group whole (-1: none);
+        # they tell `update_property` which rows it has to patch
+        self._mortgage_holder = [-1] * num_properties
+        self._monopoly_owner = [-1] * (max(self._color_group) + 1)
+        self._players = np.arange(num_players, dtype=np.int8)[:, None]
+
+        self.mortgage = np.zeros((num_players, num_properties), dtype=np.bool_)
+        self.build = np.zeros((num_players, num_properties), dtype=np.bool_)
+        # Build mask before the cash check, so that a money change only needs a comparison
+        self._buildable = np.zeros((num_players, num_properties), dtype=np.bool_)
+        self.mortgage_bits = np.zeros(num_players, dtype=np.int64)
+        self.build_bits = np.zeros(num_players, dtype=np.int64)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Recomputes every mask from the game state, with whole-array operations."""
+        state = self.state
+        owned = state.owner == self._players
+        np.logical_and(owned, ~state.mortgaged, out=self.mortgage)
+        group_owners = state.owner[self._group_members]
+        monopoly = self._is_street & (group_owners == group_owners[:, :1]).all(axis=1)
+        np.logical_and(self.mortgage, monopoly, out=self._buildable)
+        np.logical_and(self._buildable, self._house_cost <= state.money[:, None], out=self.build)
+        self.mortgage_bits[:] = self.mortgage @ self._bit_weights
+        self.build_bits[:] = self.build @ self._bit_weights
+        self._mortgage_holder = np.where(self.mortgage.any(axis=0), self.mortgage.argmax(axis=0), -1).tolist()
+        for idx, group in enumerate(self._color_group):
+            if self._is_street[idx]:
+                self._monopoly_owner[group] = int(state.owner[idx]) if monopoly[idx] else -1
+
+    def update_property(self, property_idx: int) -> None:
+        """
+        Updates the masks after the owner, mortgage state or houses of a property changed.
+
+        Only the mortgage bit of the property and the build cells of its color group are patched, in the rows
+        of the players who held them before and after the change.
+
+        Args:
+            property_idx (int): Index of the changed property.
+        """
+        state = self.state
+        owner = int(state.owner[property_idx])
+        holder = owner if owner >= 0 and not state.mortgaged[property_idx] else -1
+        previous = self._mortgage_holder[property_idx]
+        if holder != previous:
+            bit = self._bits[property_idx]
+            if previous >= 0:
+                self.mortgage[previous, property_idx] = False
+                self.mortgage_bits[previous] &= ~bit
+            if holder >= 0:
+                self.mortgage[holder, property_idx] = True
+                self.mortgage_bits[holder] |= bit
+            self._mortgage_holder[property_idx] = holder
+
+        group = self._dependents[property_idx]
+        if not len(group):
+            return
+        color = self._color_group[property_idx]
+        previous = self._monopoly_owner[color]
+        group_owners = state.owner[group]
+        group_owner = int(group_owners[0])
+        monopoly_owner = group_owner if group_owner >= 0 and (group_owners == group_owner).all() else -1
+        if previous >= 0:
+            self._buildable[previous, group] = False
+        if monopoly_owner >= 0:
+            self._buildable[monopoly_owner, group] = ~state.mortgaged[group]
+        self._monopoly_owner[color] = monopoly_owner
+        if previous >= 0:
+            self._update_build(previous)
+        if monopoly_owner >= 0 and monopoly_owner != previous:
+            self._update_build(monopoly_owner)
+
+    def update_money(self, player_idx: int) -> None:
+        """
+        Updates the build mask of a player after their money changed.
+
+        Args:
+            player_idx (int): Index of the player.
+        """
+        self._update_build(player_idx)
+
+    def _update_build(self, player_idx: int) -> None:
+        """Applies the cash check to the pre-cash build mask of a player."""
+        row = self.build[player_idx]
+        np.logical_and(self._buildable[player_idx], self._house_cost <= self.state.money[player_idx], out=row)
+        self.build_bits[player_idx] = row @ self._bit_weights
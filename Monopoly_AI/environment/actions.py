@@ -0,0 +1,162 @@
+from typing import Any, Dict, Optional
+import numpy as np
+import gymnasium as gym
+from environment.board import Board
+
+# Management action types of the Dict action space
+MORTGAGE = 0
+BUILD = 1
+TRADE = 2      # Money for one of the partner's properties
+SWAP = 3       # The player's first property for the partner's `property_idx`-th one
+DO_NOTHING = 4
+
+# Number of "other player" slots a trade can target
+NUM_PARTNERS = 3
+# Offers of a money-for-property trade, as multiples of the property's price
+TRADE_AMOUNT_MULTIPLES = (0.5, 1.0, 1.5, 2.0)
+
+
+class DiscreteActions:
+    """
+    Flattening of the management actions into a single `Discrete(K)` space, with one legal-action mask.
+
+    Flat indices are laid out by action type, each block in C order:
+      - `MORTGAGE`:   property                                 (num_properties)
+      - `BUILD`:      property                                 (num_properties)
+      - `TRADE`:      partner slot x property x amount bucket  (NUM_PARTNERS * num_properties * num_buckets)
+      - `SWAP`:       partner slot x rank of the partner's property (NUM_PARTNERS * num_properties)
+      - `DO_NOTHING`: one index
+    The decode tables give, for every flat index, the fields of the equivalent Dict action; the amount of a
+    trade is its bucket's multiple of the property price (`TRADE_AMOUNT_MULTIPLES`). `legal_mask` computes the
+    actions that `MonopolyRLEnv.step` accepts without a penalty, for one game or a batch of games.
+
+    Attributes:
+        action_type (np.ndarray): int64[K], Dict `action_type` of each flat index.
+        property_idx (np.ndarray): int64[K], Dict `property_idx` (rank in the partner's properties for `SWAP`).
+        trade_partner (np.ndarray): int64[K], Dict `trade_partner`.
+        trade_amount (np.ndarray): int32[K], Dict `trade_amount`.
+        amount_bucket (np.ndarray): int64[K], index in `TRADE_AMOUNT_MULTIPLES` (0 outside `TRADE`).
+        space (gym.spaces.Discrete): The flat action space.
+    """
+
+    def __init__(self, board: Board, amount_multiples=TRADE_AMOUNT_MULTIPLES):
+        """
+        Builds the decode tables.
+
+        Args:
+            board (Board): Board providing the property prices.
+            amount_multiples: Price multiples offered by the trade buckets.
+        """
+        num_properties = len(board.property_order)
+        num_buckets = len(amount_multiples)
+        self.num_properties = num_properties
+        self.num_buckets = num_buckets
+        price = board.property_data[:, 0].astype(np.int64)
+        # Offered amount of each (property, bucket)
+        self.trade_amounts = np.rint(price[:, None] * np.asarray(amount_multiples)).astype(np.int32)
+
+        # Start of each block of the flat index
+        self.mortgage_start = 0
+        self.build_start = num_properties
+        self.trade_start = 2 * num_properties
+        self.swap_start = self.trade_start + NUM_PARTNERS * num_properties * num_buckets
+        self.do_nothing = self.swap_start + NUM_PARTNERS * num_properties
+        self.size = self.do_nothing + 1
+
+        properties = np.arange(num_properties)
+        trade_partner, trade_property, trade_bucket = np.meshgrid(
+            np.arange(NUM_PARTNERS), properties, np.arange(num_buckets), indexing="ij")
+        swap_partner, swap_rank = np.meshgrid(np.arange(NUM_PARTNERS), properties, indexing="ij")
+        zeros = np.zeros(num_properties, dtype=np.int64)
+        self.action_type = np.concatenate((
+            np.full(num_properties, MORTGAGE), np.full(num_properties, BUILD),
+            np.full(trade_partner.size, TRADE), np.full(swap_partner.size, SWAP), [DO_NOTHING],
+        )).astype(np.int64)
+        self.property_idx = np.concatenate((properties, properties, trade_property.ravel(), swap_rank.ravel(), [0]))
+        self.trade_partner = np.concatenate((zeros, zeros, trade_partner.ravel(), swap_partner.ravel(), [0]))
+        self.amount_bucket = np.concatenate((zeros, zeros, trade_bucket.ravel(), np.zeros_like(swap_rank.ravel()), [0]))
+        self.trade_amount = np.zeros(self.size, dtype=np.int32)
+        self.trade_amount[self.trade_start:self.swap_start] = self.trade_amounts[
+            trade_property.ravel(), trade_bucket.ravel()]
+        for array in (self.action_type, self.property_idx, self.trade_partner, self.amount_bucket, self.trade_amount,
+                      self.trade_amounts):
+            array.flags.writeable = False
+
+        self.space = gym.spaces.Discrete(self.size)
+
+    def decode(self, index: int) -> Dict[str, Any]:
+        """
+        Dict action of a flat index.
+
+        Args:
+            index (int): Flat action.
+
+        Returns:
+            Dict[str, Any]: Action laid out as `make_action_space()`.
+        """
+        return {
+            "action_type": int(self.action_type[index]),
+            "property_idx": int(self.property_idx[index]),
+            "trade_partner": int(self.trade_partner[index]),
+            "trade_amount": self.trade_amount[index:index + 1],
+        }
+
+    def decode_batch(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Batched Dict action of an array of flat indices.
+
+        Args:
+            indices (np.ndarray): int[B], flat actions.
+
+        Returns:
+            Dict[str, np.ndarray]: Actions laid out as the batched `make_action_space()`.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return {
+            "action_type": self.action_type[indices],
+            "property_idx": self.property_idx[indices],
+            "trade_partner": self.trade_partner[indices],
+            "trade_amount": self.trade_amount[indices][:, None],
+        }
+
+    def legal_mask(self, mortgage: np.ndarray, build: np.ndarray, owner: np.ndarray, player: Any, money: Any,
+                   partners: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Flat actions accepted by the game without a penalty, for one game or a batch of games (leading axes).
+
+        Args:
+            mortgage (np.ndarray): bool[..., num_properties], mortgage mask of the current player.
+            build (np.ndarray): bool[..., num_properties], build mask of the current player.
+            owner (np.ndarray): int[..., num_properties], owner of every property.
+            player: int[...], current player.
+            money: int[...], money of the current player.
+            partners (np.ndarray): int[..., NUM_PARTNERS], seat in each partner slot, negative when empty.
+            out (Optional[np.ndarray]): bool[..., K] to write into.
+
+        Returns:
+            np.ndarray: bool[..., K], legal flat actions.
+        """
+        batch = np.shape(owner)[:-1]
+        if out is None:
+            out = np.empty(batch + (self.size,), dtype=np.bool_)
+        player = np.asarray(player)[..., None]
+        money = np.asarray(money)[..., None, None, None]
+        partners = np.asarray(partners)
+
+        out[..., self.mortgage_start:self.build_start] = mortgage
+        out[..., self.build_start:self.trade_start] = build
+
+        # Trade: the partner owns the property and the player can pay the offer
+        partner_owns = (owner[..., None, :] == partners[..., None]) & (partners[..., None] >= 0)
+        trade = out[..., self.trade_start:self.swap_start].reshape(
+            batch + (NUM_PARTNERS, self.num_properties, self.num_buckets))
+        np.logical_and(partner_owns[..., None], self.trade_amounts <= money, out=trade)
+
+        # Swap: the player owns a property and the partner owns more than `rank` of them
+        owns_any = (owner == player).any(axis=-1)[..., None, None]
+        partner_count = partner_owns.sum(axis=-1)[..., None]
+        swap = out[..., self.swap_start:self.do_nothing].reshape(batch + (NUM_PARTNERS, self.num_properties))
+        np.logical_and(np.arange(self.num_properties) < partner_count, owns_any, out=swap)
+
+        out[..., self.do_nothing] = True
+        return out
@@ -0,0 +1,115 @@
+from typing import Union
+import numpy as np
+from environment.board import Board
+from environment.rent import MAX_HOUSES
+from environment.state import PROPERTY_BITS
+
+# An ownership-style mask: a Python int for one player of one game, or an int64 array for several
+# (e.g. `GameState.owner_mask` of shape (num_players,) or (batch_size, num_players))
+Mask = Union[int, np.ndarray]
+
+
+def pack(flags: np.ndarray) -> Mask:
+    """
+    Packs boolean property flags into a bitmask (bit i set = flag i).
+
+    Args:
+        flags (np.ndarray): bool[..., num_properties], e.g. `GameState.mortgaged` of one game or of a batch.
+
+    Returns:
+        Mask: int for a single vector, int64[...] otherwise.
+    """
+    packed = flags @ PROPERTY_BITS[:flags.shape[-1]]
+    return int(packed) if np.ndim(packed) == 0 else packed
+
+
+class ColorGroupMasks:
+    """
+    Color groups of the board as bitmasks over property indices, for monopoly and buildability tests on
+    ownership masks (`GameState.owner_mask`, `Player.mask`).
+
+    Every query takes either a single mask (Python int) or an int64 array of masks, e.g. one per game of a
+    `(B,)` batch or the whole `(B, num_players)` owner mask, and answers with the same shape; a monopoly
+    test is an AND and a compare per color group.
+
+    Attributes:
+        group_masks (np.ndarray): int64[num_groups], streets of each color group (stations and utilities are
+                                  not color groups).
+        street_mask (int): All the streets.
+        property_group_mask (np.ndarray): int64[num_properties], group mask of each street, 0 for stations and
+                                          utilities.
+    """
+
+    def __init__(self, board: Board):
+        """
+        Args:
+            board (Board): Board providing the color groups.
+        """
+        groups = {int(board.property_color_group[idx]) for idx in np.flatnonzero(board.is_street)}
+        self.group_masks = np.array(
+            [int(PROPERTY_BITS[board.color_group_members[group]].sum()) for group in sorted(groups)], dtype=np.int64
+        )
+        self.street_mask = int(self.group_masks.sum())
+        self.property_group_mask = np.zeros(len(board.property_order), dtype=np.int64)
+        for group_mask in self.group_masks:
+            self.property_group_mask[PROPERTY_BITS[:len(board.property_order)] & group_mask != 0] = group_mask
+        # Plain ints for the single-game path
+        self._groups = tuple(int(group_mask) for group_mask in self.group_masks)
+        for array in (self.group_masks, self.property_group_mask):
+            array.flags.writeable = False
+
+    def monopolies(self, owner_mask: Mask) -> Mask:
+        """
+        Streets of the complete color groups of an ownership mask.
+
+        Args:
+            owner_mask (Mask): Owned properties.
+
+        Returns:
+            Mask: Union of the color groups fully contained in `owner_mask`, with the shape of `owner_mask`.
+        """
+        if isinstance(owner_mask, (int, np.integer)):
+            owner_mask = int(owner_mask)
+            monopolies = 0
+            for group in self._groups:
+                if owner_mask & group == group:
+                    monopolies |= group
+            return monopolies
+        groups = self.group_masks
+        complete = (owner_mask[..., None] & groups) == groups
+        return np.bitwise_or.reduce(np.where(complete, groups, 0), axis=-1)
+
+    def has_monopoly(self, owner_mask: Mask, property_idx: Union[int, np.ndarray]) -> Union[bool, np.ndarray]:
+        """
+        Whether the owner of `owner_mask` holds the whole color group of a street.
+
+        Args:
+            owner_mask (Mask): Owned properties.
+            property_idx (Union[int, np.ndarray]): Street index, or one index per mask.
+
+        Returns:
+            Union[bool, np.ndarray]: Monopoly flag(s); always False for stations and utilities.
+        """
+        group = self.property_group_mask[property_idx]
+        return (owner_mask & group == group) & (group != 0)
+
+    def buildable_mask(self, owner_mask: Mask, mortgaged_mask: Mask, houses: np.ndarray) -> Mask:
+        """
+        Streets a house can be built on: owned as part of a complete color group, not mortgaged and below a
+        hotel. Money is not checked.
+
+        Args:
+            owner_mask (Mask): Owned properties.
+            mortgaged_mask (Mask): Mortgaged properties (see `pack`), broadcastable against `owner_mask`.
+            houses (np.ndarray): int8[..., num_properties], houses of every property of the game(s); the leading
+                                 axes must broadcast against `owner_mask`.
+
+        Returns:
+            Mask: Buildable streets, with the shape of `owner_mask`.
+        """
+        full = pack(houses >= MAX_HOUSES)
+        if np.ndim(owner_mask) > np.ndim(full) > 0:
+            # (B,) per-game masks against a (B, P) owner mask
+            full = full[..., None]
+            mortgaged_mask = np.asarray(mortgaged_mask)[..., None]
+        return self.monopolies(owner_mask) & ~mortgaged_mask & ~full
@@ -1,25 +1,47 @@
 import numpy as np  # Import the numpy library, commonly used for numerical operations.
-from typing import List, Dict, Any # Import typing hints for better code readability and maintainability.
+from types import MappingProxyType  # Read-only dictionary views, used for the lookup tables.
+from typing import List, Dict, Any, Optional # Import typing hints for better code readability and maintainability.
+from utils.logger import EventLog  # Structured event sink of the games.
 
 class Board:
     """
     Represents the game board for a Monopoly-like game.
 
+    The board only holds static data and is read-only once built: squares are read-only mappings, the numpy
+    arrays are not writeable. Games share one instance per process through `get_board()`.
+
     Attributes:
-        board (List[Dict[str, Any]]): A list of dictionaries, where each dictionary represents a square on the board
-                                       with its properties (name, type, price, rent, etc.).
-        property_order (List[str]): A list containing the names of all purchasable properties, stations, and utilities
-                                    in their order on the board.
+        board (Tuple[Mapping[str, Any], ...]): A tuple of read-only mappings, where each mapping represents a square
+                                               on the board with its properties (name, type, price, rent, etc.).
+        property_order (Tuple[str, ...]): The names of all purchasable properties, stations, and utilities
+                                          in their order on the board.
         property_data (np.ndarray): A numpy array containing structured data for purchasable properties,
                                     including price, rent levels, mortgage value, house cost, color ID, and color group size.
         property_max (np.ndarray): A numpy array containing the maximum values for each data point in `property_data`.
         property_min (np.ndarray): A numpy array containing the minimum values for each data point in `property_data`.
+        property_data_norm (np.ndarray): float32 min-max normalization of `property_data`, as observed by the agents.
+        square_index (Mapping[str, int]): Name of a square -> index of its first occurrence on the board.
+        property_index (Mapping[str, int]): Name of a purchasable square -> property index (row of `property_data`).
+        square_to_property (np.ndarray): Square index -> property index, -1 for non-purchasable squares.
+        property_to_square (np.ndarray): Property index -> square index.
+        is_street (np.ndarray): Property index -> whether it is a street (not a station or a utility).
+        property_color_group (np.ndarray): Property index -> color group ID (column 9 of `property_data`).
+        color_group_members (tuple): Color group ID -> array of the property indices in that group.
+        color_group_sizes (np.ndarray): Color group ID -> number of properties in that group.
+        property_group_members (np.ndarray): Property index -> streets of its color group, padded with the property
+                                             itself (2-street groups); stations and utilities only contain themselves.
+        landing (LandingModel): Markov model of the landing frequencies of the squares, built on first access.
+        valuation (PropertyValuation): Expected rent, payback and house ROI tables, built on first access.
     """
-    def __init__(self):
+    def __init__(self, log: Optional[EventLog] = None):
         """
         Initializes the game board with all squares and their associated data.
+
+        Args:
+            log (Optional[EventLog]): Event sink told about the initialization; silent when None.
         """
-        print("Initializing Board") # Console output to indicate board initialization.
+        if log is not None:
+            log.message("Initializing Board")
         self.board = [
             # Define each square on the board as a dictionary
             # 'name': Name of the square
@@ -97,13 +119,42 @@ class Board:
             {"name": "Rue de la Paix", "type": "property", "price": 400, "rent": 50, "color_code": "dark_blue",
              "H1": 200, "H2": 600, "H3": 1400, "H4": 1700, "hotel": 2000, "hypothèque": 200}
         ]
+        # Freeze the squares so that the shared board cannot be altered by a game
+        self.board = tuple(MappingProxyType(case) for case in self.board)
         self._init_property_data() # Call helper method to initialize structured property data.
+        self._init_lookup_tables() # Build the read-only name/index tables used by the lookup methods.
+        self.property_order = tuple(self.property_order)
+        # Markov landing model, built on first use (see `landing`)
+        self._landing = None
+        self._valuation = None
 
-        # This part seems redundant as it's also done in _init_property_data,
-        self.property_order = [
-            case['name'] for case in self.board
-            if case['type'] in ['property', 'station', 'utility']
-        ]
+    def __reduce__(self):
+        # Static data: unpickle as the shared board of the receiving process instead of copying it
+        return get_board, ()
+
+    @property
+    def landing(self) -> Any:
+        """
+        Markov model of the squares a player lands on (see `environment.markov.LandingModel`), built on first
+        access and cached on disk.
+        """
+        if self._landing is None:
+            from environment.markov import landing_model  # The model depends on the engine's rules
+            self._landing = landing_model(self)
+        return self._landing
+
+    @property
+    def landing_probabilities(self) -> np.ndarray:
+        """Long-run expected stops per turn on each purchasable square, in property index order."""
+        return self.landing.property_frequency
+
+    @property
+    def valuation(self) -> Any:
+        """Valuation tables of the properties (see `environment.valuation.PropertyValuation`), built on first use."""
+        if self._valuation is None:
+            from environment.valuation import PropertyValuation
+            self._valuation = PropertyValuation(self)
+        return self._valuation
 
     def get_position(self, property_name: str) -> int:
         """
@@ -115,10 +166,7 @@ class Board:
         Returns:
             int: The index of the square in the board list, or -1 if not found.
         """
-        for index, case in enumerate(self.board):
-            if case["name"] == property_name:
-                return index
-        return -1 # Return -1 if the property name is not found.
+        return self.square_index.get(property_name, -1) # Return -1 if the property name is not found.
 
     def get_case(self, index: int) -> Dict[str, Any]:
         """
@@ -163,8 +211,8 @@ class Board:
         Returns:
             Dict[str, Any] | None: The dictionary representing the square if found, otherwise None.
         """
-        # Use a generator expression and next() to find the first matching square
-        return next((c for c in self.board if c["name"] == name), None)
+        index = self.square_index.get(name)
+        return None if index is None else self.board[index]
 
     def get_color_group(self, color_code: str) -> List[Dict[str, Any]]:
         """
@@ -176,8 +224,8 @@ class Board:
         Returns:
             List[Dict[str, Any]]: A list of dictionaries for squares matching the color code.
         """
-        # Filter the board list to find all squares with the given color code
-        return [c for c in self.board if c.get("color_code") == color_code]
+        # Copy so that callers cannot alter the precomputed group
+        return list(self._color_code_squares.get(color_code, ()))
 
     def _init_property_data(self):
         """
@@ -202,6 +250,12 @@ class Board:
             "special": 10 # Default ID for squares without standard color groups
         }
 
+        # Number of squares sharing each color code (stations included)
+        group_sizes = {}
+        for case in self.board:
+            if case.get("color_code") is not None:
+                group_sizes[case["color_code"]] = group_sizes.get(case["color_code"], 0) + 1
+
         for case in self.board:
             # Process only purchasable types (properties, stations, utilities)
             if case["type"] in ['property', 'station', 'utility']:
@@ -221,7 +275,7 @@ class Board:
                     case.get("house_cost", case["price"] // 2),  # Cost per House / Coût par maison
                     color_mapping.get(case.get("color_code", "special"), 10),  # Color Group ID / ID couleur
                     # Size of the color group the property belongs to
-                    len([c for c in self.board if c.get("color_code") == case.get("color_code") if case.get("color_code") is not None])
+                    group_sizes.get(case.get("color_code"), 0)
                     # Color Group Size / Taille du groupe de couleur (Only count properties within the same color group)
                 ])
         # Convert the list of property data into a numpy array for efficient processing
@@ -229,4 +283,62 @@ class Board:
 
         # Calculate global maximum and minimum values for each data column in property_data
         self.property_max = np.max(self.property_data, axis=0) # Global Maxima / Maxima globaux
-        self.property_min = np.min(self.property_data, axis=0) # Global Minima / Minima globaux
\ No newline at end of file
+        self.property_min = np.min(self.property_data, axis=0) # Global Minima / Minima globaux
+        # Min-Max normalization / Normalisation min-max
+        self.property_data_norm = ((self.property_data - self.property_min) / (
+                self.property_max - self.property_min + 1e-8)).astype(np.float32)
+        for array in (self.property_data, self.property_max, self.property_min, self.property_data_norm):
+            array.flags.writeable = False
+
+    def _init_lookup_tables(self):
+        """
+        Builds the name/index lookup tables once, so that every lookup method is a single dictionary or array
+        access instead of a scan over the board. The tables are read-only.
+        """
+        square_index = {}
+        color_code_squares = {}
+        for index, case in enumerate(self.board):
+            # Names such as "Chance" appear several times; keep the first square, as the former linear scan did
+            square_index.setdefault(case["name"], index)
+            if "color_code" in case:
+                color_code_squares.setdefault(case["color_code"], []).append(case)
+        self.square_index = MappingProxyType(square_index)
+        self._color_code_squares = MappingProxyType({code: tuple(cases) for code, cases in color_code_squares.items()})
+
+        self.property_index = MappingProxyType({name: idx for idx, name in enumerate(self.property_order)})
+        self.property_to_square = np.array([square_index[name] for name in self.property_order], dtype=np.int16)
+        self.square_to_property = np.full(len(self.board), -1, dtype=np.int16)
+        self.square_to_property[self.property_to_square] = np.arange(len(self.property_order), dtype=np.int16)
+        self.is_street = np.array([self.board[square]["type"] == "property" for square in self.property_to_square])
+
+        self.property_color_group = self.property_data[:, 9].copy()
+        num_groups = int(self.property_color_group.max()) + 1
+        self.color_group_members = tuple(
+            np.flatnonzero(self.property_color_group == group_id) for group_id in range(num_groups)
+        )
+        self.color_group_sizes = np.bincount(self.property_color_group, minlength=num_groups)
+        width = int(self.color_group_sizes[np.unique(self.property_color_group[self.is_street])].max())
+        self.property_group_members = np.repeat(np.arange(len(self.property_order))[:, None], width, axis=1)
+        for idx in np.flatnonzero(self.is_street):
+            members = self.color_group_members[self.property_color_group[idx]]
+            self.property_group_members[idx, :len(members)] = members
+
+        for array in (self.property_to_square, self.square_to_property, self.is_street, self.property_color_group,
+                      self.color_group_sizes, self.property_group_members, *self.color_group_members):
+            array.flags.writeable = False
+
+
+_shared_board = None
+
+
+def get_board() -> Board:
+    """
+    Returns the board shared by every game of the process, building it on first use.
+
+    Returns:
+        Board: The shared read-only board.
+    """
+    global _shared_board
+    if _shared_board is None:
+        _shared_board = Board()
+    return _shared_board
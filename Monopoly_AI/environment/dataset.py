@@ -0,0 +1,234 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from environment.observation import FLAT_KEY_SEPARATOR
+from environment.recorder import FORMAT_VERSION, META_FILE
+
+# Prefixes of the observation columns, as written by `TrajectoryRecorder`
+OBS_PREFIX = "obs"
+FINAL_PREFIX = "final_"
+NEXT_PREFIX = "next_"
+
+
+def _open_column(directory: str, column: Dict[str, Any]) -> np.ndarray:
+    """Maps a column file read-only; empty columns (which cannot be mapped) are plain empty arrays."""
+    shape = (column["length"],) + tuple(column["shape"])
+    if column["length"] == 0:
+        return np.empty(shape, dtype=column["dtype"])
+    path = os.path.join(directory, column["file"])
+    return np.memmap(path, dtype=column["dtype"], mode="r", shape=shape).view(np.ndarray)
+
+
+class Shard:
+    """
+    Columns of one closed shard of a recording, mapped read-only.
+
+    Attributes:
+        columns (Dict[str, np.ndarray]): Step columns, one row per step.
+        final (Dict[str, np.ndarray]): "final_obs..." columns, one row per episode.
+        starts, stops (np.ndarray): int64[episodes], [start, stop) rows of each episode, in memory.
+        steps (int): Number of steps.
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, META_FILE)) as file:
+            meta = json.load(file)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"{directory}: format version {meta['version']}, expected {FORMAT_VERSION}")
+        self.directory = directory
+        self.steps = meta["steps"]
+        self.columns = {name: _open_column(directory, column) for name, column in meta["columns"].items()}
+        episode_columns = {name: _open_column(directory, column) for name, column in meta["episode_columns"].items()}
+        episodes = np.array(episode_columns.pop("episodes"))
+        self.starts = episodes[:, 0]
+        self.stops = episodes[:, 1]
+        self.final = episode_columns
+
+    def episode_of(self, rows: np.ndarray) -> np.ndarray:
+        """Episode of each row (episodes are contiguous and in order)."""
+        return np.searchsorted(self.starts, rows, side="right") - 1
+
+
+class TrajectoryDataset:
+    """
+    Read-only view of the shards written by `TrajectoryRecorder`, for offline RL.
+
+    Every column is memory-mapped: minibatches are gathered with fancy indexing straight from the mapped pages,
+    and nothing is loaded but the episode boundaries. Processes opening the same recording share its pages
+    through the OS page cache, and a dataset pickles to its directory (it is mapped again when unpickled), so it
+    can be handed to worker processes as is.
+
+    Steps are numbered across the shards in order. Batches are dicts of the step columns ("obs.<leaf>",
+    "action", "reward", "terminated", "truncated", "action_mask"...) plus "next_obs.<leaf>": the following
+    observation of the episode, or its final observation on its last step (and, with action masks,
+    "next_action_mask", all False on the last step).
+
+    Usage:
+        dataset = TrajectoryDataset("data/run0")
+        rng = np.random.default_rng(0)
+        batch = dataset.sample(256, rng)
+        targets = dataset.n_step(batch["index"], n=3, gamma=0.99)
+    """
+
+    def __init__(self, directory: str, shards: Optional[Iterable[str]] = None):
+        """
+        Args:
+            directory (str): Directory of the recording.
+            shards (Optional[Iterable[str]]): Shard directory names to open; every closed shard (with its
+                                              `META_FILE`) when None, so a recording still being written can be
+                                              read up to its last closed shard.
+        """
+        self.directory = directory
+        if shards is None:
+            shards = sorted(name for name in os.listdir(directory)
+                            if os.path.isfile(os.path.join(directory, name, META_FILE)))
+        self.shard_names: List[str] = list(shards)
+        self._open()
+
+    def _open(self) -> None:
+        self.shards = [Shard(os.path.join(self.directory, name)) for name in self.shard_names]
+        self.offsets = np.cumsum([0] + [shard.steps for shard in self.shards], dtype=np.int64)
+        episodes = [len(shard.starts) for shard in self.shards]
+        self.episode_offsets = np.cumsum([0] + episodes, dtype=np.int64)
+        columns = self.shards[0].columns if self.shards else {}
+        self.column_names = list(columns)
+        self.obs_names = [name for name in columns if name.split(FLAT_KEY_SEPARATOR)[0] == OBS_PREFIX]
+        self.has_action_mask = "action_mask" in columns
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"directory": self.directory, "shard_names": self.shard_names}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def num_episodes(self) -> int:
+        return int(self.episode_offsets[-1])
+
+    def _locate(self, indices: np.ndarray) -> tuple:
+        """Shard of each global step index, and the index within it."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError(f"step index out of range for a dataset of {len(self)} steps")
+        shard = np.searchsorted(self.offsets, indices, side="right") - 1
+        return shard, indices - self.offsets[shard]
+
+    def _empty(self, names: List[str], count: int) -> Dict[str, np.ndarray]:
+        shard = self.shards[0]
+        return {name: np.empty((count,) + shard.columns[name].shape[1:], dtype=shard.columns[name].dtype)
+                for name in names}
+
+    def batch(self, indices: np.ndarray, columns: Optional[List[str]] = None,
+              next_obs: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Gathers the transitions of the given steps.
+
+        Args:
+            indices (np.ndarray): Global step indices.
+            columns (Optional[List[str]]): Step columns to gather; all of them when None.
+            next_obs (bool): Whether to add the "next_obs..." columns (and "next_action_mask").
+
+        Returns:
+            Dict[str, np.ndarray]: One row per index, plus "index" (the global indices).
+        """
+        names = self.column_names if columns is None else list(columns)
+        shard_of, rows = self._locate(indices)
+        out = self._empty(names, len(rows))
+        if next_obs:
+            out.update({NEXT_PREFIX + name: array for name, array in self._empty(self.obs_names, len(rows)).items()})
+            if self.has_action_mask:
+                out["next_action_mask"] = np.zeros((len(rows),) + self.shards[0].columns["action_mask"].shape[1:],
+                                                   dtype=np.bool_)
+        for s in np.unique(shard_of):
+            shard = self.shards[s]
+            selected = np.flatnonzero(shard_of == s)
+            local = rows[selected]
+            for name in names:
+                out[name][selected] = shard.columns[name][local]
+            if next_obs:
+                episode = shard.episode_of(local)
+                self._gather_next(shard, out, selected, local + 1, episode)
+        out["index"] = np.asarray(indices, dtype=np.int64)
+        return out
+
+    def _gather_next(self, shard: Shard, out: Dict[str, np.ndarray], selected: np.ndarray, rows: np.ndarray,
+                     episode: np.ndarray) -> None:
+        """Fills the "next_..." entries of `selected` with the observations at `rows`, or final ones past the end."""
+        inside = rows < shard.stops[episode]
+        within, past = selected[inside], selected[~inside]
+        for name in self.obs_names:
+            target = out[NEXT_PREFIX + name]
+            target[within] = shard.columns[name][rows[inside]]
+            target[past] = shard.final[FINAL_PREFIX + name][episode[~inside]]
+        if self.has_action_mask:
+            out["next_action_mask"][within] = shard.columns["action_mask"][rows[inside]]
+            out["next_action_mask"][past] = False
+
+    def sample(self, batch_size: int, rng: Optional[np.random.Generator] = None,
+               columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Uniform random minibatch of transitions (see `batch`)."""
+        rng = rng if rng is not None else np.random.default_rng()
+        return self.batch(rng.integers(0, len(self), size=batch_size), columns)
+
+    def n_step(self, indices: np.ndarray, n: int, gamma: float) -> Dict[str, np.ndarray]:
+        """
+        N-step targets of the given steps, stopped at the end of their episode.
+
+        Returns:
+            Dict[str, np.ndarray]:
+                "return": float64, discounted sum of the next (at most) n rewards;
+                "discount": float64, gamma^k for the k steps summed, 0 when the episode terminated within them
+                            (the bootstrap factor of the value of "next_obs");
+                "terminated": bool, whether the episode terminated within them;
+                "next_obs..." (and "next_action_mask"): observation after the k steps.
+        """
+        shard_of, rows = self._locate(indices)
+        count = len(rows)
+        out = {"return": np.zeros(count), "discount": np.ones(count), "terminated": np.zeros(count, dtype=np.bool_)}
+        out.update({NEXT_PREFIX + name: array for name, array in self._empty(self.obs_names, count).items()})
+        if self.has_action_mask:
+            out["next_action_mask"] = np.zeros((count,) + self.shards[0].columns["action_mask"].shape[1:],
+                                               dtype=np.bool_)
+        for s in np.unique(shard_of):
+            shard = self.shards[s]
+            selected = np.flatnonzero(shard_of == s)
+            local = rows[selected]
+            episode = shard.episode_of(local)
+            stop = shard.stops[episode]
+            ret = np.zeros(len(local))
+            discount = np.ones(len(local))
+            terminated = np.zeros(len(local), dtype=np.bool_)
+            for k in range(n):
+                row = local + k
+                live = (row < stop) & ~terminated
+                row = np.where(live, row, local)
+                ret += np.where(live, discount * shard.columns["reward"][row], 0.0)
+                discount = np.where(live, discount * gamma, discount)
+                terminated |= live & shard.columns["terminated"][row]
+            out["return"][selected] = ret
+            out["discount"][selected] = np.where(terminated, 0.0, discount)
+            out["terminated"][selected] = terminated
+            self._gather_next(shard, out, selected, np.minimum(local + n, stop), episode)
+        return out
+
+    def episode(self, index: int) -> Dict[str, np.ndarray]:
+        """
+        Steps of one episode (numbered across the shards), as read-only views of the mapped columns.
+
+        Returns:
+            Dict[str, np.ndarray]: The step columns sliced to the episode, plus the "final_obs..." observation.
+        """
+        if not 0 <= index < self.num_episodes:
+            raise IndexError(f"episode {index} out of range for a dataset of {self.num_episodes} episodes")
+        s = int(np.searchsorted(self.episode_offsets, index, side="right") - 1)
+        shard = self.shards[s]
+        e = index - int(self.episode_offsets[s])
+        start, stop = shard.starts[e], shard.stops[e]
+        out = {name: column[start:stop] for name, column in shard.columns.items()}
+        out.update({name: column[e] for name, column in shard.final.items()})
+        return out
@@ -0,0 +1,597 @@
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from environment.bitboard import ColorGroupMasks, pack
+from environment.board import Board, get_board
+from environment.player import Player
+from environment.rent import RentTable
+from environment.rng import RandomStream
+from environment.state import GameState, NO_OWNER, NUM_PLAYERS, mask_to_indices
+from utils.logger import CHANCE, COMMUNITY_CHEST, EventLog, JailEvent
+
+# Money received when passing the start square
+GO_SALARY = 200
+# Fine paid to leave jail
+JAIL_FINE = 50
+# Failed double rolls after which a player is released from jail
+MAX_JAIL_TURNS = 3
+# Turn phase appended to the game state in an engine snapshot: current player, turns played, active players
+# and the jailed players as a bitmask
+ENGINE_PHASE = struct.Struct("<biBB")
+
+# Snapshot of an engine: the state and turn phase blob, and the position of the dice/card stream
+EngineSnapshot = Tuple[bytes, tuple]
+
+# Card decks as (effect, value) pairs, mirroring `Game._handle_action_case_chance` and
+# `Game._handle_action_case_community_chest`. The value is an amount of money or a number of squares.
+CHANCE_CARDS = (
+    ("advance_to_go", 200),
+    ("gain_money", 50),
+    ("lose_money", 15),
+    ("advance", 2),
+    ("go_to_jail", 0),
+    ("nothing", 0),
+)
+COMMUNITY_CHEST_CARDS = (
+    ("gain_money", 200),
+    ("lose_money", 100),
+    ("advance", 3),
+    ("go_to_jail", 0),
+    ("nothing", 0),
+)
+
+
+class DecisionPolicy:
+    """
+    Decision callbacks asked by the game at each choice point, in place of `input()`.
+
+    Every callback receives the game (`MonopolyEngine`, or one of the interactive games) and the index of
+    the deciding player; the game state is available as `game.state`, and the management helpers of
+    `PropertyManagement` (`buildable_properties`, `build`, `mortgage`...) on the game itself. The defaults implement a simple
+    heuristic so that a game can be played without any subclassing: buy whatever is affordable, never bid
+    in auctions, build evenly on monopolies while keeping a cash reserve, pay to leave jail when rich enough
+    and mortgage the cheapest properties when short of money.
+    """
+
+    # Money kept aside before building houses or paying the jail fine
+    cash_reserve = 300
+
+    def start_turn(self, game: Any, player_idx: int) -> None:
+        """
+        Called at the start of the player's turn, before the dice are rolled. Management actions go here.
+
+        Args:
+            game: The game asking for the decision.
+            player_idx (int): Index of the player whose turn starts.
+        """
+        state = game.state
+        while True:
+            buildable = game.buildable_properties(player_idx)
+            if not buildable:
+                return
+            prop_idx = min(buildable, key=lambda idx: state.houses[idx])
+            if state.money[player_idx] - game.house_cost[prop_idx] < self.cash_reserve:
+                return
+            game.build(player_idx, prop_idx)
+
+    def buy_property(self, game: Any, player_idx: int, property_idx: int) -> bool:
+        """
+        Whether to buy an unowned property the player landed on. Declining starts an auction.
+
+        Args:
+            game: The game asking for the decision.
+            player_idx (int): Index of the deciding player.
+            property_idx (int): Index of the property on offer.
+
+        Returns:
+            bool: True to buy the property at its price.
+        """
+        return True
+
+    def auction_bid(self, game: Any, player_idx: int, property_idx: int, current_bid: int) -> int:
+        """
+        Bid of the player in an auction round.
+
+        Args:
+            game: The game asking for the decision.
+            player_idx (int): Index of the bidding player.
+            property_idx (int): Index of the auctioned property.
+            current_bid (int): Highest bid so far.
+
+        Returns:
+            int: New bid, or any value not above `current_bid` to leave the auction.
+        """
+        return 0
+
+    def leave_jail_by_paying(self, game: Any, player_idx: int) -> bool:
+        """
+        Whether a jailed player pays the fine instead of trying to roll doubles.
+
+        Args:
+            game: The game asking for the decision.
+            player_idx (int): Index of the jailed player.
+
+        Returns:
+            bool: True to pay the fine.
+        """
+        return game.state.money[player_idx] >= JAIL_FINE + self.cash_reserve
+
+    def raise_funds(self, game: Any, player_idx: int, amount: int) -> None:
+        """
+        Called when the player must pay more than they have. Bankruptcy follows if still short afterwards.
+
+        Args:
+            game: The game asking for the decision.
+            player_idx (int): Index of the indebted player.
+            amount (int): Amount due.
+        """
+        state = game.state
+        candidates = sorted(game.mortgageable_properties(player_idx), key=lambda idx: game.mortgage_value[idx])
+        for prop_idx in candidates:
+            if state.money[player_idx] >= amount:
+                return
+            game.mortgage(player_idx, prop_idx)
+
+
+class ConsoleDecisions(DecisionPolicy):
+    """
+    Decision policy asking a human at the console, used by the interactive games.
+    """
+
+    def start_turn(self, game: Any, player_idx: int) -> None:
+        input(f"{game.seat(player_idx).name}, press Enter to roll the dice...")
+
+    def buy_property(self, game: Any, player_idx: int, property_idx: int) -> bool:
+        name = game.state.property_names[property_idx]
+        price = game.board.property_data[property_idx, 0]
+        return input(f"Do you want to buy {name} for ${price}? (y/n): ").lower() == 'y'
+
+    def auction_bid(self, game: Any, player_idx: int, property_idx: int, current_bid: int) -> int:
+        bid_choice = input(f"{game.seat(player_idx).name}, do you want to bid ${current_bid + 10}? (y/n): ")
+        return current_bid + 10 if bid_choice.lower() == 'y' else 0
+
+    def leave_jail_by_paying(self, game: Any, player_idx: int) -> bool:
+        return input("Your choice: ").strip() == "1"
+
+    def raise_funds(self, game: Any, player_idx: int, amount: int) -> None:
+        # The action menu of the interactive game (mortgage, build, trade), when it has one
+        action_in_game = getattr(game, "action_in_game", None)
+        if action_in_game is not None:
+            action_in_game(game.seat(player_idx))
+
+
+class PropertyManagement:
+    """
+    Management helpers of a game over its `GameState`, used by the default `DecisionPolicy` callbacks:
+    which properties a player may build on or mortgage, and the actions themselves.
+
+    Shared by `MonopolyEngine` and the interactive games (`Game`, `MonopolyGame`), which call
+    `_init_management_tables` and provide `state` and `players`.
+    """
+
+    def _init_management_tables(self, board: Board) -> None:
+        """Builds the per-property lists the helpers read."""
+        data = board.property_data.tolist()
+        self.mortgage_value = [row[7] for row in data]
+        self.house_cost = [row[0] // 2 for row in data]
+        # Color groups as bitmasks, tested against `GameState.owner_mask`
+        self.group_masks = ColorGroupMasks(board)
+
+    def seat(self, player_idx: int) -> Player:
+        """Player of a seat (the interactive `Game` drops bankrupt players from its `players` list)."""
+        return next(player for player in self.players if player.index == player_idx)
+
+    def buildable_properties(self, player_idx: int) -> List[int]:
+        """
+        Properties the player may build a house on: owned, unmortgaged streets of a complete color group,
+        below a hotel and affordable.
+
+        Args:
+            player_idx (int): Index of the player.
+
+        Returns:
+            List[int]: Property indices.
+        """
+        state = self.state
+        if not self.group_masks.monopolies(int(state.owner_mask[player_idx])):
+            return []
+        buildable = self.group_masks.buildable_mask(int(state.owner_mask[player_idx]), pack(state.mortgaged),
+                                                    state.houses)
+        money = int(state.money[player_idx])
+        return [idx for idx in mask_to_indices(buildable).tolist() if money >= self.house_cost[idx]]
+
+    def mortgageable_properties(self, player_idx: int) -> List[int]:
+        """
+        Unmortgaged properties owned by the player.
+
+        Args:
+            player_idx (int): Index of the player.
+
+        Returns:
+            List[int]: Property indices.
+        """
+        state = self.state
+        return [int(idx) for idx in state.properties_of(player_idx) if not state.mortgaged[idx]]
+
+    def build(self, player_idx: int, prop_idx: int) -> bool:
+        """
+        Builds one house on a property if allowed (see `buildable_properties`).
+
+        Returns:
+            bool: True if the house was built.
+        """
+        if prop_idx not in self.buildable_properties(player_idx):
+            return False
+        self.state.houses[prop_idx] += 1
+        self.state.money[player_idx] -= self.house_cost[prop_idx]
+        return True
+
+    def mortgage(self, player_idx: int, prop_idx: int) -> bool:
+        """
+        Mortgages a property owned by the player.
+
+        Returns:
+            bool: True if the property was mortgaged.
+        """
+        state = self.state
+        if state.owner[prop_idx] != player_idx or state.mortgaged[prop_idx]:
+            return False
+        state.mortgaged[prop_idx] = True
+        state.money[player_idx] += self.mortgage_value[prop_idx]
+        return True
+
+
+class MonopolyEngine(PropertyManagement):
+    """
+    Headless Monopoly engine running complete games without any console interaction.
+
+    The engine plays the full turn loop on a `GameState` (dice, movement, pass-Go salary, landing effects,
+    purchases and auctions, rent, taxes, cards, jail and bankruptcy) and asks a `DecisionPolicy` at each
+    choice point. Static board data is flattened into plain Python lists once, so a turn only touches
+    the state arrays and a few list lookups.
+    """
+
+    def __init__(self, policies: Union[DecisionPolicy, Sequence[DecisionPolicy], None] = None,
+                 num_players: int = NUM_PLAYERS, max_turns: int = 1000, board: Optional[Board] = None,
+                 seed: Optional[int] = None, log: Optional[EventLog] = None):
+        """
+        Initializes the engine.
+
+        Args:
+            policies: One policy shared by every seat, one policy per seat, or None for `DecisionPolicy`.
+            num_players (int): Number of seats at the table.
+            max_turns (int): Player turns after which the game stops without a winner.
+            board (Optional[Board]): Board to play on; the shared board when None.
+            seed (Optional[int]): Seed of the dice and card generator.
+            log (Optional[EventLog]): Event sink; silent when None. Events are only built for the games it records.
+        """
+        self.log = log if log is not None else EventLog()
+        self.board = board if board is not None else get_board()
+        self.state = GameState(self.board.property_order, num_players=num_players)
+        self.players = [Player(name=f"Player {i + 1}", state=self.state, index=i) for i in range(num_players)]
+        if policies is None:
+            policies = DecisionPolicy()
+        if isinstance(policies, DecisionPolicy):
+            policies = [policies] * num_players
+        self.policies = list(policies)
+        self.num_players = num_players
+        self.max_turns = max_turns
+        self._init_board_tables()
+        self.reset(seed)
+
+    def _init_board_tables(self) -> None:
+        """Flattens the static board data into Python lists indexed by square or property index."""
+        board = self.board
+        data = board.property_data.tolist()
+        purchasable = [case for case in board.board if case["type"] in ["property", "station", "utility"]]
+
+        self.num_squares = len(board.board)
+        self.square_types = [case["type"] for case in board.board]
+        self.square_property = board.square_to_property.tolist()
+        self.square_tax = [case["price"] if case["type"] == "tax" else 0 for case in board.board]
+        self.jail_square = board.get_position("Prison/Simple visite")
+
+        self.property_types = [case["type"] for case in purchasable]
+        self.price = [row[0] for row in data]
+        self.rent_table = RentTable(board)
+        self._init_management_tables(board)
+        color_ids = [row[9] for row in data]
+        self.color_group = [
+            [other for other, kind in enumerate(self.property_types)
+             if kind == "property" and color_ids[other] == color_ids[idx]] if kind == "property" else []
+            for idx, kind in enumerate(self.property_types)
+        ]
+        # Distinct color groups of streets, as lists of property indices
+        self.color_groups = [group for idx, group in enumerate(self.color_group) if group and group[0] == idx]
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        Starts a new game.
+
+        Args:
+            seed (Optional[int]): Seed of the dice and card generator; the current sequence continues when None.
+        """
+        if not hasattr(self, "rng"):
+            self.rng = RandomStream(seed)
+        elif seed is not None:
+            self.rng.seed(seed)
+        self.state.reset()
+        # Whether this game is recorded, read once per event site instead of `self.log.enabled`
+        self._logging = self.log.start_game()
+        self.in_jail = [False] * self.num_players
+        self.current_player = 0
+        self.turn = 0
+        self.num_active = self.num_players
+
+    def snapshot(self) -> EngineSnapshot:
+        """
+        Captures the game between two turns, e.g. to branch rollouts from the current position.
+
+        Returns:
+            EngineSnapshot: The `GameState` record followed by `ENGINE_PHASE` as a fixed-size blob, and
+                            `RandomStream.snapshot` (no copy of the pre-drawn dice and cards).
+        """
+        in_jail = 0
+        for player_idx, jailed in enumerate(self.in_jail):
+            if jailed:
+                in_jail |= 1 << player_idx
+        phase = ENGINE_PHASE.pack(self.current_player, self.turn, self.num_active, in_jail)
+        return self.state.snapshot() + phase, self.rng.snapshot()
+
+    def restore(self, snapshot: EngineSnapshot) -> None:
+        """
+        Puts the game back to a snapshot of this engine or of another engine on the same board (see `clone`);
+        the following turns replay the same dice and cards.
+        """
+        blob, rng = snapshot
+        self.state.restore(blob)
+        self.current_player, self.turn, self.num_active, in_jail = ENGINE_PHASE.unpack_from(blob, self.state.nbytes)
+        self.in_jail = [bool(in_jail >> player_idx & 1) for player_idx in range(self.num_players)]
+        self.rng.restore(rng)
+
+    def clone(self) -> "MonopolyEngine":
+        """Silent engine with the same policies and rules, in the current state of this one."""
+        engine = MonopolyEngine(self.policies, num_players=self.num_players, max_turns=self.max_turns,
+                                board=self.board)
+        engine.restore(self.snapshot())
+        return engine
+
+    def play_game(self, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Resets the engine and plays a complete game.
+
+        Args:
+            seed (Optional[int]): Seed of the dice and card generator.
+
+        Returns:
+            Dict[str, Any]: Winner index (None when the turn limit was reached), number of turns played,
+                            final money and bankruptcy flags of every player.
+        """
+        self.reset(seed)
+        state = self.state
+        while self.turn < self.max_turns and self.num_active > 1:
+            self.play_turn()
+        active = state.active_players()
+        return {
+            "winner": int(active[0]) if len(active) == 1 else None,
+            "turns": self.turn,
+            "money": state.money.tolist(),
+            "bankrupt": state.bankrupt.tolist(),
+        }
+
+    def play_turn(self) -> None:
+        """Plays the turn of the current player, then hands over to the next active player."""
+        player_idx = self.current_player
+        self.policies[player_idx].start_turn(self, player_idx)
+
+        die1, die2 = self.roll_dice()
+        if self._logging:
+            self.log.turn = self.turn
+            self.log.roll(player_idx, die1, die2)
+        if self.in_jail[player_idx]:
+            self._play_jail_turn(player_idx, die1, die2)
+        else:
+            self._advance(player_idx, die1 + die2, die1 + die2)
+
+        self.turn += 1
+        bankrupt = self.state.bankrupt
+        for _ in range(self.num_players):
+            self.current_player = (self.current_player + 1) % self.num_players
+            if not bankrupt[self.current_player]:
+                break
+
+    def roll_dice(self) -> tuple:
+        """Rolls two six-sided dice."""
+        return self.rng.roll()
+
+    def _play_jail_turn(self, player_idx: int, die1: int, die2: int) -> None:
+        """Jail rules: pay the fine, or roll doubles; released and moved after `MAX_JAIL_TURNS` failures."""
+        state, log, recording = self.state, self.log, self._logging
+        if self.policies[player_idx].leave_jail_by_paying(self, player_idx) and state.money[player_idx] >= JAIL_FINE:
+            state.money[player_idx] -= JAIL_FINE
+            if recording:
+                log.jail(player_idx, JailEvent.PAID)
+        elif die1 != die2:
+            state.jail_turns[player_idx] += 1
+            attempts = int(state.jail_turns[player_idx])
+            if attempts < MAX_JAIL_TURNS:
+                if recording:
+                    log.jail(player_idx, JailEvent.STAYED, attempts)
+                return
+            # Released after the last failed attempt, with a new roll
+            die1, die2 = self.roll_dice()
+            if recording:
+                log.jail(player_idx, JailEvent.MAX_TURNS, attempts)
+                log.roll(player_idx, die1, die2)
+        elif recording:
+            log.jail(player_idx, JailEvent.DOUBLES)
+        self.in_jail[player_idx] = False
+        state.jail_turns[player_idx] = 0
+        self._advance(player_idx, die1 + die2, die1 + die2)
+
+    def _advance(self, player_idx: int, squares: int, dice_total: int) -> None:
+        """Moves a player forward, pays the Go salary when passing the start square, and resolves the landing."""
+        state = self.state
+        start = int(state.position[player_idx])
+        position = start + squares
+        if position >= self.num_squares:
+            state.money[player_idx] += GO_SALARY
+            position -= self.num_squares
+        state.position[player_idx] = position
+        if self._logging:
+            self.log.move(player_idx, start, position)
+        self._land(player_idx, position, dice_total)
+
+    def _land(self, player_idx: int, square: int, dice_total: int) -> None:
+        """Applies the effect of the square a player landed on."""
+        prop_idx = self.square_property[square]
+        if prop_idx >= 0:
+            self._land_on_property(player_idx, prop_idx, dice_total)
+            return
+
+        square_type = self.square_types[square]
+        if square_type == "tax":
+            if self._logging:
+                self.log.tax(player_idx, square, self.square_tax[square])
+            self.charge(player_idx, self.square_tax[square])
+        elif square_type == "chance":
+            self._draw_card(player_idx, CHANCE_CARDS, dice_total)
+        elif square_type == "community_chest":
+            self._draw_card(player_idx, COMMUNITY_CHEST_CARDS, dice_total)
+        elif square_type == "go_to_jail":
+            self.send_to_jail(player_idx)
+
+    def _land_on_property(self, player_idx: int, prop_idx: int, dice_total: int) -> None:
+        """Offers an unowned property for sale (auctioning it if declined), or charges rent to its owner."""
+        state = self.state
+        owner = state.owner[prop_idx]
+        if owner == NO_OWNER:
+            price = self.price[prop_idx]
+            if state.money[player_idx] >= price and self.policies[player_idx].buy_property(self, player_idx, prop_idx):
+                state.money[player_idx] -= price
+                state.transfer(prop_idx, player_idx)
+                if self._logging:
+                    self.log.buy(player_idx, prop_idx, price)
+            else:
+                self.auction(prop_idx)
+        elif owner != player_idx and not state.mortgaged[prop_idx]:
+            rent = self.rent(prop_idx, dice_total)
+            if self._logging:
+                self.log.rent(player_idx, int(owner), prop_idx, rent)
+            self.charge(player_idx, rent, int(owner))
+
+    def rent(self, prop_idx: int, dice_total: int) -> int:
+        """
+        Rent due on an owned property.
+
+        Args:
+            prop_idx (int): Index of the property.
+            dice_total (int): Dice total of the move, used by utilities.
+
+        Returns:
+            int: Rent amount.
+        """
+        return self.rent_table.rent_one(self.state.owner.tolist(), prop_idx, int(self.state.houses[prop_idx]),
+                                        dice_total)
+
+    def _draw_card(self, player_idx: int, deck: Sequence[tuple], dice_total: int) -> None:
+        """Draws a card from a deck and applies it."""
+        card_idx = self.rng.draw(len(deck))
+        effect, value = deck[card_idx]
+        if self._logging:
+            self.log.card(player_idx, CHANCE if deck is CHANCE_CARDS else COMMUNITY_CHEST, card_idx)
+        state = self.state
+        if effect == "advance_to_go":
+            state.position[player_idx] = 0
+            state.money[player_idx] += value
+        elif effect == "gain_money":
+            state.money[player_idx] += value
+        elif effect == "lose_money":
+            self.charge(player_idx, value)
+        elif effect == "advance":
+            self._advance(player_idx, value, dice_total)
+        elif effect == "go_to_jail":
+            self.send_to_jail(player_idx)
+
+    def send_to_jail(self, player_idx: int) -> None:
+        """Moves a player to jail."""
+        self.state.position[player_idx] = self.jail_square
+        self.state.jail_turns[player_idx] = 0
+        self.in_jail[player_idx] = True
+        if self._logging:
+            self.log.jail(player_idx, JailEvent.SENT)
+
+    def charge(self, player_idx: int, amount: int, creditor: Optional[int] = None) -> bool:
+        """
+        Makes a player pay an amount to a creditor (or the bank), raising funds or going bankrupt if needed.
+
+        Args:
+            player_idx (int): Index of the paying player.
+            amount (int): Amount due.
+            creditor (Optional[int]): Index of the receiving player, or None for the bank.
+
+        Returns:
+            bool: True if the amount was paid in full, False if the player went bankrupt.
+        """
+        state = self.state
+        if state.money[player_idx] < amount:
+            self.policies[player_idx].raise_funds(self, player_idx, amount)
+            if state.money[player_idx] < amount:
+                self.declare_bankruptcy(player_idx, creditor, amount - int(state.money[player_idx]))
+                return False
+        state.money[player_idx] -= amount
+        if creditor is not None:
+            state.money[creditor] += amount
+        return True
+
+    def declare_bankruptcy(self, player_idx: int, creditor: Optional[int] = None, unpaid: int = 0) -> None:
+        """
+        Removes a player from the game. A creditor receives their money and properties, otherwise the
+        properties go back to the bank (as `Game.handle_bankruptcy`).
+
+        Args:
+            player_idx (int): Index of the bankrupt player.
+            creditor (Optional[int]): Index of the creditor, or None for the bank.
+            unpaid (int): Part of the debt the player could not pay, recorded in the event.
+        """
+        state = self.state
+        if self._logging:
+            self.log.bankrupt(player_idx, creditor, unpaid)
+        if creditor is not None:
+            state.money[creditor] += state.money[player_idx]
+        state.release_properties(player_idx, creditor)
+        state.money[player_idx] = 0
+        state.bankrupt[player_idx] = True
+        self.num_active -= 1
+        self.in_jail[player_idx] = False
+
+    def auction(self, prop_idx: int) -> Optional[int]:
+        """
+        Auctions a property among the active players; each round every remaining bidder raises or leaves.
+
+        Args:
+            prop_idx (int): Index of the auctioned property.
+
+        Returns:
+            Optional[int]: Index of the winner, or None if nobody bid.
+        """
+        state = self.state
+        bidders = [idx for idx in range(self.num_players) if not state.bankrupt[idx]]
+        current_bid = 0
+        leader = None
+        while bidders:
+            for bidder in list(bidders):
+                if bidder == leader:
+                    continue
+                bid = self.policies[bidder].auction_bid(self, bidder, prop_idx, current_bid)
+                if current_bid < bid <= state.money[bidder]:
+                    current_bid, leader = bid, bidder
+                else:
+                    bidders.remove(bidder)
+            if leader is None or bidders == [leader]:
+                break
+        if leader is not None:
+            state.money[leader] -= current_bid
+            state.transfer(prop_idx, leader)
+            if self._logging:
+                self.log.buy(leader, prop_idx, current_bid)
+        return leader
@@ -1,10 +1,13 @@
-import random
 from typing import List, Optional
-from gym.error import InvalidAction
-from environment.board import Board
+from gymnasium.error import InvalidAction
+from environment.board import get_board
 from environment.player import Player
+from environment.rent import RentTable
+from environment.rng import RandomStream
+from utils.logger import CHANCE, COMMUNITY_CHEST, EventLog, EventRenderer, JailEvent, VERBOSE
+from environment.state import GameState, PROPERTY_BITS
+from environment.engine import ConsoleDecisions, DecisionPolicy, PropertyManagement
 import gymnasium as gym
-import random
 import numpy as np
 
 # Number of properties in the Monopoly game
@@ -15,18 +18,29 @@ MAX_MONEY = 10000
 NUM_CASE = 40
 
 
-class Game(gym.Env):
+class Game(gym.Env, PropertyManagement):
     """
     Monopoly game environment implementing the Gymnasium interface.
     This class represents a complete Monopoly game that can be used for
     reinforcement learning training or human play.
     """
 
-    def __init__(self):
-        print("Initializing Game")
+    def __init__(self, decisions: Optional[DecisionPolicy] = None, seed: Optional[int] = None,
+                 log: Optional[EventLog] = None):
+        # Answers the turn, buy and jail prompts; asks at the console by default
+        self.decisions = decisions if decisions is not None else ConsoleDecisions()
+        # Dice and cards, reseeded by `reset`
+        self.rng = RandomStream(seed)
+        self.board = get_board()
+        self.state = GameState(self.board.property_order)
+        # Building and mortgage helpers of the decision policies, with the color group masks
+        self._init_management_tables(self.board)
         self.players = self._initialize_players()
-        self.board = Board()
-        self._init_property_states()
+        # Game events; printed to the console by default
+        if log is None:
+            log = EventLog(VERBOSE, renderer=EventRenderer(self.board, [p.name for p in self.players]))
+        self.log = log
+        self.log.message("Initializing Game")
         self.property_order = [
             case['name'] for case in self.board.board
             if case['type'] in ['property', 'station', 'utility']
@@ -36,9 +50,10 @@ class Game(gym.Env):
         # Direct retrieval from the Board
         self.property_order = self.board.property_order
         self.property_data = self.board.property_data
+        self._init_property_tables()
+        self.rent_table = RentTable(self.board)
         # Min-Max normalization
-        self.property_data_norm = (self.board.property_data - self.board.property_min) / (
-                    self.board.property_max - self.board.property_min + 1e-8)
+        self.property_data_norm = self.board.property_data_norm
         # Define the enhanced observation space
         self.observation_space = gym.spaces.Dict({
             "self_money": gym.spaces.Box(low=0, high=MAX_MONEY, shape=(1,), dtype=np.int32),
@@ -95,8 +110,8 @@ class Game(gym.Env):
         """
         other_players = [p for p in self.players if p != player and not p.bankrupt]
         # Calculate valid actions
-        mortgageable = [int(prop in self._get_mortgageable_properties(player)) for prop in self.property_order]
-        buildable = [int(prop in self._get_buildable_properties(player)) for prop in self.property_order]
+        mortgageable = self._mortgage_mask(player)
+        buildable = self._build_mask(player)
         # Get data for other players
         others_money = np.zeros(3, dtype=np.int32)
         others_properties = np.zeros((3, NUM_PROPERTIES), dtype=np.int8)
@@ -119,7 +134,7 @@ class Game(gym.Env):
             "action_masks": {
                 "mortgage": np.array(mortgageable, dtype=np.int8),
                 "build": np.array(buildable, dtype=np.int8),
-                "can_trade": np.array([int(len(player.properties) > 0)], dtype=np.int8)
+                "can_trade": np.array([int(self.state.property_count(player.index) > 0)], dtype=np.int8)
             },
 
             # Other players' state
@@ -143,15 +158,9 @@ class Game(gym.Env):
         Returns:
             NumPy array of house counts (-1 if property not owned)
         """
-        houses = np.zeros(NUM_PROPERTIES, dtype=np.int8)
-        for idx, prop_name in enumerate(self.property_order):
-            # Check if player owns the property
-            if prop_name in player.properties:
-                case = next(c for c in self.board.board if c["name"] == prop_name)
-                houses[idx] = min(case.get("houses", 0), 5)
-            else:
-                houses[idx] = -1  # Marker for unowned property
-        return houses
+        # -1 marks the properties the player doesn't own
+        owned = self.state.owned_by(player.index)
+        return np.where(owned, np.minimum(self.state.houses, 5), -1).astype(np.int8)
 
     def _properties_to_binary(self, player):
         """
@@ -163,11 +172,7 @@ class Game(gym.Env):
         Returns:
             Binary vector where 1 indicates ownership
         """
-        binary_vector = np.zeros(NUM_PROPERTIES, dtype=np.int8)
-        for idx, prop_name in enumerate(self.property_order):
-            if prop_name in player.properties:
-                binary_vector[idx] = 1
-        return binary_vector
+        return self.state.owned_by(player.index).astype(np.int8)
 
     def _get_info(self):
         pass
@@ -184,6 +189,8 @@ class Game(gym.Env):
             Initial observation for the current player
         """
         super().reset(seed=seed)
+        if seed is not None:
+            self.rng.seed(seed)
         observation = self._get_obs_for_player(self.players[self.current_player_idx])
         return observation
         pass
@@ -201,10 +208,7 @@ class Game(gym.Env):
         Raises:
             InvalidAction: If no mortgageable property is available
         """
-        mortgageable = [
-            prop for prop in player.properties
-            if not self._get_board_property(prop)["mortgaged"]
-        ]
+        mortgageable = self._get_mortgageable_properties(player)
 
         # Here you would use agent policy to choose
         # For example, take the first mortgageable property
@@ -230,9 +234,9 @@ class Game(gym.Env):
         prop = self._get_board_property(property_name)
         if not prop:
             raise self.InvalidAction(f"Property {property_name} not found")
-        if owner and property_name not in owner.properties:
+        if owner and not owner.owns(property_name):
             raise self.InvalidAction(f"{owner.name} does not own {property_name}")
-        if property_name not in player.properties and not owner:
+        if not player.owns(property_name) and not owner:
             raise self.InvalidAction(f"You do not own {property_name}")
         return prop
 
@@ -249,17 +253,11 @@ class Game(gym.Env):
         Raises:
             InvalidAction: If no buildable property is available
         """
-        buildable = []
-        for prop in player.properties:
-            case = self._get_board_property(prop)
-            if case["type"] == "property" and not case["mortgaged"]:
-                color_group = self._get_color_group(case["color_code"])
-                if all(p in player.properties for p in color_group):
-                    buildable.append(prop)
+        buildable = self._get_buildable_properties(player)
 
         # Prioritize properties with fewest houses
         if buildable:
-            return min(buildable, key=lambda p: self._get_board_property(p)["houses"])
+            return min(buildable, key=lambda p: self.state.houses[self.state.property_index[p]])
         raise self.InvalidAction("No buildable property available")
 
     def _cycle_to_next_player(self):
@@ -330,13 +328,14 @@ class Game(gym.Env):
             InvalidAction: If property can't be mortgaged
         """
         prop = self._validate_property_ownership(player, property_name)
+        idx = self.state.property_index[property_name]
 
-        if prop.get("mortgaged", False):
+        if self.state.mortgaged[idx]:
             raise self.InvalidAction(f"{property_name} is already mortgaged")
 
-        prop["mortgaged"] = True
+        self.state.mortgaged[idx] = True
         player.receive(prop["hypothèque"])
-        print(f"{player.name} has mortgaged {property_name}")
+        self.log.message("{} has mortgaged {}", player.name, property_name)
 
     def _handle_build(self, player: Player, property_name: str):
         """
@@ -354,8 +353,7 @@ class Game(gym.Env):
             raise InvalidAction(f"Property {property_name} not found")
 
         # Check for complete color group ownership
-        color_group = self._get_color_group(prop["color_code"])
-        if any(p not in player.properties for p in color_group):
+        if not self.group_masks.has_monopoly(player.mask, self.state.property_index[property_name]):
             raise InvalidAction("Incomplete color group ownership")
 
         # Check funds
@@ -363,7 +361,8 @@ class Game(gym.Env):
         if player.money < house_cost:
             raise InvalidAction("Insufficient funds")
 
-        prop["houses"] = min(prop.get("houses", 0) + 1, 5)
+        idx = self.state.property_index[property_name]
+        self.state.houses[idx] = min(self.state.houses[idx] + 1, 5)
         player.pay(house_cost)
 
     def _get_other_players(self, current_player: Player) -> List[Player]:
@@ -392,15 +391,14 @@ class Game(gym.Env):
         Raises:
             InvalidAction: If trade conditions are not met
         """
-        if property_name not in seller.properties:
+        if not seller.owns(property_name):
             raise Game.InvalidAction(f"{seller.name} does not own {property_name}")
         if buyer.money < amount:
             raise Game.InvalidAction(f"{buyer.name} doesn't have enough money")
 
         buyer.pay(amount)
         seller.receive(amount)
-        seller.properties.remove(property_name)
-        buyer.properties.append(property_name)
+        seller.transfer_property(property_name, buyer)
 
     def _handle_property_swap(self, player: Player, partner: Player, property_name: str):
         """
@@ -417,13 +415,11 @@ class Game(gym.Env):
         player_prop = self._validate_property_ownership(player, property_name)
         partner_prop = self._validate_property_ownership(partner, property_name, owner=partner)
 
-        if player_prop not in player.properties:
+        if not player.owns(player_prop["name"]):
             raise InvalidAction("Invalid property")
 
-        player.properties.remove(player_prop)
-        partner.properties.append(player_prop)
-        partner.properties.remove(partner_prop)
-        player.properties.append(partner_prop)
+        player.transfer_property(player_prop["name"], partner)
+        partner.transfer_property(partner_prop["name"], player)
 
     def _get_color_group(self, color_code: str) -> List[str]:
         """
@@ -435,11 +431,7 @@ class Game(gym.Env):
         Returns:
             List of property names in the same color group
         """
-        return [
-            p["name"] for p in self.board.board
-            if p.get("color_code") == color_code
-               and p["type"] == "property"
-        ]
+        return [p["name"] for p in self.board.get_color_group(color_code) if p["type"] == "property"]
 
     # Internal exception class
     class InvalidAction(Exception):
@@ -461,8 +453,7 @@ class Game(gym.Env):
         Returns:
             List of mortgageable property names
         """
-        return [prop for prop in player.properties
-                if not self._get_board_property(prop)["mortgaged"]]
+        return [self.property_order[idx] for idx in np.flatnonzero(self._mortgage_mask(player))]
 
     def _get_buildable_properties(self, player):
         """
@@ -474,14 +465,32 @@ class Game(gym.Env):
         Returns:
             List of buildable property names
         """
-        buildable = []
-        for prop in player.properties:
-            case = self._get_board_property(prop)
-            if case["type"] == "property" and not case["mortgaged"]:
-                color_group = self._get_color_group(case["color_code"])
-                if all(p in player.properties for p in color_group):
-                    buildable.append(prop)
-        return buildable
+        return [self.property_order[idx] for idx in np.flatnonzero(self._build_mask(player))]
+
+    def _mortgage_mask(self, player: Player) -> np.ndarray:
+        """
+        Returns a boolean vector of the properties the player can mortgage.
+
+        Args:
+            player: Player whose properties to check
+
+        Returns:
+            Boolean array indexed like `property_order`
+        """
+        return self.state.owned_by(player.index) & ~self.state.mortgaged
+
+    def _build_mask(self, player: Player) -> np.ndarray:
+        """
+        Returns a boolean vector of the properties where the player can build.
+
+        Args:
+            player: Player whose properties to check
+
+        Returns:
+            Boolean array indexed like `property_order`
+        """
+        monopolies = self.group_masks.monopolies(player.mask)
+        return (PROPERTY_BITS[:len(self.property_order)] & monopolies != 0) & ~self.state.mortgaged
 
     def _calculate_reward(self, player):
         """
@@ -498,13 +507,13 @@ class Game(gym.Env):
         # Reward for money
         reward += player.money * 0.01
 
+        owned = self.state.owned_by(player.index)
+
         # Reward for properties
-        reward += len(player.properties) * 5
+        reward += int(np.count_nonzero(owned)) * 5
 
         # Reward for built houses
-        for prop in player.properties:
-            case = self._get_board_property(prop)
-            reward += case.get("houses", 0) * 10
+        reward += int(self.state.houses[owned].sum()) * 10
 
         # Penalty for bankruptcy
         if player.bankrupt:
@@ -512,23 +521,20 @@ class Game(gym.Env):
 
         return reward
 
-    @staticmethod
-    def _initialize_players() -> List[Player]:
+    def _initialize_players(self) -> List[Player]:
         """
-        Initializes players for the game.
+        Initializes players for the game, bound to the shared game state.
 
         Returns:
             List of Player objects
         """
-        return [Player(name=f"Player {i + 1}") for i in range(4)]
+        return [Player(name=f"Player {i + 1}", state=self.state, index=i) for i in range(4)]
 
-    def _init_property_states(self):
+    def _init_property_tables(self):
         """
-        Initializes house counts for all properties.
+        Precomputes the per-property arrays used by the action masks.
         """
-        for case in self.board.board:
-            if case["type"] == "property":
-                case.setdefault("houses", 0)
+        self._is_street = self.board.is_street
 
     def start(self):
         """
@@ -536,21 +542,23 @@ class Game(gym.Env):
         Each player takes their turn in sequence.
         """
         round_number = 1
+        self.log.start_game()
         while len(self.players) > 1:
-            print(f"\n====== Round {round_number} ======")
+            self.log.turn = round_number
+            self.log.message("\n====== Round {} ======", round_number)
             for player in self.players.copy():
                 if player.bankrupt:
                     continue
-                print(f"\n--- {player.name}'s turn ---")
+                self.log.message("\n--- {}'s turn ---", player.name)
                 self._handle_player_turn(player)
                 if len(self.players) == 1:
                     break
             round_number += 1
 
         if self.players:
-            print(f"\nCongratulations, {self.players[0].name} won the game!")
+            self.log.message("\nCongratulations, {} won the game!", self.players[0].name)
         else:
-            print("The game ended without a winner.")
+            self.log.message("The game ended without a winner.")
 
     def _handle_player_turn(self, player: Player):
         """
@@ -563,30 +571,44 @@ class Game(gym.Env):
             player: Player whose turn it is
         """
         if player.bankrupt:
-            print(f"{player.name} is bankrupt and cannot play.")
+            self.log.message("{} is bankrupt and cannot play.", player.name)
             return
 
-        input(f"{player.name}, press Enter to roll the dice...")
-        dice_roll = self._roll_dice()
-        print(f"{player.name} rolled {dice_roll}.")
+        self.decisions.start_turn(self, player.index)
+        dice_roll = self._roll_dice(player)
 
         # Update player position
-        player.position = self.board.move_player(player.position, dice_roll)
+        self._move(player, dice_roll)
         current_case = self.board.get_case(player.position)
-        print(f"{player.name} moves to '{current_case['name']}'.")
 
         # Process arrival space
         self._handle_case_action(player, current_case)
 
-    @staticmethod
-    def _roll_dice() -> int:
+    def _roll_dice(self, player: Player) -> int:
         """
-        Rolls the dice.
+        Rolls the two dice for a player.
+
+        Args:
+            player: Player rolling the dice
 
         Returns:
             Total dice roll value
         """
-        return random.randint(1, 12)
+        die1, die2 = self.rng.roll()
+        self.log.roll(player.index, die1, die2)
+        return die1 + die2
+
+    def _move(self, player: Player, steps: int):
+        """
+        Moves a player forward on the board.
+
+        Args:
+            player: Player to move
+            steps: Number of squares to advance
+        """
+        start = player.position
+        player.position = self.board.move_player(start, steps)
+        self.log.move(player.index, start, player.position)
 
     def _handle_case_action(self, player: Player, case: dict):
         """
@@ -602,7 +624,7 @@ class Game(gym.Env):
             self._handle_tax_case(player, case)
         elif case["type"] == "start":
             player.money += 200
-            print(f"{player.name} receives 200€ for passing Start.")
+            self.log.message("{} receives 200€ for passing Start.", player.name)
         elif case["type"] == "community_chest":
             self._handle_action_case_community_chest(player, case)
         elif case["type"] == "chance":
@@ -611,12 +633,12 @@ class Game(gym.Env):
             self._handle_action_case_jail(player, case)
         elif case["type"] == "free_parking":
             player.money += 200
-            print(f"{player.name} receives 200€ on Free Parking.")
+            self.log.message("{} receives 200€ on Free Parking.", player.name)
         elif case["type"] == "utility":
             # Specific logic for utilities (not implemented here)
             pass
         else:
-            print(f"No action defined for type '{case['type']}'.")
+            self.log.message("No action defined for type '{}'.", case["type"])
 
     def _handle_property_case(self, player: Player, case: dict):
         """
@@ -629,12 +651,10 @@ class Game(gym.Env):
         owner = Game.find_property_owner(self.players, case["name"])
         if not owner:
             # Offer player to buy the property
-            choice = input(
-                f"{player.name}, do you want to buy {case['name']} for {case['price']}€? (y/n) : ").strip().lower()
-            if choice == "o":
-                Game._handle_property_purchase(player, case)
+            if self.decisions.buy_property(self, player.index, self.state.property_index[case["name"]]):
+                self._handle_property_purchase(player, case)
             else:
-                print(f"{player.name} declined to buy {case['name']}. Auction begins.")
+                self.log.message("{} declined to buy {}. Auction begins.", player.name, case["name"])
                 self.auction_property(case["name"], starting_bid=case["price"])
         else:
             self._handle_rent_payment(player, case, owner)
@@ -651,10 +671,9 @@ class Game(gym.Env):
         Returns:
             Player who owns the property or None
         """
-        return next((p for p in players if property_name in p.properties), None)
+        return next((p for p in players if p.owns(property_name)), None)
 
-    @staticmethod
-    def _handle_property_purchase(player: Player, case: dict):
+    def _handle_property_purchase(self, player: Player, case: dict):
         """
         Handles purchasing a property.
 
@@ -663,9 +682,9 @@ class Game(gym.Env):
             case: Property case dictionary
         """
         if player.buy_property(case["name"], case["price"]):
-            print(f"✅ {player.name} bought {case['name']}! Balance: {player.money}€")
+            self.log.buy(player.index, self.state.property_index[case["name"]], case["price"])
         else:
-            print(f"❌ {player.name} cannot afford {case['name']}")
+            self.log.message("❌ {} cannot afford {}", player.name, case["name"])
 
     def _handle_rent_payment(self, player: Player, case: dict, owner: Player):
         """
@@ -677,50 +696,22 @@ class Game(gym.Env):
             owner: Owner of the property
         """
         if owner == player:
-            print(f"🌟 {player.name} already owns this property")
+            self.log.message("🌟 {} already owns this property", player.name)
             return
 
-        if case["type"] == "station":
-            station_count = sum(1 for prop in owner.properties if prop.startswith("Gare"))
-            station_count = max(station_count, 1)
-            base_rent = case.get("rent", 25)
-            multiplier = 2 ** (station_count - 1)
-            rent = base_rent * multiplier
-            print(f"{owner.name} owns {station_count} station(s) - rent is now {rent}€.")
-        else:
-            rent = Game.calculate_rent(case)
+        property_idx = self.state.property_index[case["name"]]
+        rent = self.rent_table.rent(self.state, property_idx)
 
-        print(f"💸 Rent due to {owner.name}: {rent}€")
+        self.log.rent(player.index, owner.index, property_idx, rent)
         if player.money < rent:
-            self.action_in_game(player)
+            self.decisions.raise_funds(self, player.index, rent)
         if player.money < rent:
-            self.handle_bankruptcy(player, creditor=owner)
+            self.handle_bankruptcy(player, creditor=owner, unpaid=rent - player.money)
             return
 
         player.pay(rent)
         owner.receive(rent)
-        print(f"Balance {player.name}: {player.money}€ → {owner.name}: {owner.money}€")
-
-    @staticmethod
-    def calculate_rent(case: dict) -> int:
-        """
-        Calculates rent for a property based on houses.
-
-        Args:
-            case: Property case dictionary
-
-        Returns:
-            Calculated rent amount
-        """
-        try:
-            houses = case.get("houses", 0)
-            return {
-                0: case["rent"],
-                5: case["hotel"]
-            }.get(houses, case.get(f"H{houses}", case["rent"]))
-        except KeyError as e:
-            print(f"Configuration error: {e}")
-            return case["rent"]
+        self.log.message("Balance {}: {}€ → {}: {}€", player.name, player.money, owner.name, owner.money)
 
     def _handle_tax_case(self, player: Player, case: dict):
         """
@@ -732,12 +723,12 @@ class Game(gym.Env):
         """
         tax = case["price"]
         if player.money < tax:
-            self.action_in_game(player)
+            self.decisions.raise_funds(self, player.index, tax)
         if player.money < tax:
-            self.handle_bankruptcy(player)
+            self.handle_bankruptcy(player, unpaid=tax - player.money)
             return
         player.pay(tax)
-        print(f"⚖️ {player.name} pays {tax}€ in taxes. Balance: {player.money}€")
+        self.log.tax(player.index, player.position, tax)
 
     def _handle_action_case_jail(self, player: Player, case: dict, jail_price: int = 50):
         """
@@ -751,55 +742,45 @@ class Game(gym.Env):
         if case["type"] == "go_to_jail":
             jail_position = self.board.get_position("Prison/Simple visite")
             player.position = jail_position
-            print(f"{player.name} is sent to jail!")
-            print("Choose an action:")
-            print(f"1. Pay {jail_price}€ to get out immediately")
-            print("2. Roll dice to try to get out")
-            choice = input("Your choice: ").strip()
+            self.log.jail(player.index, JailEvent.SENT)
+            self.log.message("Choose an action:")
+            self.log.message("1. Pay {}€ to get out immediately", jail_price)
+            self.log.message("2. Roll dice to try to get out")
+            choice = "1" if self.decisions.leave_jail_by_paying(self, player.index) else "2"
             if choice == "1":
                 if player.money < jail_price:
-                    self.handle_bankruptcy(player)
+                    self.handle_bankruptcy(player, unpaid=jail_price - player.money)
                     return
                 else:
                     player.pay(jail_price)
-                    dice_roll = self._roll_dice()
-                    player.position = self.board.move_player(player.position, dice_roll)
+                    self.log.jail(player.index, JailEvent.PAID)
+                    dice_roll = self._roll_dice(player)
+                    self._move(player, dice_roll)
                     current_case = self.board.get_case(player.position)
-                    print(f"{player.name} advances {dice_roll} spaces and lands on {current_case['name']}.")
                     self._handle_case_action(player, current_case)
             elif choice == "2":
-                if not hasattr(player, "jail_turns"):
-                    player.jail_turns = 0
-                die1 = random.randint(1, 6)
-                die2 = random.randint(1, 6)
-                print(f"{player.name} rolls: {die1} and {die2}.")
+                die1, die2 = self.rng.roll()
+                self.log.roll(player.index, die1, die2)
                 if die1 == die2:
-                    print(f"{player.name} rolled doubles and is released from jail!")
+                    self.log.jail(player.index, JailEvent.DOUBLES)
                     player.jail_turns = 0
-                    movement = die1 + die2
-                    player.position = self.board.move_player(player.position, movement)
+                    self._move(player, die1 + die2)
                     current_case = self.board.get_case(player.position)
-                    print(f"{player.name} advances {movement} spaces and lands on {current_case['name']}.")
                     self._handle_case_action(player, current_case)
                 else:
                     player.jail_turns += 1
                     if player.jail_turns >= 3:
-                        print(f"{player.name} didn't roll doubles in 3 attempts and is released from jail.")
+                        self.log.jail(player.index, JailEvent.MAX_TURNS, player.jail_turns)
                         player.jail_turns = 0
-                        new_die1 = random.randint(1, 6)
-                        new_die2 = random.randint(1, 6)
-                        movement = new_die1 + new_die2
-                        print(f"{player.name} rolls again: {new_die1} and {new_die2}.")
-                        player.position = self.board.move_player(player.position, movement)
+                        self._move(player, self._roll_dice(player))
                         current_case = self.board.get_case(player.position)
-                        print(f"{player.name} advances {movement} spaces and lands on {current_case['name']}.")
                         self._handle_case_action(player, current_case)
                     else:
-                        print(f"{player.name} didn't roll doubles and stays in jail (attempt {player.jail_turns}/3).")
+                        self.log.jail(player.index, JailEvent.STAYED, player.jail_turns)
             else:
-                print("Invalid choice. Player remains in jail for this turn.")
+                self.log.message("Invalid choice. Player remains in jail for this turn.")
 
-    def _handle_random_card_action(self, player: Player, actions: List[dict]):
+    def _handle_random_card_action(self, player: Player, actions: List[dict], deck: int):
         """
         Executes a random action from the provided list.
         Logic is common to Chance and Community Chest cards.
@@ -807,37 +788,40 @@ class Game(gym.Env):
         Args:
             player: Player drawing the card
             actions: List of possible card actions
+            deck: CHANCE or COMMUNITY_CHEST
         """
-        chosen_action = random.choice(actions)
-        print(chosen_action["message"])
+        card_idx = self.rng.draw(len(actions))
+        chosen_action = actions[card_idx]
+        self.log.card(player.index, deck, card_idx)
+        self.log.message(chosen_action["message"])
         action_type = chosen_action["type"]
 
         if action_type == "advance_to_go":
             player.position = self.board.get_position("Go")
             player.receive(chosen_action["amount"])
-            print(
-                f"{player.name} is now on Go and receives {chosen_action['amount']}€. New balance: {player.money}€.")
+            self.log.message(
+                "{} is now on Go and receives {}€. New balance: {}€.",
+                player.name, chosen_action["amount"], player.money)
         elif action_type == "gain_money":
             player.receive(chosen_action["amount"])
-            print(f"The new balance of {player.name} is {player.money}€.")
+            self.log.message("The new balance of {} is {}€.", player.name, player.money)
         elif action_type == "lose_money":
             if player.money < chosen_action["amount"]:
-                self.action_in_game(player)
+                self.decisions.raise_funds(self, player.index, chosen_action["amount"])
             if player.money < chosen_action["amount"]:
-                self.handle_bankruptcy(player)
+                self.handle_bankruptcy(player, unpaid=chosen_action["amount"] - player.money)
                 return
             player.pay(chosen_action["amount"])
-            print(f"The new balance of {player.name} is {player.money}€.")
+            self.log.message("The new balance of {} is {}€.", player.name, player.money)
         elif action_type == "advance":
-            player.position = self.board.move_player(player.position, chosen_action["spaces"])
+            self._move(player, chosen_action["spaces"])
             current_case = self.board.get_case(player.position)
-            print(f"{player.name} moves forward {chosen_action['spaces']} spaces and lands on {current_case['name']}.")
             self._handle_case_action(player, current_case)
         elif action_type == "go_to_jail":
             player.position = self.board.get_position("Go to Jail")
-            print(f"{player.name} is sent to jail!")
+            self.log.jail(player.index, JailEvent.SENT)
         elif action_type == "nothing":
-            print(f"No additional action for {player.name}.")
+            self.log.message("No additional action for {}.", player.name)
 
     def _handle_action_case_chance(self, player: Player, case: dict):
         if case["type"] == "chance":
@@ -871,7 +855,7 @@ class Game(gym.Env):
                     "message": f"No special action for {player.name} this time."
                 }
             ]
-            self._handle_random_card_action(player, actions)
+            self._handle_random_card_action(player, actions, CHANCE)
 
     def _handle_action_case_community_chest(self, player: Player, case: dict):
         if case["type"] == "community_chest":
@@ -900,13 +884,10 @@ class Game(gym.Env):
                     "message": f"No special action for {player.name} this time."
                 }
             ]
-            self._handle_random_card_action(player, actions)
+            self._handle_random_card_action(player, actions, COMMUNITY_CHEST)
 
     def _get_board_property(self, property_name: str) -> Optional[dict]:
-        for case in self.board.board:
-            if case["name"] == property_name:
-                return case
-        return None
+        return self.board.get_property(property_name)
 
     def action_in_game(self, player: Player):
         """
@@ -918,261 +899,245 @@ class Game(gym.Env):
           4. Trade: Exchange a property for another property
           5. Quit (no action)
         """
-        print("\n--- Available actions ---")
-        print("1. Mortgage a property")
-        print("2. Build a house")
-        print("3. Trade: Buy a property from another player (money for property)")
-        print("4. Trade: Exchange a property for another property")
-        print("5. Quit (no action)")
+        self.log.message("\n--- Available actions ---")
+        self.log.message("1. Mortgage a property")
+        self.log.message("2. Build a house")
+        self.log.message("3. Trade: Buy a property from another player (money for property)")
+        self.log.message("4. Trade: Exchange a property for another property")
+        self.log.message("5. Quit (no action)")
         choice = input("Your choice: ").strip()
 
         if choice == "1":
-            eligible_props = []
-            for prop in player.properties:
-                board_prop = self._get_board_property(prop)
-                if board_prop is not None and board_prop["type"] in ["property", "station", "utility"]:
-                    if not board_prop.get("mortgaged", False):
-                        eligible_props.append(prop)
+            eligible_props = self._get_mortgageable_properties(player)
             if not eligible_props:
-                print("You have no properties eligible for mortgage.")
+                self.log.message("You have no properties eligible for mortgage.")
                 return
 
-            print("\nProperties eligible for mortgage:")
+            self.log.message("\nProperties eligible for mortgage:")
             for i, prop in enumerate(eligible_props, start=1):
                 board_prop = self._get_board_property(prop)
-                print(f"{i}. {prop} (Mortgage value: {board_prop['mortgage']}€)")
+                self.log.message("{}. {} (Mortgage value: {}€)", i, prop, board_prop["hypothèque"])
             selection = input("Select the property to mortgage (number): ").strip()
             try:
                 sel = int(selection)
                 if sel < 1 or sel > len(eligible_props):
-                    print("Invalid selection.")
+                    self.log.message("Invalid selection.")
                     return
                 chosen_prop = eligible_props[sel - 1]
                 board_prop = self._get_board_property(chosen_prop)
-                board_prop["mortgaged"] = True
-                mortgage_value = board_prop["mortgage"]
+                self.state.mortgaged[self.state.property_index[chosen_prop]] = True
+                mortgage_value = board_prop["hypothèque"]
                 player.receive(mortgage_value)
-                print(
-                    f"{player.name} mortgaged {chosen_prop} and receives {mortgage_value}€. New balance: {player.money}€.")
+                self.log.message(
+                    "{} mortgaged {} and receives {}€. New balance: {}€.",
+                    player.name, chosen_prop, mortgage_value, player.money)
             except ValueError:
-                print("Invalid input.")
+                self.log.message("Invalid input.")
 
         elif choice == "2":
-            eligible_props = []
-            for prop in player.properties:
-                board_prop = self._get_board_property(prop)
-                if board_prop is not None and board_prop["type"] == "property":
-                    if not board_prop.get("mortgaged", False):
-                        eligible_props.append(prop)
+            eligible_props = [
+                self.property_order[idx] for idx in np.flatnonzero(
+                    self.state.owned_by(player.index) & self._is_street & ~self.state.mortgaged
+                )
+            ]
             if not eligible_props:
-                print("You have no properties eligible for building houses.")
+                self.log.message("You have no properties eligible for building houses.")
                 return
 
-            print("\nProperties eligible for building a house:")
+            self.log.message("\nProperties eligible for building a house:")
             for i, prop in enumerate(eligible_props, start=1):
-                board_prop = self._get_board_property(prop)
-                houses = board_prop.get("houses", 0)
-                print(f"{i}. {prop} (Current houses: {houses})")
+                houses = self.state.houses[self.state.property_index[prop]]
+                self.log.message("{}. {} (Current houses: {})", i, prop, houses)
             selection = input("Select the property to build a house on (number): ").strip()
             try:
                 sel = int(selection)
                 if sel < 1 or sel > len(eligible_props):
-                    print("Invalid selection.")
+                    self.log.message("Invalid selection.")
                     return
                 chosen_prop = eligible_props[sel - 1]
                 board_prop = self._get_board_property(chosen_prop)
                 # Check full ownership of the color group
                 if board_prop["type"] == "property":
-                    color_group = [
-                        p["name"] for p in self.board.board
-                        if p.get("color_code") == board_prop["color_code"]
-                           and p["type"] == "property"
-                    ]
-                    missing = [prop for prop in color_group if prop not in player.properties]
+                    color_group = self._get_color_group(board_prop["color_code"])
+                    missing = [prop for prop in color_group if not player.owns(prop)]
 
                     if missing:
-                        print(
-                            f"❌ Cannot build! You must own the entire {board_prop['color_code'].upper()} group.")
-                        print(f"Missing properties: {', '.join(missing)}")
+                        self.log.message(
+                            "❌ Cannot build! You must own the entire {} group.", board_prop["color_code"].upper())
+                        self.log.message("Missing properties: {}", ', '.join(missing))
                         return
-                current_houses = board_prop.get("houses", 0)
+                chosen_idx = self.state.property_index[chosen_prop]
+                current_houses = int(self.state.houses[chosen_idx])
                 if current_houses >= 4:
-                    print(f"You already have the maximum number of houses on {chosen_prop} (4 max).")
+                    self.log.message("You already have the maximum number of houses on {} (4 max).", chosen_prop)
                     return
                 house_cost = int(board_prop["price"] / 2)
                 if player.money < house_cost:
-                    print(
-                        f"{player.name} does not have enough money to build a house on {chosen_prop} (cost: {house_cost}€).")
+                    self.log.message(
+                        "{} does not have enough money to build a house on {} (cost: {}€).",
+                        player.name, chosen_prop, house_cost)
                     return
                 player.pay(house_cost)
-                board_prop["houses"] = current_houses + 1
-                print(f"A house has been built on {chosen_prop}. Houses now: {board_prop['houses']}.")
-                print(f"New balance of {player.name}: {player.money}€.")
+                self.state.houses[chosen_idx] = current_houses + 1
+                self.log.message("A house has been built on {}. Houses now: {}.", chosen_prop, current_houses + 1)
+                self.log.message("New balance of {}: {}€.", player.name, player.money)
             except ValueError:
-                print("Invalid input.")
+                self.log.message("Invalid input.")
 
         elif choice == "3":
             # Trade: Buying a property from another player (money for property)
             seller_name = input("Enter the name of the selling player: ").strip()
             seller = next((p for p in self.players if p.name.lower() == seller_name.lower() and p != player), None)
             if not seller:
-                print("Player not found or you cannot trade with yourself.")
+                self.log.message("Player not found or you cannot trade with yourself.")
                 return
             property_name = input(f"{seller.name}, enter the name of the property you want to sell: ").strip()
-            Game.trade_action_money_to_card(player, seller, property_name)
+            self.trade_action_money_to_card(player, seller, property_name)
 
         elif choice == "4":
             # Trade: Exchanging one property for another property
             partner_name = input("Enter the name of the player to trade with: ").strip()
             partner = next((p for p in self.players if p.name.lower() == partner_name.lower() and p != player), None)
             if not partner:
-                print("Player not found or you cannot trade with yourself.")
+                self.log.message("Player not found or you cannot trade with yourself.")
                 return
-            Game.trade_action_card_to_card(player, partner)
+            self.trade_action_card_to_card(player, partner)
 
         elif choice == "5":
-            print("No action taken.")
+            self.log.message("No action taken.")
         else:
-            print("Invalid choice.")
+            self.log.message("Invalid choice.")
 
-    @staticmethod
-    def trade_action_money_to_card(buyer: Player, seller: Player, property_name: str):
-        if property_name not in seller.properties:
-            print(f"Error: {seller.name} does not own the property {property_name}.")
+    def trade_action_money_to_card(self, buyer: Player, seller: Player, property_name: str):
+        if not seller.owns(property_name):
+            self.log.message("Error: {} does not own the property {}.", seller.name, property_name)
             return
 
         amount_input = input(
             f"{buyer.name}, how much would you like to pay to buy {property_name} from {seller.name}?\nAmount: "
         )
         if not amount_input.isnumeric():
-            print("Error: please enter a valid number.")
+            self.log.message("Error: please enter a valid number.")
             return
 
         amount = int(amount_input)
 
         if buyer.money < amount:
-            print(f"Error: {buyer.name} does not have enough money to pay {amount}€.")
+            self.log.message("Error: {} does not have enough money to pay {}€.", buyer.name, amount)
             return
 
-        print(f"{buyer.name} pays {amount}€ to {seller.name} to purchase {property_name}.")
+        self.log.message("{} pays {}€ to {} to purchase {}.", buyer.name, amount, seller.name, property_name)
         buyer.pay(amount)
         seller.receive(amount)
 
-        seller.properties.remove(property_name)
-        buyer.properties.append(property_name)
-        print(f"Transaction successful! {buyer.name} now owns {property_name}.")
-        print(f"Balance of {buyer.name}: {buyer.money}€")
-        print(f"Balance of {seller.name}: {seller.money}€")
+        seller.transfer_property(property_name, buyer)
+        self.log.message("Transaction successful! {} now owns {}.", buyer.name, property_name)
+        self.log.message("Balance of {}: {}€", buyer.name, buyer.money)
+        self.log.message("Balance of {}: {}€", seller.name, seller.money)
 
-    @staticmethod
-    def trade_action_card_to_card(buyer: Player, seller: Player):
+    def trade_action_card_to_card(self, buyer: Player, seller: Player):
         buyer_property = input(
             f"{buyer.name}, enter the name of the property you want to offer: "
         ).strip()
         if not buyer_property:
-            print("Error: you must enter a valid property name.")
+            self.log.message("Error: you must enter a valid property name.")
             return
 
-        if buyer_property not in buyer.properties:
-            print(f"Error: {buyer.name} does not own '{buyer_property}'.")
+        if not buyer.owns(buyer_property):
+            self.log.message("Error: {} does not own '{}'.", buyer.name, buyer_property)
             return
 
         seller_property = input(
             f"{seller.name}, enter the name of the property you want to offer in exchange for '{buyer_property}': "
         ).strip()
         if not seller_property:
-            print("Error: you must enter a valid property name.")
+            self.log.message("Error: you must enter a valid property name.")
             return
 
-        if seller_property not in seller.properties:
-            print(f"Error: {seller.name} does not own '{seller_property}'.")
+        if not seller.owns(seller_property):
+            self.log.message("Error: {} does not own '{}'.", seller.name, seller_property)
             return
 
-        print(
-            f"Proposed trade: {buyer.name} offers '{buyer_property}' in exchange for '{seller_property}' from {seller.name}.")
+        self.log.message(
+            "Proposed trade: {} offers '{}' in exchange for '{}' from {}.",
+            buyer.name, buyer_property, seller_property, seller.name)
 
-        buyer.properties.remove(buyer_property)
-        seller.properties.append(buyer_property)
+        buyer.transfer_property(buyer_property, seller)
+        seller.transfer_property(seller_property, buyer)
 
-        seller.properties.remove(seller_property)
-        buyer.properties.append(seller_property)
+        self.log.message("Trade successful!")
+        self.log.message("{} now owns: {}", buyer.name, buyer.properties)
+        self.log.message("{} now owns: {}", seller.name, seller.properties)
 
-        print("Trade successful!")
-        print(f"{buyer.name} now owns: {buyer.properties}")
-        print(f"{seller.name} now owns: {seller.properties}")
-
-    def handle_bankruptcy(self, player: Player, creditor: Optional[Player] = None):
+    def handle_bankruptcy(self, player: Player, creditor: Optional[Player] = None, unpaid: int = 0):
         """
         Manages a player's bankruptcy.
         - If a creditor is specified, they receive the remaining money and the player's properties.
         - Otherwise, the properties are returned to the market.
         The player is then removed from the game.
+        `unpaid` is the part of the debt the player could not pay, recorded in the event.
         """
-        print(f"🚨 {player.name} is bankrupt!")
+        self.log.bankrupt(player.index, creditor.index if creditor else None, unpaid)
         if creditor:
-            print(f"{player.name}'s assets are transferred to {creditor.name}.")
             creditor.receive(player.money)
-            for prop in player.properties:
-                creditor.properties.append(prop)
+            self.state.release_properties(player.index, creditor.index)
         else:
-            print(f"{player.name}'s properties are returned to the market.")
+            self.state.release_properties(player.index)
 
         player.money = 0
-        player.properties = []
         player.bankrupt = True
 
         if player in self.players:
             self.players.remove(player)
-        print(f"{player.name} has been removed from the game.")
+        self.log.message("{} has been removed from the game.", player.name)
 
     def auction_property(self, property_name: str, starting_bid: int = 0):
         """
         Organizes an auction for the property named property_name.
-        All non-bankrupt players participate.
+        All non-bankrupt players participate; their bids come from `self.decisions.auction_bid`.
         """
-        print(f"\nStarting auction for {property_name} (starting bid: {starting_bid}€)")
+        self.log.message("\nStarting auction for {} (starting bid: {}€)", property_name, starting_bid)
         eligible_players = [p for p in self.players if not p.bankrupt]
         if not eligible_players:
-            print("No players are eligible to participate in the auction.")
+            self.log.message("No players are eligible to participate in the auction.")
             return
 
         current_bid = starting_bid
         highest_bidder = None
         active_bidders = eligible_players.copy()
+        prop_idx = self.state.property_index[property_name]
 
         while len(active_bidders) > 1:
             any_bid_made = False
             for player in active_bidders.copy():
-                print(f"\n{player.name}, the current bid is {current_bid}€.")
-                bid_str = input(f"{player.name}, enter your bid (or press Enter to pass): ").strip()
-                if bid_str == "":
-                    print(f"{player.name} passes and is out of this auction.")
+                if player is highest_bidder:
+                    continue
+                self.log.message("\n{}, the current bid is {}€.", player.name, current_bid)
+                bid = self.decisions.auction_bid(self, player.index, prop_idx, current_bid)
+                if bid <= current_bid:
+                    self.log.message("{} passes and is out of this auction.", player.name)
+                    active_bidders.remove(player)
+                elif bid > player.money:
+                    self.log.message("{} doesn’t have enough money to bid {}€ and is out of this auction.",
+                                     player.name, bid)
                     active_bidders.remove(player)
                 else:
-                    try:
-                        bid = int(bid_str)
-                        if bid <= current_bid:
-                            print("Your bid must be higher than the current bid.")
-                        elif bid > player.money:
-                            print("You don’t have enough money to make that bid.")
-                        else:
-                            current_bid = bid
-                            highest_bidder = player
-                            any_bid_made = True
-                            print(f"{player.name} bids {bid}€.")
-                    except ValueError:
-                        print("Invalid input. You skip this round.")
-                        active_bidders.remove(player)
+                    current_bid = bid
+                    highest_bidder = player
+                    any_bid_made = True
+                    self.log.message("{} bids {}€.", player.name, bid)
             if not any_bid_made:
                 break
 
         if highest_bidder is not None:
-            print(f"\n{highest_bidder.name} wins the auction for {property_name} with a bid of {current_bid}€.")
+            self.log.message(
+                "\n{} wins the auction for {} with a bid of {}€.", highest_bidder.name, property_name, current_bid)
             highest_bidder.pay(current_bid)
-            highest_bidder.properties.append(property_name)
-            print(f"{highest_bidder.name}’s new balance is {highest_bidder.money}€.")
+            highest_bidder.acquire_property(property_name)
+            self.log.buy(highest_bidder.index, self.state.property_index[property_name], current_bid)
+            self.log.message("{}’s new balance is {}€.", highest_bidder.name, highest_bidder.money)
         else:
-            print("No bids were made for this auction.")
+            self.log.message("No bids were made for this auction.")
 
 
 gym.register(
@@ -1,13 +1,103 @@
-import random
+import struct
 from typing import List, Optional, Dict, Any, Tuple
 import numpy as np
 import gymnasium as gym
-from environment.board import Board
+from environment.bitboard import ColorGroupMasks
+from environment.board import get_board
 from environment.player import Player
+from environment.state import GameState, NO_OWNER, mask_to_indices
+from environment.engine import ConsoleDecisions, DecisionPolicy, PropertyManagement
+from environment.action_masks import ActionMasks
+from environment.actions import NUM_PARTNERS, DiscreteActions
+from environment.observation import FlatObservation, ObservationBuffers
+from environment.profiling import PhaseProfiler
+from environment.rent import RentTable
+from environment.rng import RandomStream
+from utils.logger import CHANCE, COMMUNITY_CHEST, EventLog, EventRenderer, JailEvent, VERBOSE
 
 NUM_PROPERTIES = 28
 MAX_MONEY = 10000
 NUM_CASE = 40
+# Turn phase appended to the game state in an environment snapshot: the current player
+ENV_PHASE = struct.Struct("<b")
+
+
+def make_observation_space(landing_features: bool = False) -> gym.spaces.Dict:
+    """
+    Observation space of a single Monopoly seat, shared by the single and vectorized environments.
+
+    With `landing_features`, it also holds the expected stops of the player ("self_landing") and of the others
+    ("others_landing") on each property during their next turn, from the board's Markov landing model.
+    """
+    spaces = {
+        "self_money": gym.spaces.Box(low=0, high=MAX_MONEY, shape=(1,), dtype=np.int32),
+        "self_position": gym.spaces.Discrete(NUM_CASE),
+        "self_properties": gym.spaces.MultiBinary(NUM_PROPERTIES),
+        "others_money": gym.spaces.Box(low=0, high=MAX_MONEY, shape=(3,), dtype=np.int32),
+        "active_players": gym.spaces.MultiBinary(4),
+        "others_properties": gym.spaces.Box(
+            low=0, high=5, shape=(3, NUM_PROPERTIES), dtype=np.int8
+        ),
+        "others_positions": gym.spaces.Box(low=0, high=NUM_CASE, shape=(3,), dtype=np.int32),
+        "self_houses": gym.spaces.Box(low=0, high=5, shape=(NUM_PROPERTIES,), dtype=np.int8),
+        "all_properties": gym.spaces.Box(
+            low=0.0, high=1.0, shape=(NUM_PROPERTIES, 11), dtype=np.float32
+        ),
+        "others_houses": gym.spaces.Box(
+            low=0, high=5, shape=(3, NUM_PROPERTIES), dtype=np.int8
+        ),
+        "action_masks": gym.spaces.Dict({
+            "mortgage": gym.spaces.MultiBinary(NUM_PROPERTIES),
+            "build": gym.spaces.MultiBinary(NUM_PROPERTIES),
+            "can_trade": gym.spaces.MultiBinary(1)
+        }),
+    }
+    if landing_features:
+        spaces["self_landing"] = gym.spaces.Box(low=0.0, high=1.0, shape=(NUM_PROPERTIES,), dtype=np.float32)
+        spaces["others_landing"] = gym.spaces.Box(low=0.0, high=1.0, shape=(3, NUM_PROPERTIES), dtype=np.float32)
+    return gym.spaces.Dict(spaces)
+
+
+def make_flat_observation_space(dtype: Any = np.float32, landing_features: bool = False) -> gym.spaces.Box:
+    """Flat observation space of a single Monopoly seat (see `environment.observation.FlatObservation`)."""
+    return FlatObservation(make_observation_space(landing_features), dtype).space
+
+
+def make_action_space() -> gym.spaces.Dict:
+    """Management action space of a single Monopoly seat, shared by the single and vectorized environments."""
+    return gym.spaces.Dict({
+        "action_type": gym.spaces.Discrete(5),  # 0-4 for different actions
+        "property_idx": gym.spaces.Discrete(NUM_PROPERTIES),
+        "trade_partner": gym.spaces.Discrete(3),
+        "trade_amount": gym.spaces.Box(low=0, high=MAX_MONEY, shape=(1,), dtype=np.int32)
+    })
+
+
+# Phases timed by `MonopolyRLEnv.enable_profiling` -> method implementing them
+PROFILED_PHASES = {
+    "step": "step",
+    "reset": "reset",
+    "action": "_apply_action",
+    "reward": "_calculate_reward",
+    "next_player": "_cycle_to_next_player",
+    "observation": "_get_obs_for_player",
+    "patch_property": "_on_property_changed",
+    "patch_money": "_on_money_changed",
+    "refresh": "_refresh_buffers",
+    "info": "_get_info",
+}
+# Enclosing phase of each phase, for the shares of `profile_report` (observations are mostly built by `step`)
+PROFILE_PARENTS = {
+    "action": "step",
+    "reward": "step",
+    "next_player": "step",
+    "observation": "step",
+    "patch_property": "action",
+    "patch_money": "action",
+    "refresh": "reset",
+    "info": "reset",
+}
+
 
 #TODO: modifier les méthodes déjà existante pour l'utilisation de l'ia.
 class MonopolyRLEnv(gym.Env):
@@ -16,62 +106,93 @@ class MonopolyRLEnv(gym.Env):
     This class focuses solely on the RL interface, separating it from human-playable game logic.
     """
 
-    def __init__(self):
-        print("Initializing Monopoly RL Environment")
+    def __init__(self, copy_obs: bool = True, log: Optional[EventLog] = None, profile: bool = False,
+                 obs_mode: str = "dict", flat_dtype: Any = np.float32, action_mode: str = "dict",
+                 landing_features: bool = False):
+        """
+        Args:
+            copy_obs (bool): Whether `reset`/`step` return fresh observation arrays. When False, they return
+                             read-only views of the preallocated buffers, updated in place by later steps.
+            log (Optional[EventLog]): Event sink; silent when None.
+            profile (bool): Whether to time the phases of `step` and `reset` (see `enable_profiling`).
+            obs_mode (str): "dict" for the `make_observation_space()` dictionary, or "flat" for one contiguous
+                            vector laid out as `flat_spec` (see `environment.observation.FlatObservation`).
+            flat_dtype: dtype of the flat observation, `np.float32` or `np.int16`.
+            action_mode (str): "dict" for the `make_action_space()` dictionary, or "discrete" for a flat
+                               `Discrete(K)` space (see `environment.actions.DiscreteActions`); the infos of
+                               `reset` and `step` then carry the legal actions of the next player as
+                               "action_mask".
+            landing_features (bool): Whether observations include the next-turn landing probabilities of the
+                                     players on each property (see `make_observation_space`).
+        """
+        if obs_mode not in ("dict", "flat"):
+            raise ValueError(f"Unknown observation mode {obs_mode!r}")
+        if action_mode not in ("dict", "discrete"):
+            raise ValueError(f"Unknown action mode {action_mode!r}")
+        # Arguments an identical environment is built with by `clone`
+        self._init_args = dict(copy_obs=copy_obs, obs_mode=obs_mode, flat_dtype=flat_dtype, action_mode=action_mode,
+                               landing_features=landing_features)
+        self.log = log if log is not None else EventLog()
+        self.log.message("Initializing Monopoly RL Environment")
         # Initialize game components
+        self.board = get_board()
+        self.state = GameState(self.board.property_order)
+        self.group_masks = ColorGroupMasks(self.board)
         self.players = self._initialize_players()
-        self.board = Board()
-        self._init_property_states()
 
         # Property tracking
         self.property_order = self.board.property_order
         self.property_data = self.board.property_data
-        self.property_data_norm = (self.property_data - self.board.property_min) / (
-                self.board.property_max - self.board.property_min + 1e-8
-        )
-
-        # Define observation space
-        self.observation_space = gym.spaces.Dict({
-            "self_money": gym.spaces.Box(low=0, high=MAX_MONEY, shape=(1,), dtype=np.int32),
-            "self_position": gym.spaces.Discrete(NUM_CASE),
-            "self_properties": gym.spaces.MultiBinary(NUM_PROPERTIES),
-            "others_money": gym.spaces.Box(low=0, high=MAX_MONEY, shape=(3,), dtype=np.int32),
-            "active_players": gym.spaces.MultiBinary(4),
-            "others_properties": gym.spaces.Box(
-                low=0, high=5, shape=(3, NUM_PROPERTIES), dtype=np.int8
-            ),
-            "others_positions": gym.spaces.Box(low=0, high=NUM_CASE, shape=(3,), dtype=np.int32),
-            "self_houses": gym.spaces.Box(low=0, high=5, shape=(NUM_PROPERTIES,), dtype=np.int8),
-            "all_properties": gym.spaces.Box(
-                low=0.0, high=1.0, shape=(NUM_PROPERTIES, 11), dtype=np.float32
-            ),
-            "others_houses": gym.spaces.Box(
-                low=0, high=5, shape=(3, NUM_PROPERTIES), dtype=np.int8
-            ),
-            "action_masks": gym.spaces.Dict({
-                "mortgage": gym.spaces.MultiBinary(NUM_PROPERTIES),
-                "build": gym.spaces.MultiBinary(NUM_PROPERTIES),
-                "can_trade": gym.spaces.MultiBinary(1)
-            }),
-        })
-
-        # Define action space
-        self.action_space = gym.spaces.Dict({
-            "action_type": gym.spaces.Discrete(5),  # 0-4 for different actions
-            "property_idx": gym.spaces.Discrete(NUM_PROPERTIES),
-            "trade_partner": gym.spaces.Discrete(3),
-            "trade_amount": gym.spaces.Box(low=0, high=MAX_MONEY, shape=(1,), dtype=np.int32)
-        })
+        self.property_data_norm = self.board.property_data_norm
+
+        # Action masks and per-seat observation buffers, patched after every mutation instead of rebuilt
+        # at each step (see `_on_property_changed` and `_on_money_changed`)
+        self.copy_obs = copy_obs
+        self.action_masks = ActionMasks(self.state, self.board)
+        self.obs_buffers = ObservationBuffers(self.state, self.property_data_norm, self.action_masks)
+        # Set by `restore`: the buffers are rebuilt on their next use rather than at every restore
+        self._buffers_stale = False
+
+        # Define observation and action spaces
+        self.obs_mode = obs_mode
+        self.flat_obs: Optional[FlatObservation] = None
+        self.observation_space = make_observation_space(landing_features)
+        # Next-turn property landings from each square, and scratch rows of the players' landings (plus a
+        # zero row for empty "others" slots)
+        self._landing_table: Optional[np.ndarray] = None
+        if landing_features:
+            landing = self.board.landing
+            self._landing_table = landing.property_landings(1, np.arange(NUM_CASE)).astype(np.float32)
+            self._landing_rows = np.zeros((len(self.players) + 1, NUM_PROPERTIES), dtype=np.float32)
+        if obs_mode == "flat":
+            # The whole observation is written into one pinned vector; `flat_spec` maps each entry to its slice
+            self.flat_obs = FlatObservation(self.observation_space, flat_dtype)
+            self.flat_spec = self.flat_obs.spec
+            self._flat_view = self.flat_obs.buffer.view()
+            self._flat_view.flags.writeable = False
+            self.observation_space = self.flat_obs.space
+        self.action_mode = action_mode
+        self.discrete_actions: Optional[DiscreteActions] = None
+        self.action_space = make_action_space()
+        if action_mode == "discrete":
+            self.discrete_actions = DiscreteActions(self.board)
+            self.action_space = self.discrete_actions.space
 
         # Track current player
         self.current_player_idx = 0
 
+        self.profiler: Optional[PhaseProfiler] = None
+        # `info` argument of the active `enable_profiling`, None when profiling is off
+        self._profile_info: Optional[bool] = None
+        if profile:
+            self.enable_profiling()
+
     def reset(self, seed: Optional[int] = None, options: Optional[dict] = None) -> Tuple[Dict, Dict]:
         """Reset the environment to initial state."""
         super().reset(seed=seed)
-        self.players = self._initialize_players()
-        self.board = Board()
-        self._init_property_states()
+        self.log.start_game()
+        self.state.reset()
+        self._refresh_buffers()
         self.current_player_idx = 0
 
         observation = self._get_obs_for_player(self.players[self.current_player_idx])
@@ -93,62 +214,17 @@ class MonopolyRLEnv(gym.Env):
             truncated: Whether the episode was truncated
             info: Additional information
         """
+        if self._buffers_stale:
+            self._refresh_buffers()
         player = self.players[self.current_player_idx]
         reward = 0
         done = False
         info = {}
+        if self.discrete_actions is not None:
+            action = self.discrete_actions.decode(action)
 
         try:
-            action_type = action["action_type"]
-
-            if action_type == 0:  # Mortgage
-                property_idx = action["property_idx"]
-                if property_idx < len(self.property_order):
-                    prop = self.property_order[property_idx]
-                    if prop in self._get_mortgageable_properties(player):
-                        self._handle_mortgage(player, prop)
-                        reward += 5  # Small reward for freeing up cash
-                    else:
-                        reward -= 2  # Penalty for invalid mortgage attempt
-
-            elif action_type == 1:  # Build
-                property_idx = action["property_idx"]
-                if property_idx < len(self.property_order):
-                    prop = self.property_order[property_idx]
-                    if prop in self._get_buildable_properties(player):
-                        self._handle_build(player, prop)
-                        reward += 10  # Reward for development
-                    else:
-                        reward -= 2  # Penalty for invalid build attempt
-
-            elif action_type == 2:  # Trade money for property
-                partner_idx = action["trade_partner"]
-                property_idx = action["property_idx"]
-                amount = action["trade_amount"][0]
-
-                other_players = self._get_other_players(player)
-                if partner_idx < len(other_players) and property_idx < len(self.property_order):
-                    partner = other_players[partner_idx]
-                    prop = self.property_order[property_idx]
-
-                    if prop in partner.properties and player.money >= amount:
-                        self._handle_trade(player, partner, prop, amount)
-                        reward += 15  # Good reward for successful trade
-                    else:
-                        reward -= 2  # Penalty for invalid trade
-
-            elif action_type == 3:  # Trade property for property
-                partner_idx = action["trade_partner"]
-                property_idx = action["property_idx"]
-
-                other_players = self._get_other_players(player)
-                if partner_idx < len(other_players) and property_idx < len(self.property_order):
-                    partner = other_players[partner_idx]
-                    self._handle_property_swap(player, partner, property_idx)
-                    reward += 15  # Good reward for successful trade
-
-            elif action_type == 4:  # Do nothing
-                reward -= 1  # Small negative reward for doing nothing
+            reward += self._apply_action(player, action)
 
             # Add reward based on player's overall state
             reward += self._calculate_reward(player)
@@ -160,6 +236,8 @@ class MonopolyRLEnv(gym.Env):
         # Move to next player
         self._cycle_to_next_player()
         next_obs = self._get_obs_for_player(self.players[self.current_player_idx])
+        if self.discrete_actions is not None:
+            info["action_mask"] = self.legal_action_mask()
 
         # Check if game is over (only one player left)
         active_players = [p for p in self.players if not p.bankrupt]
@@ -168,134 +246,297 @@ class MonopolyRLEnv(gym.Env):
 
         return next_obs, reward, terminated, truncated, info
 
+    def _apply_action(self, player: Player, action: Dict[str, Any]) -> float:
+        """Apply the management action of the current player and return its immediate reward."""
+        reward = 0
+        action_type = action["action_type"]
+
+        if action_type == 0:  # Mortgage
+            property_idx = action["property_idx"]
+            if property_idx < len(self.property_order):
+                prop = self.property_order[property_idx]
+                if self._mortgage_mask(player)[property_idx]:
+                    self._handle_mortgage(player, prop)
+                    self._on_property_changed(property_idx)
+                    self._on_money_changed(player.index)
+                    reward += 5  # Small reward for freeing up cash
+                else:
+                    reward -= 2  # Penalty for invalid mortgage attempt
+
+        elif action_type == 1:  # Build
+            property_idx = action["property_idx"]
+            if property_idx < len(self.property_order):
+                prop = self.property_order[property_idx]
+                if self._build_mask(player)[property_idx]:
+                    self._handle_build(player, prop)
+                    self._on_property_changed(property_idx)
+                    self._on_money_changed(player.index)
+                    reward += 10  # Reward for development
+                else:
+                    reward -= 2  # Penalty for invalid build attempt
+
+        elif action_type == 2:  # Trade money for property
+            partner_idx = action["trade_partner"]
+            property_idx = action["property_idx"]
+            amount = action["trade_amount"][0]
+
+            other_players = self._get_other_players(player)
+            if partner_idx < len(other_players) and property_idx < len(self.property_order):
+                partner = other_players[partner_idx]
+                prop = self.property_order[property_idx]
+
+                if partner.owns(prop) and player.money >= amount:
+                    self._handle_trade(player, partner, prop, amount)
+                    self._on_property_changed(property_idx)
+                    self._on_money_changed(player.index)
+                    self._on_money_changed(partner.index)
+                    reward += 15  # Good reward for successful trade
+                else:
+                    reward -= 2  # Penalty for invalid trade
+
+        elif action_type == 3:  # Trade property for property
+            partner_idx = action["trade_partner"]
+            property_idx = action["property_idx"]
+
+            other_players = self._get_other_players(player)
+            if partner_idx < len(other_players) and property_idx < len(self.property_order):
+                partner = other_players[partner_idx]
+                for swapped in self._handle_property_swap(player, partner, property_idx):
+                    self._on_property_changed(self.state.property_index[swapped])
+                reward += 15  # Good reward for successful trade
+
+        elif action_type == 4:  # Do nothing
+            reward -= 1  # Small negative reward for doing nothing
+
+        return reward
+
+    def _refresh_buffers(self) -> None:
+        """Rebuild the action masks and observation buffers after a wholesale state change."""
+        self.action_masks.refresh()
+        self.obs_buffers.refresh()
+        self._buffers_stale = False
+
+    def snapshot(self) -> bytes:
+        """
+        Capture the whole mutable state of the game, e.g. to branch a search from the current position.
+
+        Returns:
+            bytes: Fixed-size blob, the `GameState` record followed by `ENV_PHASE` (the current player).
+                   Equal snapshots mean equal games, so they can key a transposition table.
+        """
+        return self.state.snapshot() + ENV_PHASE.pack(self.current_player_idx)
+
+    def restore(self, snapshot: bytes) -> None:
+        """
+        Put the game back to a snapshot of this environment, or of any environment (see `clone`).
+
+        The masks and observation buffers are rebuilt lazily, by the next `step` or observation.
+        """
+        self.state.restore(snapshot)
+        self.current_player_idx, = ENV_PHASE.unpack_from(snapshot, self.state.nbytes)
+        self._buffers_stale = True
+
+    def clone(self) -> "MonopolyRLEnv":
+        """New silent environment with the same settings, in the current state of this one."""
+        env = MonopolyRLEnv(**self._init_args)
+        env.restore(self.snapshot())
+        return env
+
+    def enable_profiling(self, info: bool = False) -> None:
+        """
+        Start timing the phases of `step` and `reset` with `perf_counter_ns` (see `PROFILED_PHASES`).
+
+        The timed wrappers are installed as instance attributes shadowing the methods, so a non-profiled
+        environment runs no timing code. Timings accumulate across calls until `reset_profile`.
+
+        Args:
+            info: Whether `step` also returns the nanoseconds spent in each phase of that step in `info["profile"]`.
+        """
+        self.disable_profiling()
+        if self.profiler is None:
+            self.profiler = PhaseProfiler()
+        profiler = self.profiler
+        self._profile_info = info
+        for phase, name in PROFILED_PHASES.items():
+            setattr(self, name, profiler.wrap(phase, getattr(self, name), top_level=name in ("step", "reset")))
+        if info:
+            timed_step = self.step
+
+            def step(action):
+                result = timed_step(action)
+                result[4]["profile"] = dict(profiler.last)
+                return result
+            self.step = step
+
+    def disable_profiling(self) -> None:
+        """Remove the timed wrappers; the accumulated timings are kept."""
+        self._profile_info = None
+        for name in PROFILED_PHASES.values():
+            self.__dict__.pop(name, None)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The timed wrappers are closures, which cannot be pickled; they are installed again by `__setstate__`
+        state = self.__dict__.copy()
+        for name in PROFILED_PHASES.values():
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self._profile_info is not None:
+            self.enable_profiling(self._profile_info)
+
+    def reset_profile(self) -> None:
+        """Clear the accumulated timings."""
+        if self.profiler is not None:
+            self.profiler.reset()
+
+    def profile_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregated phase timings: calls, total time (ms), mean time per call (µs) and share of the enclosing
+        `step`/`reset` time. Empty if profiling was never enabled.
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.report(PROFILE_PARENTS)
+
     def _get_info(self) -> Dict[str, Any]:
         """Return information about the current state of the game."""
-        active_players = [p for p in self.players if not p.bankrupt]
-        return {
-            "active_players_count": len(active_players),
+        state = self.state
+        owner = state.owner
+        info = {
+            "active_players_count": int(len(self.players) - state.bankrupt.sum()),
             "current_player": self.current_player_idx,
-            "player_money": [p.money for p in self.players],
-            "player_properties_count": [len(p.properties) for p in self.players],
-            "bankrupt_players": [p.bankrupt for p in self.players]
+            "player_money": state.money.tolist(),
+            "player_properties_count": np.bincount(owner[owner != NO_OWNER], minlength=len(self.players)).tolist(),
+            "bankrupt_players": state.bankrupt.tolist()
         }
+        if self.discrete_actions is not None:
+            info["action_mask"] = self.legal_action_mask()
+        return info
+
+    def legal_action_mask(self) -> np.ndarray:
+        """
+        Flat actions of the current player that `step` accepts without a penalty (discrete action mode).
+
+        Returns:
+            np.ndarray: bool[K], indexed as `self.discrete_actions`.
+        """
+        if self.discrete_actions is None:
+            raise RuntimeError("legal_action_mask requires action_mode='discrete'")
+        if self._buffers_stale:
+            self._refresh_buffers()
+        player_idx = self.current_player_idx
+        partners = np.full(NUM_PARTNERS, -1, dtype=np.int64)
+        others = [p.index for p in self._get_other_players(self.players[player_idx])][:NUM_PARTNERS]
+        partners[:len(others)] = others
+        return self.discrete_actions.legal_mask(self.action_masks.mortgage[player_idx],
+                                                self.action_masks.build[player_idx], self.state.owner, player_idx,
+                                                self.state.money[player_idx], partners)
 
     def _get_obs_for_player(self, player: Player) -> Dict[str, Any]:
         """
         Generate observation for the current player.
         Includes player state and information about other players.
         """
-        other_players = [p for p in self.players if p != player and not p.bankrupt]
-
-        # Calculate valid actions
-        mortgageable = [int(prop in self._get_mortgageable_properties(player)) for prop in self.property_order]
-        buildable = [int(prop in self._get_buildable_properties(player)) for prop in self.property_order]
-
-        # Get data for other players
-        others_money = np.zeros(3, dtype=np.int32)
-        others_properties = np.zeros((3, NUM_PROPERTIES), dtype=np.int8)
-        others_positions = np.zeros(3, dtype=np.int32)
-        others_houses = np.zeros((3, NUM_PROPERTIES), dtype=np.int8)
-        active_players = np.array([int(not p.bankrupt) for p in self.players], dtype=np.int8)
-
-        for i, other in enumerate(other_players[:3]):
-            others_money[i] = other.money
-            others_properties[i] = self._properties_to_binary(other)
-            others_positions[i] = other.position
-            others_houses[i] = self._get_houses_vector(other)
-
-        return {
-            # Personal state
-            "self_money": np.array([player.money], dtype=np.int32),
-            "self_position": player.position,
-            "self_properties": self._properties_to_binary(player),
-            "self_houses": self._get_houses_vector(player),
-            "action_masks": {
-                "mortgage": np.array(mortgageable, dtype=np.int8),
-                "build": np.array(buildable, dtype=np.int8),
-                "can_trade": np.array([int(len(player.properties) > 0)], dtype=np.int8)
-            },
-
-            # Other players' states
-            "others_money": others_money,
-            "others_properties": others_properties,
-            "others_positions": others_positions,
-            "others_houses": others_houses,
-            "active_players": active_players,
-
-            # Property data
-            "all_properties": self.property_data_norm,
-        }
-
-    def _get_houses_vector(self, player: Player) -> np.ndarray:
-        """Convert player's houses to a vector format."""
-        houses = np.zeros(NUM_PROPERTIES, dtype=np.int8)
-        for idx, prop_name in enumerate(self.property_order):
-            if prop_name in player.properties:
-                prop = self._get_board_property(prop_name)
-                houses[idx] = min(prop.get("houses", 0), 5)
-            else:
-                houses[idx] = 0  # No houses since player doesn't own property
-        return houses
-
-    def _properties_to_binary(self, player: Player) -> np.ndarray:
-        """Convert player's properties to binary vector."""
-        binary_vector = np.zeros(NUM_PROPERTIES, dtype=np.int8)
-        for idx, prop_name in enumerate(self.property_order):
-            if prop_name in player.properties:
-                binary_vector[idx] = 1
-        return binary_vector
+        if self._buffers_stale:
+            self._refresh_buffers()
+        if self.flat_obs is None and self._landing_table is None:
+            return self.obs_buffers.observation(player.index, copy=self.copy_obs)
+        observation = self._observation(player.index, copy=self.copy_obs and self.flat_obs is None)
+        if self.flat_obs is None:
+            return observation
+        self.flat_obs.write(observation)
+        return self.flat_obs.buffer.copy() if self.copy_obs else self._flat_view
+
+    def _observation(self, player_idx: int, copy: bool) -> Dict[str, Any]:
+        """Dict observation of a seat from the buffers, with the landing features when enabled."""
+        observation = self.obs_buffers.observation(player_idx, copy=copy)
+        if self._landing_table is None:
+            return observation
+        rows = self._landing_rows
+        rows[:-1] = self._landing_table[self.state.position]
+        observation = dict(observation)
+        observation["self_landing"] = rows[player_idx].copy()
+        observation["others_landing"] = rows[self.obs_buffers.others_rows(player_idx)]
+        return observation
+
+    def write_observation(self, out: Any) -> Any:
+        """
+        Copy the current player's observation into caller-provided arrays
+        (see `environment.observation.allocate_observation`), or into a vector in flat mode.
+        """
+        if self._buffers_stale:
+            self._refresh_buffers()
+        if self.flat_obs is not None:
+            np.copyto(out, self.flat_obs.write(self._observation(self.current_player_idx, copy=False)))
+            return out
+        self.obs_buffers.write(self.current_player_idx, out)
+        if self._landing_table is not None:
+            observation = self._observation(self.current_player_idx, copy=False)
+            np.copyto(out["self_landing"], observation["self_landing"])
+            np.copyto(out["others_landing"], observation["others_landing"])
+        return out
+
+    def _mortgage_mask(self, player: Player) -> np.ndarray:
+        """Boolean vector of the properties the player can mortgage (row of `action_masks`)."""
+        return self.action_masks.mortgage[player.index]
+
+    def _build_mask(self, player: Player) -> np.ndarray:
+        """Boolean vector of the properties the player can build on (row of `action_masks`)."""
+        return self.action_masks.build[player.index]
+
+    def _on_property_changed(self, property_idx: int) -> None:
+        """Patch the masks and observations after the owner, mortgage or houses of a property changed."""
+        self.action_masks.update_property(property_idx)
+        self.obs_buffers.update_property(property_idx)
+
+    def _on_money_changed(self, player_idx: int) -> None:
+        """Patch the masks and observations after the money of a player changed."""
+        self.action_masks.update_money(player_idx)
+        self.obs_buffers.update_money(player_idx)
 
     def _get_mortgageable_properties(self, player: Player) -> List[str]:
         """Get list of properties player can mortgage."""
-        return [
-            prop for prop in player.properties
-            if not self._get_board_property(prop).get("mortgaged", False)
-        ]
+        return [self.property_order[idx] for idx in np.flatnonzero(self._mortgage_mask(player))]
 
     def _get_buildable_properties(self, player: Player) -> List[str]:
         """Get list of properties player can build on."""
-        buildable = []
-        for prop in player.properties:
-            prop_data = self._get_board_property(prop)
-            if prop_data["type"] == "property" and not prop_data.get("mortgaged", False):
-                color_group = self._get_color_group(prop_data["color_code"])
-                if all(p in player.properties for p in color_group):
-                    buildable.append(prop)
-        return buildable
+        return [self.property_order[idx] for idx in np.flatnonzero(self._build_mask(player))]
 
     def _handle_mortgage(self, player: Player, property_name: str) -> None:
         """Handle mortgaging a property."""
-        prop = self._get_board_property(property_name)
-        if not prop:
+        idx = self.state.property_index.get(property_name)
+        if idx is None:
             raise ValueError(f"Property {property_name} not found")
 
-        if property_name not in player.properties:
+        if self.state.owner[idx] != player.index:
             raise ValueError(f"Player doesn't own {property_name}")
 
-        if prop.get("mortgaged", False):
+        if self.state.mortgaged[idx]:
             raise ValueError(f"{property_name} is already mortgaged")
 
-        prop["mortgaged"] = True
-        player.receive(prop["hypothèque"])
+        self.state.mortgaged[idx] = True
+        player.receive(self._get_board_property(property_name)["hypothèque"])
 
     def _handle_build(self, player: Player, property_name: str) -> None:
         """Handle building a house on a property."""
-        prop = self._get_board_property(property_name)
-        if not prop:
+        idx = self.state.property_index.get(property_name)
+        if idx is None:
             raise ValueError(f"Property {property_name} not found")
+        prop = self._get_board_property(property_name)
 
-        if property_name not in player.properties:
+        if self.state.owner[idx] != player.index:
             raise ValueError(f"Player doesn't own {property_name}")
 
         if prop["type"] != "property":
             raise ValueError(f"Cannot build on {property_name} (not a property)")
 
-        if prop.get("mortgaged", False):
+        if self.state.mortgaged[idx]:
             raise ValueError(f"Cannot build on mortgaged property {property_name}")
 
         # Check color group ownership
-        color_group = self._get_color_group(prop["color_code"])
-        if any(p not in player.properties for p in color_group):
+        if not self.group_masks.has_monopoly(player.mask, idx):
             raise ValueError("Must own all properties in color group to build")
 
         # Check funds
@@ -304,13 +545,13 @@ class MonopolyRLEnv(gym.Env):
             raise ValueError(f"Not enough money to build (need {house_cost})")
 
         # Add house
-        prop["houses"] = min(prop.get("houses", 0) + 1, 5)
+        self.state.houses[idx] = min(self.state.houses[idx] + 1, 5)
         player.pay(house_cost)
 
     @staticmethod
     def _handle_trade(buyer: Player, seller: Player, property_name: str, amount: int) -> None:
         """Handle trading money for property between players."""
-        if property_name not in seller.properties:
+        if not seller.owns(property_name):
             raise ValueError(f"Seller doesn't own {property_name}")
 
         if buyer.money < amount:
@@ -318,50 +559,45 @@ class MonopolyRLEnv(gym.Env):
 
         buyer.pay(amount)
         seller.receive(amount)
-        seller.properties.remove(property_name)
-        buyer.properties.append(property_name)
+        seller.transfer_property(property_name, buyer)
 
-    @staticmethod
-    def _handle_property_swap(player1: Player, player2: Player, property_idx: int) -> None:
-        """Handle swapping properties between players."""
+    def _handle_property_swap(self, player1: Player, player2: Player, property_idx: int) -> Tuple[str, str]:
+        """Handle swapping properties between players. Returns the names of the two swapped properties."""
         # For simplicity, swap player1's first property with player2's property at index
-        if not player1.properties:
+        mask1 = player1.mask
+        if not mask1:
             raise ValueError("Player 1 has no properties to trade")
 
-        player1_prop = player1.properties[0]
-
-        if property_idx >= len(player2.properties):
+        owned2 = mask_to_indices(player2.mask)
+        if property_idx >= len(owned2):
             raise ValueError("Invalid property index for Player 2")
 
-        player2_prop = player2.properties[property_idx]
-
-        player1.properties.remove(player1_prop)
-        player2.properties.append(player1_prop)
-
-        player2.properties.remove(player2_prop)
-        player1.properties.append(player2_prop)
+        # Lowest set bit of player1's mask, and the property_idx-th set bit of player2's
+        give = mask1 & -mask1
+        take = 1 << int(owned2[property_idx])
+        player1.exchange(player2, give, take)
+        return self.property_order[give.bit_length() - 1], self.property_order[int(owned2[property_idx])]
 
     def _cycle_to_next_player(self) -> None:
         """Move to next active player."""
         for _ in range(len(self.players)):
             self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
-            if not self.players[self.current_player_idx].bankrupt:
+            if not self.state.bankrupt[self.current_player_idx]:
                 break
 
     def _calculate_reward(self, player: Player) -> float:
         """Calculate reward based on player's state."""
         reward = 0
+        owned = self.state.owned_by(player.index)
 
         # Money reward
         reward += player.money * 0.01
 
         # Properties reward
-        reward += len(player.properties) * 5
+        reward += int(np.count_nonzero(owned)) * 5
 
         # Houses reward
-        for prop in player.properties:
-            case = self._get_board_property(prop)
-            reward += case.get("houses", 0) * 10
+        reward += int(self.state.houses[owned].sum()) * 10
 
         # Bankruptcy penalty
         if player.bankrupt:
@@ -371,56 +607,65 @@ class MonopolyRLEnv(gym.Env):
 
     def _get_board_property(self, property_name: str) -> Dict:
         """Get property data from board by name."""
-        for case in self.board.board:
-            if case["name"] == property_name:
-                return case
-        raise ValueError(f"Property {property_name} not found on board")
+        case = self.board.get_property(property_name)
+        if case is None:
+            raise ValueError(f"Property {property_name} not found on board")
+        return case
 
     def _get_color_group(self, color_code: str) -> List[str]:
         """Get all properties in a color group."""
-        return [
-            p["name"] for p in self.board.board
-            if p.get("color_code") == color_code and p["type"] == "property"
-        ]
+        return [p["name"] for p in self.board.get_color_group(color_code) if p["type"] == "property"]
 
     def _get_other_players(self, current_player: Player) -> List[Player]:
         """Get list of other active players."""
-        return [p for p in self.players if p != current_player and not p.bankrupt]
+        return [p for p in self.players if p is not current_player and not p.bankrupt]
 
-    @staticmethod
-    def _initialize_players() -> List[Player]:
-        """Initialize player objects."""
-        return [Player(name=f"Player {i + 1}") for i in range(4)]
-
-    def _init_property_states(self) -> None:
-        """Initialize property states on the board."""
-        for case in self.board.board:
-            if case["type"] in ["property", "station", "utility"]:
-                case.setdefault("houses", 0)
-                case.setdefault("mortgaged", False)
+    def _initialize_players(self) -> List[Player]:
+        """Initialize player objects bound to the shared game state."""
+        return [Player(name=f"Player {i + 1}", state=self.state, index=i) for i in range(4)]
 
 #TODO: implementer méthodes manquante de Game.py à ici
-class MonopolyGame:
+class MonopolyGame(PropertyManagement):
     """
     Human-playable Monopoly game class.
     This class is separate from the RL environment and handles human interaction.
     """
 
-    def __init__(self):
-        print("Initializing Human-Playable Monopoly Game")
+    def __init__(self, decisions: Optional[DecisionPolicy] = None, seed: Optional[int] = None,
+                 log: Optional[EventLog] = None):
+        """
+        Args:
+            decisions (Optional[DecisionPolicy]): Answers the turn, buy and auction prompts; asks at the console
+                                                  when None.
+            seed (Optional[int]): Seed of the dice and cards.
+            log (Optional[EventLog]): Event sink; prints the game to the console when None.
+        """
+        self.decisions = decisions if decisions is not None else ConsoleDecisions()
+        # Dice and cards, reproducible for a given seed
+        self.rng = RandomStream(seed)
+        self.board = get_board()
+        self.state = GameState(self.board.property_order)
         self.players = self._initialize_players()
-        self.board = Board()
-        self._init_property_states()
+        self.rent_table = RentTable(self.board)
+        # Building and mortgage helpers of the decision policies
+        self._init_management_tables(self.board)
+        if log is None:
+            log = EventLog(VERBOSE, renderer=EventRenderer(self.board, [p.name for p in self.players]))
+        self.log = log
+        self.log.message("Initializing Human-Playable Monopoly Game")
 
     def start(self):
         """Start the game and run until completion."""
         round_number = 1
         active_players = [p for p in self.players if not p.bankrupt]
+        log = self.log
+        log.start_game()
 
         while len(active_players) > 1:
-            print(f"\n====== Round {round_number} ======")
+            log.turn = round_number
+            log.message("\n====== Round {} ======", round_number)
             for player in active_players:
-                print(f"\n--- Turn of {player.name} ---")
+                log.message("\n--- Turn of {} ---", player.name)
                 self._handle_player_turn(player)
 
                 # Update active players
@@ -431,20 +676,20 @@ class MonopolyGame:
             round_number += 1
 
         if active_players:
-            print(f"\nCongratulations, {active_players[0].name} has won the game!")
+            log.message("\nCongratulations, {} has won the game!", active_players[0].name)
         else:
-            print("The game ended without a winner.")
+            log.message("The game ended without a winner.")
 
     def _handle_player_turn(self, player: Player):
         """Handle a player's turn in the game."""
-        input(f"{player.name}, press Enter to roll the dice...")
-        dice_roll = self._roll_dice()
-        print(f"{player.name} rolled {dice_roll}.")
+        self.decisions.start_turn(self, player.index)
+        dice_roll = self._roll_dice(player)
 
         # Update player position
+        start = player.position
         player.position = self.board.move_player(player.position, dice_roll)
         current_case = self.board.get_case(player.position)
-        print(f"{player.name} moves to '{current_case['name']}'.")
+        self.log.move(player.index, start, player.position)
 
         # Handle landing on case
         self._handle_landing_on_case(player, current_case)
@@ -467,7 +712,7 @@ class MonopolyGame:
             self._handle_go_to_jail(player)
         # Add other case types as needed
 
-        print(f"{player.name} now has ${player.money}.")
+        self.log.message("{} now has ${}.", player.name, player.money)
 
     def _handle_property_case(self, player: Player, property_case: Dict):
         """Handle landing on a property case."""
@@ -477,22 +722,17 @@ class MonopolyGame:
         if owner is None:
             # No owner, player can buy it
             if player.money >= property_case["price"]:
-                buy_choice = input(f"Do you want to buy {property_name} for ${property_case['price']}? (y/n): ")
-                if buy_choice.lower() == 'y':
-                    player.pay(property_case["price"])
-                    player.properties.append(property_name)
-                    print(f"{player.name} now owns {property_name}!")
+                if self.decisions.buy_property(self, player.index, self.state.property_index[property_name]):
+                    self._buy(player, property_name, property_case["price"])
                 else:
                     self._auction_property(property_name, property_case["price"])
             else:
-                print(f"{player.name} doesn't have enough money to buy {property_name}.")
+                self.log.message("{} doesn't have enough money to buy {}.", player.name, property_name)
                 self._auction_property(property_name, property_case["price"])
         elif owner != player:
             # Property is owned by another player, pay rent
-            rent = self._calculate_rent(property_case, owner)
-            print(f"{player.name} pays ${rent} rent to {owner.name}.")
-            player.pay(rent)
-            owner.receive(rent)
+            rent = self._calculate_rent(property_case)
+            self._pay_rent(player, owner, property_name, rent)
 
     def _handle_station_case(self, player: Player, station_case: Dict):
         """Handle landing on a station case."""
@@ -501,23 +741,17 @@ class MonopolyGame:
 
         if owner is None:
             if player.money >= station_case["price"]:
-                buy_choice = input(f"Do you want to buy {station_name} for ${station_case['price']}? (y/n): ")
-                if buy_choice.lower() == 'y':
-                    player.pay(station_case["price"])
-                    player.properties.append(station_name)
-                    print(f"{player.name} now owns {station_name}!")
+                if self.decisions.buy_property(self, player.index, self.state.property_index[station_name]):
+                    self._buy(player, station_name, station_case["price"])
                 else:
                     self._auction_property(station_name, station_case["price"])
             else:
-                print(f"{player.name} doesn't have enough money to buy {station_name}.")
+                self.log.message("{} doesn't have enough money to buy {}.", player.name, station_name)
                 self._auction_property(station_name, station_case["price"])
         elif owner != player:
             # Station is owned by another player, pay rent
-            stations_owned = sum(1 for prop in owner.properties if self._get_board_property(prop)["type"] == "station")
-            rent = station_case["rent"] * (2 ** (stations_owned - 1))
-            print(f"{player.name} pays ${rent} rent to {owner.name}.")
-            player.pay(rent)
-            owner.receive(rent)
+            rent = self._calculate_rent(station_case)
+            self._pay_rent(player, owner, station_name, rent)
 
     def _handle_utility_case(self, player: Player, utility_case: Dict):
         """Handle landing on a utility case."""
@@ -526,44 +760,29 @@ class MonopolyGame:
 
         if owner is None:
             if player.money >= utility_case["price"]:
-                buy_choice = input(f"Do you want to buy {utility_name} for ${utility_case['price']}? (y/n): ")
-                if buy_choice.lower() == 'y':
-                    player.pay(utility_case["price"])
-                    player.properties.append(utility_name)
-                    print(f"{player.name} now owns {utility_name}!")
+                if self.decisions.buy_property(self, player.index, self.state.property_index[utility_name]):
+                    self._buy(player, utility_name, utility_case["price"])
                 else:
                     self._auction_property(utility_name, utility_case["price"])
             else:
-                print(f"{player.name} doesn't have enough money to buy {utility_name}.")
+                self.log.message("{} doesn't have enough money to buy {}.", player.name, utility_name)
                 self._auction_property(utility_name, utility_case["price"])
         elif owner != player:
             # Utility is owned by another player, pay rent based on dice roll
-            utilities_owned = sum(1 for prop in owner.properties if self._get_board_property(prop)["type"] == "utility")
-            dice_roll = self._roll_dice()
-            print(f"{player.name} rolls {dice_roll} for utility payment.")
+            dice_roll = self._roll_dice(player)
+            rent = self._calculate_rent(utility_case, dice_roll)
+            self._pay_rent(player, owner, utility_name, rent)
 
-            if utilities_owned == 1:
-                rent = dice_roll * 4
-            else:
-                rent = dice_roll * 10
-
-            print(f"{player.name} pays ${rent} to {owner.name}.")
-            player.pay(rent)
-            owner.receive(rent)
-
-    @staticmethod
-    def _handle_tax_case(player: Player, tax_case: Dict):
+    def _handle_tax_case(self, player: Player, tax_case: Dict):
         """Handle landing on a tax case."""
         tax_amount = tax_case.get("amount", 0)
-        print(f"{player.name} pays ${tax_amount} in tax.")
+        self.log.tax(player.index, player.position, tax_amount)
         player.pay(tax_amount)
 
     # TODO : méthode déjà défini dans `Game.py`, besoins de l'implementer.
 
-    @staticmethod
-    def _handle_card_case(player: Player, card_type: str):
+    def _handle_card_case(self, player: Player, card_type: str):
         """Handle landing on a chance or community chest case."""
-        print(f"{player.name} draws a {card_type} card.")
         # Implementation for cards would go here
         # For simplicity, just a placeholder
         card_effects = [
@@ -571,47 +790,42 @@ class MonopolyGame:
             {"description": "Pay hospital fees of $100.", "action": lambda p: p.pay(100)},
             {"description": "Advance to GO.", "action": lambda p: setattr(p, "position", 0)},
         ]
-        card = random.choice(card_effects)
-        print(f"Card says: {card['description']}")
+        card_idx = self.rng.draw(len(card_effects))
+        card = card_effects[card_idx]
+        self.log.card(player.index, CHANCE if card_type == "chance" else COMMUNITY_CHEST, card_idx)
+        self.log.message("Card says: {}", card["description"])
         card["action"](player)
 
     def _handle_go_to_jail(self, player: Player):
         """Handle landing on the Go To Jail case."""
-        print(f"{player.name} goes to jail!")
-        jail_position = next(i for i, case in enumerate(self.board.board) if case["name"] == "Jail")
+        self.log.jail(player.index, JailEvent.SENT)
+        jail_position = self.board.get_position("Prison/Simple visite")
         player.position = jail_position
 
+    def _buy(self, player: Player, property_name: str, price: int):
+        """Transfer a property from the bank to a player for a price."""
+        player.pay(price)
+        player.acquire_property(property_name)
+        self.log.buy(player.index, self.state.property_index[property_name], price)
+
+    def _pay_rent(self, player: Player, owner: Player, property_name: str, rent: int):
+        """Make a player pay the rent of a property to its owner."""
+        self.log.rent(player.index, owner.index, self.state.property_index[property_name], rent)
+        player.pay(rent)
+        owner.receive(rent)
+
     def _find_property_owner(self, property_name: str) -> Optional[Player]:
         """Find which player owns a property."""
-        for player in self.players:
-            if property_name in player.properties:
-                return player
-        return None
-
-    def _calculate_rent(self, property_case: Dict, owner: Player) -> int:
-        """Calculate rent for a property based on houses/hotels."""
-        houses = property_case.get("houses", 0)
-
-        if houses == 0:
-            # Check if owner has monopoly (owns all properties in color group)
-            color_code = property_case.get("color_code")
-            color_group = self._get_color_group(color_code)
-            has_monopoly = all(prop in owner.properties for prop in color_group)
-
-            base_rent = property_case["rent"]
-            return base_rent * (2 if has_monopoly else 1)
-        else:
-            # Rent with houses
-            rent_key = f"rent{houses}"
-            if rent_key in property_case:
-                return property_case[rent_key]
-            else:
-                # Fallback if specific house rent not defined
-                return property_case["rent"] * (houses + 1)
+        owner_idx = self.state.owner[self.state.property_index[property_name]]
+        return None if owner_idx == NO_OWNER else self.players[owner_idx]
+
+    def _calculate_rent(self, property_case: Dict, dice_roll: int = 0) -> int:
+        """Calculate the rent of an owned property, station or utility from the rent table."""
+        return self.rent_table.rent(self.state, self.state.property_index[property_case["name"]], dice_roll)
 
     def _auction_property(self, property_name: str, starting_price: int):
         """Auction a property to the highest bidder."""
-        print(f"\nAuction for {property_name} starting at ${starting_price}")
+        self.log.message("\nAuction for {} starting at ${}", property_name, starting_price)
 
         current_price = starting_price // 2  # Start at half price
         active_bidders = [p for p in self.players if not p.bankrupt and p.money >= current_price]
@@ -619,11 +833,12 @@ class MonopolyGame:
 
         while len(active_bidders) > 0:
             for player in active_bidders[:]:
-                print(f"Current bid: ${current_price}")
-                bid_choice = input(f"{player.name}, do you want to bid ${current_price + 10}? (y/n): ")
+                self.log.message("Current bid: ${}", current_price)
+                bid = self.decisions.auction_bid(self, player.index, self.state.property_index[property_name],
+                                                 current_price)
 
-                if bid_choice.lower() == 'y':
-                    current_price += 10
+                if bid > current_price:
+                    current_price = bid
                     highest_bidder = player
                 else:
                     active_bidders.remove(player)
@@ -632,44 +847,33 @@ class MonopolyGame:
                     break
 
             if len(active_bidders) == 0 and highest_bidder is None:
-                print(f"No one bought {property_name}.")
+                self.log.message("No one bought {}.", property_name)
                 return
 
         if highest_bidder:
-            print(f"{highest_bidder.name} won the auction for {property_name} at ${current_price}")
-            highest_bidder.pay(current_price)
-            highest_bidder.properties.append(property_name)
+            self.log.message("{} won the auction for {} at ${}", highest_bidder.name, property_name, current_price)
+            self._buy(highest_bidder, property_name, current_price)
 
     def _get_color_group(self, color_code: str) -> List[str]:
         """Get all properties in a color group."""
-        return [
-            p["name"] for p in self.board.board
-            if p.get("color_code") == color_code and p["type"] == "property"
-        ]
+        return [p["name"] for p in self.board.get_color_group(color_code) if p["type"] == "property"]
 
     def _get_board_property(self, property_name: str) -> Dict:
         """Get property data from board by name."""
-        for case in self.board.board:
-            if case["name"] == property_name:
-                return case
-        raise ValueError(f"Property {property_name} not found on board")
-
-    @staticmethod
-    def _initialize_players() -> List[Player]:
-        """Initialize player objects."""
-        return [Player(name=f"Player {i + 1}") for i in range(4)]
-
-    def _init_property_states(self):
-        """Initialize property states on board."""
-        for case in self.board.board:
-            if case["type"] in ["property", "station", "utility"]:
-                case.setdefault("houses", 0)
-                case.setdefault("mortgaged", False)
-
-    @staticmethod
-    def _roll_dice() -> int:
-        """Roll dice and return total."""
-        return random.randint(1, 6) + random.randint(1, 6)
+        case = self.board.get_property(property_name)
+        if case is None:
+            raise ValueError(f"Property {property_name} not found on board")
+        return case
+
+    def _initialize_players(self) -> List[Player]:
+        """Initialize player objects bound to the shared game state."""
+        return [Player(name=f"Player {i + 1}", state=self.state, index=i) for i in range(4)]
+
+    def _roll_dice(self, player: Player) -> int:
+        """Roll dice for a player and return total."""
+        die1, die2 = self.rng.roll()
+        self.log.roll(player.index, die1, die2)
+        return die1 + die2
 
 
 # Register the environment with Gymnasium
@@ -0,0 +1,224 @@
+import hashlib
+import os
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+from environment.engine import CHANCE_CARDS, COMMUNITY_CHEST_CARDS, MAX_JAIL_TURNS
+
+# Bump when the chain construction changes, so that stale cache files are not reused
+MODEL_VERSION = 1
+# Directory of the cached models; overridden by the MONOPOLY_AI_CACHE environment variable
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "monopoly_ai")
+
+# Outcomes of two six-sided dice, each with probability 1/36
+DICE = [(die1, die2) for die1 in range(1, 7) for die2 in range(1, 7)]
+
+
+class LandingModel:
+    """
+    Markov chain of the position of one player at the end of each of their turns, following the rules of
+    `MonopolyEngine`: one 2d6 roll per turn, the "go_to_jail" square, chance/community chest cards that move
+    the player, and jail (leave on doubles, or after `MAX_JAIL_TURNS` failed attempts with a new roll, or at
+    once when paying the fine).
+
+    States 0-39 are the squares (square 10 is "just visiting"); state `40 + k` is "in jail after k failed
+    attempts". Money, ownership and the other players do not affect movement, so the chain is exact for a
+    single token.
+
+    Attributes:
+        num_squares (int): Squares of the board.
+        jail_square (int): Square of the jail.
+        transition (np.ndarray): float64[S, S], state at the end of a turn given the state at its start.
+        landings (np.ndarray): float64[S, num_squares], expected number of stops on each square during one
+                               turn from each state (a card square and the square a card moves the player
+                               to both count).
+        stationary (np.ndarray): float64[S], long-run distribution of the end-of-turn state.
+        square_frequency (np.ndarray): float64[num_squares], long-run expected stops on each square per turn.
+        property_frequency (np.ndarray): float64[num_properties], `square_frequency` of the purchasable squares,
+                                         in property index order.
+    """
+
+    def __init__(self, transition: np.ndarray, landings: np.ndarray, stationary: np.ndarray,
+                 property_to_square: np.ndarray, jail_square: int):
+        self.transition = transition
+        self.landings = landings
+        self.stationary = stationary
+        self.num_squares = landings.shape[1]
+        self.jail_square = jail_square
+        self.square_frequency = stationary @ landings
+        self.property_frequency = self.square_frequency[property_to_square]
+        self._property_to_square = np.asarray(property_to_square)
+        self._powers: Dict[int, np.ndarray] = {0: np.eye(len(transition))}
+        for array in (transition, landings, stationary, self.square_frequency, self.property_frequency):
+            array.flags.writeable = False
+
+    @property
+    def num_states(self) -> int:
+        return len(self.transition)
+
+    def power(self, turns: int) -> np.ndarray:
+        """`transition` to the power `turns` (memoized)."""
+        if turns not in self._powers:
+            self._powers[turns] = np.linalg.matrix_power(self.transition, turns)
+        return self._powers[turns]
+
+    def distribution(self, turns: int, start: int = 0) -> np.ndarray:
+        """
+        Distribution of the end-of-turn state after some turns.
+
+        Args:
+            turns (int): Number of turns played.
+            start (int): State at the start (a square, or `num_squares + k` for jail).
+
+        Returns:
+            np.ndarray: float64[S].
+        """
+        return self.power(turns)[start]
+
+    def turn_landings(self, turn: int = 1, start: Any = 0) -> np.ndarray:
+        """
+        Expected stops on each square during the `turn`-th turn from now.
+
+        Args:
+            turn (int): 1 for the next turn.
+            start: Starting state, or an array of them (e.g. the positions of the players).
+
+        Returns:
+            np.ndarray: float64[num_squares], or [len(start), num_squares] for an array of states.
+        """
+        return self.power(turn - 1)[start] @ self.landings
+
+    def square_distribution(self, distribution: np.ndarray) -> np.ndarray:
+        """Folds the jail states of a state distribution onto the jail square."""
+        squares = distribution[..., :self.num_squares].copy()
+        squares[..., self.jail_square] += distribution[..., self.num_squares:].sum(axis=-1)
+        return squares
+
+    def expected_income(self, rent: np.ndarray, frequency: Optional[np.ndarray] = None) -> Any:
+        """
+        Expected rent collected per opponent turn.
+
+        Args:
+            rent (np.ndarray): float[..., num_properties], rent charged on each property.
+            frequency (Optional[np.ndarray]): Stops on each property; `property_frequency` when None.
+
+        Returns:
+            Expected income, the dot product of the rents with the landing frequencies.
+        """
+        return np.asarray(rent) @ (self.property_frequency if frequency is None else frequency)
+
+    def property_landings(self, turn: int = 1, start: Any = 0) -> np.ndarray:
+        """`turn_landings` restricted to the purchasable squares, in property index order."""
+        return self.turn_landings(turn, start)[..., self._property_to_square]
+
+
+def _model_key(board: Any, pay_jail: bool) -> str:
+    """Digest of everything the chain depends on, naming its cache file."""
+    rules = (MODEL_VERSION, [case["type"] for case in board.board], board.get_position("Prison/Simple visite"),
+             CHANCE_CARDS, COMMUNITY_CHEST_CARDS, MAX_JAIL_TURNS, pay_jail)
+    return hashlib.sha1(repr(rules).encode()).hexdigest()[:16]
+
+
+def build_chain(square_types: Sequence[str], jail_square: int, pay_jail: bool = False):
+    """
+    Builds the transition and landing matrices.
+
+    Args:
+        square_types (Sequence[str]): Type of each square of the board.
+        jail_square (int): Square of the jail.
+        pay_jail (bool): Whether jailed players pay the fine at once instead of trying to roll doubles.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: `transition` and `landings` (see `LandingModel`).
+    """
+    num_squares = len(square_types)
+    num_states = num_squares + MAX_JAIL_TURNS
+    jailed = num_squares  # State of a player just sent to jail
+    transition = np.zeros((num_states, num_states))
+    landings = np.zeros((num_states, num_squares))
+
+    def land(state: int, square: int, prob: float) -> None:
+        """Stops on a square and applies its movement effects."""
+        landings[state, square] += prob
+        kind = square_types[square]
+        if kind == "go_to_jail":
+            transition[state, jailed] += prob
+        elif kind in ("chance", "community_chest"):
+            deck = CHANCE_CARDS if kind == "chance" else COMMUNITY_CHEST_CARDS
+            card_prob = prob / len(deck)
+            for effect, value in deck:
+                if effect == "advance_to_go":
+                    landings[state, 0] += card_prob
+                    transition[state, 0] += card_prob
+                elif effect == "advance":
+                    land(state, (square + value) % num_squares, card_prob)
+                elif effect == "go_to_jail":
+                    transition[state, jailed] += card_prob
+                else:
+                    transition[state, square] += card_prob
+        else:
+            transition[state, square] += prob
+
+    def roll_from(state: int, square: int, prob: float, doubles_only: bool = False) -> None:
+        for die1, die2 in DICE:
+            if not doubles_only or die1 == die2:
+                land(state, (square + die1 + die2) % num_squares, prob / len(DICE))
+
+    for square in range(num_squares):
+        roll_from(square, square, 1.0)
+    for attempts in range(MAX_JAIL_TURNS):
+        state = jailed + attempts
+        if pay_jail:
+            roll_from(state, jail_square, 1.0)
+            continue
+        roll_from(state, jail_square, 1.0, doubles_only=True)
+        failed = 1 - sum(die1 == die2 for die1, die2 in DICE) / len(DICE)
+        if attempts + 1 < MAX_JAIL_TURNS:
+            transition[state, state + 1] += failed
+        else:
+            # Released after the last failed attempt, with a new roll
+            roll_from(state, jail_square, failed)
+    return transition, landings
+
+
+def stationary_distribution(transition: np.ndarray) -> np.ndarray:
+    """Solves `pi @ transition = pi` with `sum(pi) = 1`."""
+    num_states = len(transition)
+    system = transition.T - np.eye(num_states)
+    system[-1] = 1.0
+    rhs = np.zeros(num_states)
+    rhs[-1] = 1.0
+    return np.linalg.solve(system, rhs)
+
+
+def landing_model(board: Any, pay_jail: bool = False, cache_dir: Optional[str] = None) -> LandingModel:
+    """
+    Builds the landing model of a board, or loads it from the disk cache.
+
+    Args:
+        board (Board): Board providing the squares.
+        pay_jail (bool): Whether jailed players pay the fine at once.
+        cache_dir (Optional[str]): Cache directory; `MONOPOLY_AI_CACHE` or `CACHE_DIR` when None. The model is
+                                   simply rebuilt when the directory cannot be written.
+
+    Returns:
+        LandingModel: The model.
+    """
+    cache_dir = cache_dir or os.environ.get("MONOPOLY_AI_CACHE", CACHE_DIR)
+    path = os.path.join(cache_dir, f"landing_{_model_key(board, pay_jail)}.npz")
+    jail_square = board.get_position("Prison/Simple visite")
+    try:
+        with np.load(path) as cached:
+            arrays = cached["transition"], cached["landings"], cached["stationary"]
+    except (OSError, KeyError, ValueError):
+        transition, landings = build_chain([case["type"] for case in board.board], jail_square, pay_jail)
+        arrays = transition, landings, stationary_distribution(transition)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename, so that concurrent processes never read a partial file
+            partial = f"{path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as file:
+                np.savez(file, transition=arrays[0], landings=arrays[1], stationary=arrays[2])
+            os.replace(partial, path)
+        except OSError:
+            pass
+    return LandingModel(*arrays, board.property_to_square, jail_square)
@@ -0,0 +1,386 @@
+from typing import Any, Dict, Iterator, Optional, Tuple
+import numpy as np
+import gymnasium as gym
+from environment.action_masks import ActionMasks
+from environment.state import GameState, NO_OWNER
+
+# Number of "other player" slots in an observation
+NUM_OTHERS = 3
+# Separator of the keys of nested entries in a flat observation spec (e.g. "action_masks.build")
+FLAT_KEY_SEPARATOR = "."
+# Fixed-point scale of the [0, 1] float entries in an int16 flat observation
+INT16_SCALE = np.iinfo(np.int16).max
+INT16_MIN = np.iinfo(np.int16).min
+# Entries that never change during a game, written only once into a flat observation buffer
+STATIC_ENTRIES = ("all_properties",)
+
+
+class ObservationBuffers:
+    """
+    Preallocated, incrementally maintained observations of every seat of a single game.
+
+    Each seat has its own set of arrays laid out as `make_observation_space()`. The game calls the
+    `update_*` methods after each mutation so that only the affected cells are rewritten; `refresh`
+    rebuilds everything and must be called when the state was changed wholesale (reset, bankruptcy,
+    restore). `observation` then returns either read-only views of a seat's buffers (no allocation) or a
+    fresh copy, and `write` copies them into caller-provided arrays.
+
+    The "others" block of a seat lists the other active players in seat order, zero-padded, as
+    `MonopolyRLEnv._get_other_players`.
+    """
+
+    def __init__(self, state: GameState, property_data_norm: np.ndarray, masks: ActionMasks):
+        """
+        Allocates the buffers. They are filled by the first call to `refresh`.
+
+        Args:
+            state (GameState): Game state observed (single game).
+            property_data_norm (np.ndarray): Normalized static property data, shared by every observation.
+            masks (ActionMasks): Action masks of the game, kept up to date by the game before the buffers.
+        """
+        self.state = state
+        self.masks = masks
+        num_players = state.num_players
+        num_properties = state.owner.shape[-1]
+        self.num_players = num_players
+
+        self.self_money = np.zeros((num_players, 1), dtype=np.int32)
+        self.self_position = [0] * num_players
+        self.self_properties = np.zeros((num_players, num_properties), dtype=np.int8)
+        self.self_houses = np.zeros((num_players, num_properties), dtype=np.int8)
+        self.mortgage = np.zeros((num_players, num_properties), dtype=np.int8)
+        self.build = np.zeros((num_players, num_properties), dtype=np.int8)
+        self.can_trade = np.zeros((num_players, 1), dtype=np.int8)
+        self.others_money = np.zeros((num_players, NUM_OTHERS), dtype=np.int32)
+        self.others_properties = np.zeros((num_players, NUM_OTHERS, num_properties), dtype=np.int8)
+        self.others_positions = np.zeros((num_players, NUM_OTHERS), dtype=np.int32)
+        self.others_houses = np.zeros((num_players, NUM_OTHERS, num_properties), dtype=np.int8)
+        self.active_players = np.zeros(num_players, dtype=np.int8)
+        self.all_properties = property_data_norm.view()
+        self.all_properties.flags.writeable = False
+
+        # Row of player `q` in the "others" block of seat `p` (-1 if absent), and for each seat the players
+        # in its slots, padded with `num_players` which selects an all-zero row
+        self._slot = np.full((num_players, num_players), -1, dtype=np.intp)
+        self._others_rows = np.full((num_players, NUM_OTHERS), num_players, dtype=np.intp)
+        # Per-player column scratch space with a trailing zero row for empty slots
+        self._column = np.zeros(num_players + 1, dtype=np.int32)
+        self._players = np.arange(num_players, dtype=np.int8)[:, None]
+        # Bankruptcy flags the slot tables were computed for
+        self._bankrupt_key = None
+
+        self._views = [self._make_views(seat) for seat in range(num_players)]
+
+    def _make_views(self, seat: int) -> Dict[str, Any]:
+        """Builds the read-only observation dictionary of a seat, backed by the buffers."""
+        def read_only(array: np.ndarray) -> np.ndarray:
+            view = array.view()
+            view.flags.writeable = False
+            return view
+
+        return {
+            "self_money": read_only(self.self_money[seat]),
+            "self_position": 0,
+            "self_properties": read_only(self.self_properties[seat]),
+            "self_houses": read_only(self.self_houses[seat]),
+            "action_masks": {
+                "mortgage": read_only(self.mortgage[seat]),
+                "build": read_only(self.build[seat]),
+                "can_trade": read_only(self.can_trade[seat]),
+            },
+            "others_money": read_only(self.others_money[seat]),
+            "others_properties": read_only(self.others_properties[seat]),
+            "others_positions": read_only(self.others_positions[seat]),
+            "others_houses": read_only(self.others_houses[seat]),
+            "active_players": read_only(self.active_players),
+            "all_properties": self.all_properties,
+        }
+
+    def refresh(self) -> None:
+        """Rebuilds every buffer from the game state."""
+        state = self.state
+        num_players = self.num_players
+        bankrupt_key = state.bankrupt.tobytes()
+        if bankrupt_key != self._bankrupt_key:
+            # The "others" slots only move when a player goes bankrupt
+            self._bankrupt_key = bankrupt_key
+            self.active_players[:] = ~state.bankrupt
+            self._slot.fill(-1)
+            self._others_rows.fill(num_players)
+            for seat in range(num_players):
+                others = [p for p in range(num_players) if p != seat and not state.bankrupt[p]][:NUM_OTHERS]
+                self._others_rows[seat, :len(others)] = others
+                self._slot[seat, others] = np.arange(len(others))
+
+        # Per-player values padded with a trailing zero for the empty slots
+        column = self._column
+        column[:-1] = state.money
+        self.self_money[:, 0] = state.money
+        self.others_money[:] = column[self._others_rows]
+        column[:-1] = state.position
+        self.self_position[:] = state.position.tolist()
+        self.others_positions[:] = column[self._others_rows]
+
+        owned = state.owner == self._players
+        self.self_properties[:] = owned
+        np.multiply(owned, np.minimum(state.houses, 5), out=self.self_houses)
+        self._refresh_others_properties()
+        self.update_masks()
+
+    def others_rows(self, seat: int) -> np.ndarray:
+        """
+        Players shown in the "others" slots of a seat, padded with `num_players` for the empty slots (so that
+        they select an extra all-zero row of a per-player table).
+        """
+        return self._others_rows[seat]
+
+    def update_money(self, player_idx: int) -> None:
+        """Patches the cells showing the money of a player, and their build mask which depends on it."""
+        money = self.state.money[player_idx]
+        self.self_money[player_idx, 0] = money
+        seats = np.flatnonzero(self._slot[:, player_idx] >= 0)
+        self.others_money[seats, self._slot[seats, player_idx]] = money
+        self.build[player_idx] = self.masks.build[player_idx]
+
+    def update_position(self, player_idx: int) -> None:
+        """Patches the cells showing the position of a player."""
+        position = int(self.state.position[player_idx])
+        self.self_position[player_idx] = position
+        seats = np.flatnonzero(self._slot[:, player_idx] >= 0)
+        self.others_positions[seats, self._slot[seats, player_idx]] = position
+
+    def update_property(self, property_idx: int) -> None:
+        """
+        Patches the cells of one property (owner, houses or mortgage changed) and the action masks.
+
+        Args:
+            property_idx (int): Index of the changed property.
+        """
+        owner = self.state.owner[property_idx]
+        self.self_properties[:, property_idx] = 0
+        self.self_houses[:, property_idx] = 0
+        if owner != NO_OWNER:
+            self.self_properties[owner, property_idx] = 1
+            self.self_houses[owner, property_idx] = min(self.state.houses[property_idx], 5)
+        column = self._column
+        column[:-1] = self.self_properties[:, property_idx]
+        self.others_properties[:, :, property_idx] = column[self._others_rows]
+        column[:-1] = self.self_houses[:, property_idx]
+        self.others_houses[:, :, property_idx] = column[self._others_rows]
+        self.update_masks()
+
+    def update_masks(self) -> None:
+        """Copies the action masks of every player."""
+        self.mortgage[:] = self.masks.mortgage
+        self.build[:] = self.masks.build
+        self.can_trade[:, 0] = self.self_properties.any(axis=1)
+
+    def _refresh_others_properties(self) -> None:
+        """Copies the per-player property and house rows into the "others" blocks of every seat."""
+        padded = np.zeros((self.num_players + 1,) + self.self_properties.shape[1:], dtype=np.int8)
+        padded[:-1] = self.self_properties
+        self.others_properties[:] = padded[self._others_rows]
+        padded[:-1] = self.self_houses
+        self.others_houses[:] = padded[self._others_rows]
+
+    def observation(self, player_idx: int, copy: bool = True) -> Dict[str, Any]:
+        """
+        Returns the observation of a seat.
+
+        Args:
+            player_idx (int): Index of the observing player.
+            copy (bool): Whether to return fresh arrays. When False, the returned arrays are read-only views
+                         that are updated in place by later mutations.
+
+        Returns:
+            Dict[str, Any]: Observation laid out as `make_observation_space()`.
+        """
+        views = self._views[player_idx]
+        views["self_position"] = self.self_position[player_idx]
+        if not copy:
+            return views
+        # "all_properties" is static and stays shared
+        observation = {key: value.copy() if isinstance(value, np.ndarray) and key != "all_properties" else value
+                       for key, value in views.items()}
+        observation["action_masks"] = {key: value.copy() for key, value in views["action_masks"].items()}
+        return observation
+
+    def write(self, player_idx: int, out: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copies the observation of a seat into caller-provided arrays.
+
+        Args:
+            player_idx (int): Index of the observing player.
+            out (Dict[str, Any]): Arrays laid out as `make_observation_space()`; "self_position" is set as an int.
+
+        Returns:
+            Dict[str, Any]: `out`.
+        """
+        views = self.observation(player_idx, copy=False)
+        for key, value in views.items():
+            if key == "action_masks":
+                for mask_key, mask in value.items():
+                    np.copyto(out[key][mask_key], mask)
+            elif isinstance(value, np.ndarray):
+                np.copyto(out[key], value)
+            else:
+                out[key] = value
+        return out
+
+
+def allocate_observation(observation_space: gym.spaces.Dict) -> Dict[str, Any]:
+    """
+    Allocates an observation dictionary to be filled by `ObservationBuffers.write`.
+
+    Args:
+        observation_space (gym.spaces.Dict): Observation space of the environment.
+
+    Returns:
+        Dict[str, Any]: Zero-filled arrays for every Box/MultiBinary entry, 0 for Discrete entries.
+    """
+    return {
+        key: allocate_observation(space) if isinstance(space, gym.spaces.Dict)
+        else 0 if isinstance(space, gym.spaces.Discrete) else np.zeros(space.shape, dtype=space.dtype)
+        for key, space in observation_space.spaces.items()
+    }
+
+
+def _leaves(space: gym.spaces.Dict, prefix: str = "") -> Iterator[Tuple[str, gym.Space]]:
+    """Yields the (flat key, space) of every leaf of a nested Dict space, in order."""
+    for key, subspace in space.spaces.items():
+        if isinstance(subspace, gym.spaces.Dict):
+            yield from _leaves(subspace, prefix + key + FLAT_KEY_SEPARATOR)
+        else:
+            yield prefix + key, subspace
+
+
+def flat_observation_spec(observation_space: gym.spaces.Dict) -> Dict[str, Tuple[slice, Tuple[int, ...]]]:
+    """
+    Layout of the flat observation vector: every leaf of the Dict space, in order, one after the other.
+
+    Args:
+        observation_space (gym.spaces.Dict): Observation space of the environment.
+
+    Returns:
+        Dict[str, Tuple[slice, Tuple[int, ...]]]: For every leaf (nested keys joined with "."), its slice of
+                                                  the flat vector and its shape in the Dict observation
+                                                  (Discrete entries take one cell and have shape ()).
+    """
+    spec = {}
+    offset = 0
+    for key, space in _leaves(observation_space):
+        shape = () if isinstance(space, gym.spaces.Discrete) else tuple(space.shape)
+        size = int(np.prod(shape, dtype=np.int64))
+        spec[key] = (slice(offset, offset + size), shape)
+        offset += size
+    return spec
+
+
+class FlatObservation:
+    """
+    One contiguous vector holding a whole Dict observation, for networks that take a single input tensor.
+
+    Every leaf of the Dict space is given a fixed slice of the vector (see `flat_observation_spec`, published
+    as `spec`), and `write` copies a Dict observation into a preallocated `buffer` leaf by leaf, with no
+    concatenation. Entries listed in `STATIC_ENTRIES` are only written once.
+
+    With `dtype=np.int16`, integer entries are clipped to the int16 range and the [0, 1] float entries are
+    stored in fixed point, multiplied by `INT16_SCALE`.
+
+    With `batch_size` set, the buffer has a leading batch axis and `write` takes a batched observation, as
+    returned by the vectorized environment.
+    """
+
+    def __init__(self, observation_space: gym.spaces.Dict, dtype: Any = np.float32,
+                 batch_size: Optional[int] = None):
+        """
+        Args:
+            observation_space (gym.spaces.Dict): Observation space of one environment.
+            dtype: `np.float32` or `np.int16`.
+            batch_size (Optional[int]): Number of observations written together, or None for one.
+        """
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.int16):
+            raise ValueError(f"Unsupported flat observation dtype {self.dtype}")
+        self.spec = flat_observation_spec(observation_space)
+        self.size = max((field.stop for field, _ in self.spec.values()), default=0)
+        self.batch_size = batch_size
+        batch = () if batch_size is None else (batch_size,)
+        self.buffer = np.zeros(batch + (self.size,), dtype=self.dtype)
+
+        integer = self.dtype == np.int16
+        low = np.zeros(self.size, dtype=np.float64)
+        high = np.zeros(self.size, dtype=np.float64)
+        # (path in the Dict observation, view of the buffer, scale, clip, static)
+        self._fields = []
+        for key, space in _leaves(observation_space):
+            field, shape = self.spec[key]
+            if isinstance(space, gym.spaces.Discrete):
+                low[field], high[field] = space.start, space.start + space.n - 1
+            elif isinstance(space, gym.spaces.MultiBinary):
+                low[field], high[field] = 0, 1
+            else:
+                low[field], high[field] = space.low.ravel(), space.high.ravel()
+            scale, clip = None, False
+            if integer and isinstance(space, gym.spaces.Box):
+                if np.issubdtype(space.dtype, np.floating):
+                    scale = INT16_SCALE
+                    low[field] *= scale
+                    high[field] *= scale
+                else:
+                    # Money is only bounded by the game, not by the space
+                    clip = np.dtype(space.dtype).itemsize > self.dtype.itemsize
+            view = self.buffer[..., field].reshape(batch + shape)
+            self._fields.append((tuple(key.split(FLAT_KEY_SEPARATOR)), view, scale, clip, key in STATIC_ENTRIES))
+        if integer:
+            np.clip(low, INT16_MIN, INT16_SCALE, out=low)
+            np.clip(high, INT16_MIN, INT16_SCALE, out=high)
+        self._static_written = False
+
+        self.space = gym.spaces.Box(low=low.astype(self.dtype), high=high.astype(self.dtype), shape=(self.size,),
+                                    dtype=self.dtype)
+
+    def write(self, observation: Dict[str, Any]) -> np.ndarray:
+        """
+        Copies a Dict observation into the buffer.
+
+        Args:
+            observation (Dict[str, Any]): Observation laid out as the Dict space (batched if `batch_size` is set).
+
+        Returns:
+            np.ndarray: `buffer`, overwritten by the next call.
+        """
+        for path, view, scale, clip, static in self._fields:
+            if static and self._static_written:
+                continue
+            value = observation
+            for key in path:
+                value = value[key]
+            if scale is not None:
+                value = np.rint(np.multiply(value, scale))
+            elif clip:
+                value = np.clip(value, INT16_MIN, INT16_SCALE)
+            # Item assignment casts like `np.copyto(casting="unsafe")` at a fraction of its call overhead
+            view[...] = value
+        self._static_written = True
+        return self.buffer
+
+    def unflatten(self, flat: np.ndarray) -> Dict[str, Any]:
+        """
+        Returns views of a flat observation (or batch of them) shaped as the Dict observation, for inspection.
+
+        Args:
+            flat (np.ndarray): Vector(s) laid out as `spec`.
+
+        Returns:
+            Dict[str, Any]: Nested dictionary of views of `flat`, in the flat dtype.
+        """
+        batch = flat.shape[:-1]
+        nested: Dict[str, Any] = {}
+        for key, (field, shape) in self.spec.items():
+            *parents, leaf = key.split(FLAT_KEY_SEPARATOR)
+            node = nested
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = flat[..., field].reshape(batch + shape)
+        return nested
@@ -0,0 +1,160 @@
+from typing import Any, Dict, Optional
+import numpy as np
+from environment.actions import BUILD, DO_NOTHING, DiscreteActions
+from environment.rent import MAX_HOUSES
+from environment.state import PROPERTY_BITS
+
+# Property bits as a row, to unpack int64 ownership masks against
+_BITS = PROPERTY_BITS[None, :]
+
+
+class BatchedPolicy:
+    """
+    Decisions of the scripted seats of `MonopolyVectorEnv`, taken for many games at once with array operations.
+
+    The batched counterpart of `DecisionPolicy`: every callback receives the env (its batched `GameState` is
+    `env.state`), the games `rows` whose current player it plays and the seat of that player in each of them
+    (`seats`, aligned with `rows`), and answers with one decision per row. The defaults never manage, buy
+    whatever is affordable and never raise funds, i.e. the env's built-in rules.
+    """
+
+    def start_turn(self, env: Any, rows: np.ndarray, seats: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Management action of each player before the dice are rolled.
+
+        Returns:
+            Dict[str, np.ndarray]: Actions laid out as the batched `make_action_space()`, one per row.
+        """
+        return do_nothing(len(rows))
+
+    def buy_property(self, env: Any, rows: np.ndarray, seats: np.ndarray, props: np.ndarray) -> np.ndarray:
+        """
+        Whether each player buys the unowned property they landed on (affordability is checked by the env).
+
+        Returns:
+            np.ndarray: bool[len(rows)].
+        """
+        return np.ones(len(rows), dtype=np.bool_)
+
+    def raise_funds(self, env: Any, rows: np.ndarray, seats: np.ndarray) -> None:
+        """Called for players whose money went negative, before they are declared bankrupt."""
+
+
+def do_nothing(count: int) -> Dict[str, np.ndarray]:
+    """Batch of `count` "do nothing" actions."""
+    return {
+        "action_type": np.full(count, DO_NOTHING, dtype=np.int64),
+        "property_idx": np.zeros(count, dtype=np.int64),
+        "trade_partner": np.zeros(count, dtype=np.int64),
+        "trade_amount": np.zeros((count, 1), dtype=np.int32),
+    }
+
+
+def owned(env: Any, rows: np.ndarray, seats: np.ndarray) -> np.ndarray:
+    """bool[len(rows), P], properties of each player, unpacked from `GameState.owner_mask`."""
+    return env.state.owner_mask[rows, seats][:, None] & _BITS != 0
+
+
+def mortgageable(env: Any, rows: np.ndarray, seats: np.ndarray) -> np.ndarray:
+    """bool[len(rows), P], properties each player can mortgage."""
+    return owned(env, rows, seats) & ~env.state.mortgaged[rows]
+
+
+def buildable(env: Any, rows: np.ndarray, seats: np.ndarray) -> np.ndarray:
+    """bool[len(rows), P], streets each player can afford to build on (as the "build" action mask)."""
+    monopolies = env.group_masks.monopolies(env.state.owner_mask[rows, seats])
+    money = env.state.money[rows, seats]
+    return (mortgageable(env, rows, seats) & (monopolies[:, None] & _BITS != 0)
+            & (env.house_cost <= money[:, None]))
+
+
+class AlwaysBuy(BatchedPolicy):
+    """Buys every affordable property and never manages."""
+
+
+class CashThresholdBuyer(BatchedPolicy):
+    """Buys a property only when at least `reserve` money is left after paying for it."""
+
+    def __init__(self, reserve: int = 200):
+        self.reserve = reserve
+
+    def buy_property(self, env: Any, rows: np.ndarray, seats: np.ndarray, props: np.ndarray) -> np.ndarray:
+        return env.state.money[rows, seats] - env.price[props] >= self.reserve
+
+
+class GreedyBuilder(BatchedPolicy):
+    """
+    Buys every affordable property and, each turn, builds one house on the buildable street with the best
+    marginal ROI (`PropertyValuation.house_roi`) while keeping `reserve` money.
+    """
+
+    def __init__(self, reserve: int = 300):
+        self.reserve = reserve
+
+    def start_turn(self, env: Any, rows: np.ndarray, seats: np.ndarray) -> Dict[str, np.ndarray]:
+        state = env.state
+        props = np.arange(state.houses.shape[1])
+        houses = state.houses[rows].astype(np.intp)
+        spare = state.money[rows, seats][:, None] - env.house_cost >= self.reserve
+        candidates = buildable(env, rows, seats) & spare & (houses < MAX_HOUSES)
+        score = np.where(candidates, env.board.valuation.house_roi[props, houses], -1.0)
+        actions = do_nothing(len(rows))
+        build = candidates.any(axis=1)
+        actions["action_type"][build] = BUILD
+        actions["property_idx"][build] = score[build].argmax(axis=1)
+        return actions
+
+
+class MortgageWhenShort(BatchedPolicy):
+    """
+    Buys every affordable property and, when short of money, mortgages properties until the debt is covered,
+    giving up the least expected income per unit of cash first (`PropertyValuation.base_income`).
+    """
+
+    def raise_funds(self, env: Any, rows: np.ndarray, seats: np.ndarray) -> None:
+        state = env.state
+        valuation = env.board.valuation
+        order = np.argsort(valuation.base_income / np.maximum(env.mortgage_value, 1), kind="stable")
+        candidates = mortgageable(env, rows, seats)[:, order]
+        value = np.where(candidates, env.mortgage_value[order], 0)
+        # Mortgage the shortest prefix of the ranking covering the debt
+        raised_before = np.cumsum(value, axis=1) - value
+        debt = -state.money[rows, seats]
+        take = candidates & (raised_before < debt[:, None])
+        props = np.broadcast_to(order, take.shape)
+        r, p = np.nonzero(take)
+        state.mortgaged[rows[r], props[r, p]] = True
+        state.money[rows, seats] += (value * take).sum(axis=1).astype(state.money.dtype)
+
+
+class RandomLegal(BatchedPolicy):
+    """Plays a uniformly random legal flat action (`DiscreteActions`) and buys with probability `buy_prob`."""
+
+    def __init__(self, seed: Optional[int] = None, buy_prob: float = 0.5):
+        self.rng = np.random.default_rng(seed)
+        self.buy_prob = buy_prob
+        self._actions: Optional[DiscreteActions] = None
+
+    def start_turn(self, env: Any, rows: np.ndarray, seats: np.ndarray) -> Dict[str, np.ndarray]:
+        if self._actions is None:
+            self._actions = DiscreteActions(env.board)
+        state = env.state
+        partners = env.other_players(rows)
+        legal = self._actions.legal_mask(mortgageable(env, rows, seats), buildable(env, rows, seats),
+                                         state.owner[rows], seats, state.money[rows, seats], partners)
+        # Uniform among the legal actions: argmax of uniform noise over the legal entries
+        choice = np.argmax(self.rng.random(legal.shape) * legal, axis=1)
+        return self._actions.decode_batch(choice)
+
+    def buy_property(self, env: Any, rows: np.ndarray, seats: np.ndarray, props: np.ndarray) -> np.ndarray:
+        return self.rng.random(len(rows)) < self.buy_prob
+
+
+# Built-in opponents by name, as accepted by `MonopolyVectorEnv(opponents=...)`
+OPPONENTS = {
+    "always_buy": AlwaysBuy,
+    "cash_threshold": CashThresholdBuyer,
+    "greedy_builder": GreedyBuilder,
+    "mortgage_when_short": MortgageWhenShort,
+    "random_legal": RandomLegal,
+}
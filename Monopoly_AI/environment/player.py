@@ -1,20 +1,124 @@
+from typing import Union
+from environment.board import get_board
+from environment.state import GameState, mask_to_indices
+
+
 class Player:
-    def __init__(self, name, starting_money=1500):
+    """
+    A seat at the table. The player's money, position and properties live in a shared `GameState`;
+    this object is a named view onto row `index` of that state.
+
+    Ownership is read from the state's `owner_mask`, a 28-bit integer with bit i set when the player owns
+    property i: `owns` is a bit test, `property_count` a popcount, and trades are set operations on masks
+    (`exchange`). The list of owned names, `properties`, is only built when asked for.
+    """
+
+    __slots__ = ("name", "state", "index", "_names_mask", "_names")
+
+    def __init__(self, name, starting_money=1500, state=None, index=0):
+        if state is None:
+            # Standalone player: a one-seat state over the board's properties, so that buying works by name
+            state = GameState(get_board().property_order, num_players=1, starting_money=starting_money)
         self.name = name
-        self.money = starting_money
-        self.position = 0
-        self.properties = []
-        self.bankrupt = False
+        self.state = state
+        self.index = index
+        self.state.money[index] = starting_money
+        # Mask for which `_names` was last built
+        self._names_mask = -1
+        self._names = ()
+
+    @property
+    def money(self):
+        return int(self.state.money[self.index])
+
+    @money.setter
+    def money(self, value):
+        self.state.money[self.index] = value
+
+    @property
+    def position(self):
+        return int(self.state.position[self.index])
+
+    @position.setter
+    def position(self, value):
+        self.state.position[self.index] = value
+
+    @property
+    def bankrupt(self):
+        return bool(self.state.bankrupt[self.index])
+
+    @bankrupt.setter
+    def bankrupt(self, value):
+        self.state.bankrupt[self.index] = value
+
+    @property
+    def jail_turns(self):
+        return int(self.state.jail_turns[self.index])
+
+    @jail_turns.setter
+    def jail_turns(self, value):
+        self.state.jail_turns[self.index] = value
+
+    @property
+    def mask(self):
+        """Owned properties as a bitmask (bit i set = property i)."""
+        return int(self.state.owner_mask[self.index])
+
+    @property
+    def property_count(self):
+        return self.mask.bit_count()
+
+    @property
+    def properties(self):
+        """Names of the owned properties, in board order (read-only snapshot, rebuilt only after a change)."""
+        mask = self.mask
+        if mask != self._names_mask:
+            names = self.state.property_names
+            self._names = tuple(names[idx] for idx in mask_to_indices(mask))
+            self._names_mask = mask
+        return list(self._names)
+
+    def owns(self, prop: Union[str, int]):
+        """Whether the player owns a property, given by name or by property index."""
+        if isinstance(prop, str):
+            prop = self.state.property_index.get(prop)
+            if prop is None:
+                return False
+        return bool(self.state.owner_mask[self.index] >> prop & 1)
+
+    def owns_all(self, mask):
+        """Whether the player owns every property of a mask (e.g. a color group)."""
+        return self.mask & mask == mask
 
     def pay(self, amount):
-        self.money -= amount
+        self.state.money[self.index] -= amount
 
     def receive(self, amount):
-        self.money += amount
+        self.state.money[self.index] += amount
+
+    def acquire_property(self, property_name):
+        self.state.transfer(self.state.property_index[property_name], self.index)
+
+    def transfer_property(self, property_name, recipient):
+        self.state.transfer(self.state.property_index[property_name], recipient.index)
+
+    def exchange(self, other, give_mask, take_mask):
+        """
+        Swaps sets of properties with another player: `give_mask` goes to `other`, `take_mask` comes back.
+
+        Raises:
+            ValueError: If either side does not own all the properties it trades.
+        """
+        if not self.owns_all(give_mask):
+            raise ValueError(f"{self.name} doesn't own all the offered properties")
+        if not other.owns_all(take_mask):
+            raise ValueError(f"{other.name} doesn't own all the requested properties")
+        self.state.transfer_mask(give_mask, other.index)
+        self.state.transfer_mask(take_mask, self.index)
 
     def buy_property(self, property_name, price):
         if self.money >= price:
-            self.money -= price
-            self.properties.append(property_name)
+            self.pay(price)
+            self.acquire_property(property_name)
             return True
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,83 @@
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Optional
+
+
+class PhaseProfiler:
+    """
+    Accumulates `perf_counter_ns` timings and call counts of named phases.
+
+    Phases are timed by wrapping callables with `wrap`; an environment installs the wrappers as instance
+    attributes that shadow its methods, and removes them to stop profiling, so that un-profiled code runs the
+    plain methods with no timing code at all. Besides the totals, `last` holds the time spent in each phase
+    since the last `start_call`, e.g. during the current `step`.
+    """
+
+    def __init__(self):
+        self.total_ns: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.last: Dict[str, int] = {}
+
+    def wrap(self, phase: str, function: Callable, top_level: bool = False) -> Callable:
+        """
+        Returns a timed version of a callable.
+
+        Args:
+            phase (str): Name under which the calls are accumulated.
+            function (Callable): Callable to time.
+            top_level (bool): Whether a call starts a new `last` breakdown (e.g. `step` and `reset`).
+
+        Returns:
+            Callable: Wrapper with the same signature.
+        """
+        total_ns, calls, clock = self.total_ns, self.calls, perf_counter_ns
+        total_ns.setdefault(phase, 0)
+        calls.setdefault(phase, 0)
+
+        def timed(*args, **kwargs):
+            if top_level:
+                self.last = {}
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                total_ns[phase] += elapsed
+                calls[phase] += 1
+                last = self.last
+                last[phase] = last.get(phase, 0) + elapsed
+
+        timed.__wrapped__ = function
+        return timed
+
+    def reset(self) -> None:
+        """Clears the accumulated timings."""
+        for phase in self.total_ns:
+            self.total_ns[phase] = 0
+            self.calls[phase] = 0
+        self.last = {}
+
+    def report(self, parent: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregates the timings.
+
+        Args:
+            parent (Optional[Dict[str, str]]): Phase -> enclosing phase, used to express each phase as a share of
+                                               its parent's time.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For every phase, its call count, total time (ms), mean time per call (µs)
+                                       and share of the parent's total time (when known).
+        """
+        report = {}
+        for phase, total in self.total_ns.items():
+            calls = self.calls[phase]
+            entry = {
+                "calls": calls,
+                "total_ms": total / 1e6,
+                "mean_us": total / calls / 1e3 if calls else 0.0,
+            }
+            owner = parent.get(phase) if parent else None
+            if owner is not None and self.total_ns.get(owner):
+                entry["share"] = total / self.total_ns[owner]
+            report[phase] = entry
+        return report
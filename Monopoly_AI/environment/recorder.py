@@ -0,0 +1,251 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import gymnasium as gym
+from environment.observation import FLAT_KEY_SEPARATOR, _leaves
+
+# Steps after which a shard is closed, at the end of the current episode
+SHARD_STEPS = 100_000
+# Rows allocated when a shard is opened; columns double their capacity when full
+INITIAL_ROWS = 4096
+# File describing the columns of a closed shard
+META_FILE = "meta.json"
+# Version of the on-disk layout, stored in every shard's metadata
+FORMAT_VERSION = 1
+
+
+def shard_name(index: int) -> str:
+    """Directory name of the `index`-th shard of a recording."""
+    return f"shard_{index:05d}"
+
+
+def space_columns(space: gym.Space, prefix: str) -> List[Tuple[str, Tuple[str, ...], Tuple[int, ...], np.dtype]]:
+    """
+    Columns storing the values of a space: one per leaf of a Dict space, or a single one.
+
+    Returns:
+        List of (column name, key path in the nested value, per-row shape, dtype).
+    """
+    leaves = _leaves(space) if isinstance(space, gym.spaces.Dict) else [("", space)]
+    columns = []
+    for key, leaf in leaves:
+        shape = () if isinstance(leaf, gym.spaces.Discrete) else tuple(leaf.shape)
+        name = prefix + FLAT_KEY_SEPARATOR + key if key else prefix
+        path = tuple(key.split(FLAT_KEY_SEPARATOR)) if key else ()
+        columns.append((name, path, shape, np.dtype(leaf.dtype)))
+    return columns
+
+
+class Column:
+    """
+    One field of a shard: a raw file of fixed-size rows mapped with `np.memmap`, grown by doubling.
+
+    Rows are written in place into the mapping, so the data goes to the page cache and then to disk as the OS
+    writes it back; nothing is accumulated in Python memory. `rows` is a plain ndarray view of the mapping, which
+    skips the `np.memmap` subclass machinery on every row assignment.
+    """
+
+    def __init__(self, path: str, shape: Tuple[int, ...], dtype: Any, capacity: int = INITIAL_ROWS):
+        self.path = path
+        self.shape = tuple(int(size) for size in shape)
+        self.dtype = np.dtype(dtype)
+        self.row_bytes = self.dtype.itemsize * int(np.prod(self.shape, dtype=np.int64))
+        with open(path, "wb") as file:
+            file.truncate(capacity * self.row_bytes)
+        self._map(capacity)
+
+    def _map(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.data = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(capacity,) + self.shape)
+        self.rows = self.data.view(np.ndarray)
+
+    def grow(self, capacity: int) -> None:
+        """Extends the file to `capacity` rows and maps it again."""
+        self.data.flush()
+        del self.data, self.rows
+        with open(self.path, "r+b") as file:
+            file.truncate(capacity * self.row_bytes)
+        self._map(capacity)
+
+    def close(self, length: int) -> Dict[str, Any]:
+        """Flushes the column, trims its file to `length` rows and returns its metadata."""
+        self.data.flush()
+        del self.data, self.rows
+        with open(self.path, "r+b") as file:
+            file.truncate(length * self.row_bytes)
+        return {"file": os.path.basename(self.path), "dtype": self.dtype.str, "shape": list(self.shape),
+                "length": length}
+
+
+class TrajectoryRecorder(gym.Wrapper):
+    """
+    Records every step of an environment into memory-mapped columnar shards.
+
+    Each step of an episode is one row of the step columns of the current shard:
+      - "obs.<leaf>": the observation the action was taken from (one column per leaf of a Dict observation,
+        "obs" for a flat one),
+      - "action.<leaf>" (or "action"), "reward", "terminated", "truncated",
+      - "action_mask": the legal flat actions of that observation, when the infos carry them (discrete mode).
+    Each episode is one row of the episode columns: "episodes" holds its [start, stop) rows, and
+    "final_obs.<leaf>" the observation it ended on. An episode still running when the recording is closed is
+    kept, cut at its last step.
+
+    Shards are directories `shard_00000`, `shard_00001`... in `directory`, each with one raw file per column
+    and a `META_FILE` listing the columns (dtype, shape, rows). A shard is closed, i.e. its files trimmed and
+    its metadata written, after `shard_steps` steps at the end of the current episode, so episodes never span
+    shards. The columns are preallocated and double their capacity when full, so a step costs one row
+    assignment per column and the recording never holds more than the mapped pages in memory.
+
+    Usage:
+        env = TrajectoryRecorder(MonopolyRLEnv(copy_obs=False), "data/run0")
+        ...
+        env.close()
+    """
+
+    def __init__(self, env: gym.Env, directory: str, shard_steps: int = SHARD_STEPS,
+                 initial_rows: int = INITIAL_ROWS):
+        """
+        Args:
+            env (gym.Env): Environment to record.
+            directory (str): Directory of the shards; created if needed, existing shards are kept and numbered
+                             after.
+            shard_steps (int): Steps after which a shard is closed, at the end of the current episode.
+            initial_rows (int): Rows allocated per column when a shard is opened.
+        """
+        super().__init__(env)
+        self.directory = directory
+        self.shard_steps = shard_steps
+        self.initial_rows = initial_rows
+        os.makedirs(directory, exist_ok=True)
+        self.shard_index = sum(1 for name in os.listdir(directory) if name.startswith("shard_"))
+        self._obs_columns = space_columns(env.observation_space, "obs")
+        self._action_columns = space_columns(env.action_space, "action")
+        self._with_mask: Optional[bool] = None
+        self._shard_dir: Optional[str] = None
+        self._steps: Dict[str, Column] = {}
+        self._episodes: Dict[str, Column] = {}
+        self._row = 0            # Next step row of the shard
+        self._episode = 0        # Next episode row of the shard
+        self._start: Optional[int] = None  # First row of the running episode, None between episodes
+
+    def _open_shard(self) -> None:
+        self._shard_dir = os.path.join(self.directory, shard_name(self.shard_index))
+        os.makedirs(self._shard_dir, exist_ok=True)
+        rows = self.initial_rows
+
+        def column(name: str, shape: Tuple[int, ...], dtype: Any, capacity: int) -> Column:
+            return Column(os.path.join(self._shard_dir, name + ".bin"), shape, dtype, capacity)
+
+        step_columns = [(name, shape, dtype) for name, _, shape, dtype in self._obs_columns + self._action_columns]
+        step_columns += [("reward", (), np.float32), ("terminated", (), np.bool_), ("truncated", (), np.bool_)]
+        if self._with_mask:
+            step_columns.append(("action_mask", (self.env.action_space.n,), np.bool_))
+        self._steps = {name: column(name, shape, dtype, rows) for name, shape, dtype in step_columns}
+        episode_rows = max(rows // 64, 16)
+        self._episodes = {"episodes": column("episodes", (2,), np.int64, episode_rows)}
+        for name, _, shape, dtype in self._obs_columns:
+            final = "final_" + name
+            self._episodes[final] = column(final, shape, dtype, episode_rows)
+        self._obs_targets = [(self._steps[name], path) for name, path, _, _ in self._obs_columns]
+        self._final_targets = [(self._episodes["final_" + name], path) for name, path, _, _ in self._obs_columns]
+        self._action_targets = [(self._steps[name], path) for name, path, _, _ in self._action_columns]
+        self._row = 0
+        self._episode = 0
+
+    def _close_shard(self) -> None:
+        """Trims the files of the current shard and writes its metadata."""
+        if self._shard_dir is None:
+            return
+        meta = {
+            "version": FORMAT_VERSION,
+            "steps": self._row,
+            "episodes": self._episode,
+            "columns": {name: column.close(self._row) for name, column in self._steps.items()},
+            "episode_columns": {name: column.close(self._episode) for name, column in self._episodes.items()},
+        }
+        # Write then rename, so that a readable metadata file always describes complete columns
+        partial = os.path.join(self._shard_dir, META_FILE + ".tmp")
+        with open(partial, "w") as file:
+            json.dump(meta, file, indent=1)
+        os.replace(partial, os.path.join(self._shard_dir, META_FILE))
+        self._shard_dir = None
+        self.shard_index += 1
+
+    @staticmethod
+    def _write(targets: List[Tuple[Column, Tuple[str, ...]]], row: int, value: Any) -> None:
+        for column, path in targets:
+            leaf = value
+            for key in path:
+                leaf = leaf[key]
+            column.rows[row] = leaf
+
+    @staticmethod
+    def _reserve(columns: Dict[str, Column], row: int) -> None:
+        """Doubles the capacity of a group of columns (allocated together) if `row` does not fit."""
+        if row >= next(iter(columns.values())).capacity:
+            for column in columns.values():
+                column.grow(column.capacity * 2)
+
+    def _write_obs(self, obs: Any, info: Dict[str, Any]) -> None:
+        """Writes the observation the next action is taken from, with its legal actions."""
+        self._reserve(self._steps, self._row)
+        self._write(self._obs_targets, self._row, obs)
+        if self._with_mask:
+            self._steps["action_mask"].rows[self._row] = info["action_mask"]
+
+    def _end_episode(self, final_obs: Any) -> None:
+        self._reserve(self._episodes, self._episode)
+        self._episodes["episodes"].rows[self._episode] = (self._start, self._row)
+        self._write(self._final_targets, self._episode, final_obs)
+        self._episode += 1
+        self._start = None
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None) -> Tuple[Any, Dict[str, Any]]:
+        if self._start is not None:
+            self._cut_episode()
+        obs, info = self.env.reset(seed=seed, options=options)
+        if self._with_mask is None:
+            self._with_mask = "action_mask" in info
+        if self._shard_dir is not None and self._row >= self.shard_steps:
+            self._close_shard()
+        if self._shard_dir is None:
+            self._open_shard()
+        self._start = self._row
+        self._last_obs = obs
+        self._write_obs(obs, info)
+        return obs, info
+
+    def step(self, action: Any) -> Tuple[Any, float, bool, bool, Dict[str, Any]]:
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        row = self._row
+        self._write(self._action_targets, row, action)
+        steps = self._steps
+        steps["reward"].rows[row] = reward
+        steps["terminated"].rows[row] = terminated
+        steps["truncated"].rows[row] = truncated
+        self._row = row + 1
+        self._last_obs = obs
+        if terminated or truncated:
+            self._end_episode(obs)
+        else:
+            self._write_obs(obs, info)
+        return obs, reward, terminated, truncated, info
+
+    def _cut_episode(self) -> None:
+        """Ends the running episode at its last step (its pending observation becomes its final one)."""
+        if self._row > self._start:
+            self._end_episode(self._last_obs)
+        self._start = None
+
+    def flush(self) -> None:
+        """Writes the mapped pages of the current shard to disk."""
+        for column in list(self._steps.values()) + list(self._episodes.values()):
+            column.data.flush()
+
+    def close(self) -> None:
+        """Closes the running episode and the current shard, then the environment."""
+        if self._start is not None:
+            self._cut_episode()
+        self._close_shard()
+        super().close()
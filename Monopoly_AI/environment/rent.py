@@ -0,0 +1,130 @@
+from typing import List, Optional, Union
+import numpy as np
+from environment.board import Board
+from environment.state import GameState, NO_OWNER
+
+# Highest number of houses on a property (5 = hotel)
+MAX_HOUSES = 5
+# Utility rent multiplier of the dice, by number of utilities owned
+UTILITY_MULTIPLIERS = (0, 4, 10)
+# Kinds of property, for the single-game rent path
+STREET, STATION, UTILITY = 0, 1, 2
+
+
+class RentTable:
+    """
+    Precomputed rent of every property, built once from `Board.property_data`.
+
+    Rent resolution is a sum of three gathers, each table being zero for the properties it does not apply to:
+      - `street_rent[property, houses, monopoly]`: streets, base rent doubled on an unbuilt complete color
+        group, then the house/hotel rent levels,
+      - `station_rent[property, stations owned]`: base rent doubled for every extra station (25, 50, 100, 200),
+      - `utility_multiplier[property, utilities owned]`: dice multiplier (4 with one utility, 10 with both).
+    `rent` applies it to a batch of games with NumPy indexing only, and to a single game with plain-list copies
+    of the same tables (NumPy's per-call overhead dominates a scalar lookup).
+    """
+
+    def __init__(self, board: Board):
+        """
+        Builds the rent tables.
+
+        Args:
+            board (Board): Board providing `property_data` and the color groups.
+        """
+        data = board.property_data
+        num_properties = len(board.property_order)
+        kinds = [board.get_property(name)["type"] for name in board.property_order]
+        self.is_street = board.is_street
+        self.is_station = np.array([kind == "station" for kind in kinds])
+        self.is_utility = np.array([kind == "utility" for kind in kinds])
+        self.stations = np.flatnonzero(self.is_station)
+        self.utilities = np.flatnonzero(self.is_utility)
+
+        levels = data[:, 1:7].astype(np.int32)  # Base rent, 1-4 houses, hotel
+        self.street_rent = np.zeros((num_properties, MAX_HOUSES + 1, 2), dtype=np.int32)
+        self.street_rent[self.is_street, :, 0] = levels[self.is_street]
+        self.street_rent[self.is_street, :, 1] = levels[self.is_street]
+        self.street_rent[self.is_street, 0, 1] *= 2
+
+        owned_counts = np.arange(len(self.stations) + 1)
+        self.station_rent = np.zeros((num_properties, len(owned_counts)), dtype=np.int32)
+        self.station_rent[self.is_station, 1:] = levels[self.is_station, :1] << (owned_counts[1:] - 1)
+
+        self.utility_multiplier = np.zeros((num_properties, len(UTILITY_MULTIPLIERS)), dtype=np.int32)
+        self.utility_multiplier[self.is_utility] = UTILITY_MULTIPLIERS
+
+        # Streets of each property's color group, padded with the property itself (2-street groups), so a
+        # monopoly check is a gather of 3 owners. Stations and utilities only contain themselves.
+        self.group_members = board.property_group_members
+
+        for array in (self.street_rent, self.station_rent, self.utility_multiplier):
+            array.flags.writeable = False
+
+        # Single-game path: the same tables as nested lists
+        self._kinds = [STATION if station else UTILITY if utility else STREET
+                       for station, utility in zip(self.is_station, self.is_utility)]
+        self._street_rent = self.street_rent.tolist()
+        self._station_rent = self.station_rent.tolist()
+        self._utility_multiplier = self.utility_multiplier.tolist()
+        self._group_members = [sorted(set(members)) for members in self.group_members.tolist()]
+        self._stations = self.stations.tolist()
+        self._utilities = self.utilities.tolist()
+
+    def rent(self, state: GameState, property_idx: Union[int, np.ndarray], dice: Union[int, np.ndarray] = 0,
+             rows: Optional[np.ndarray] = None) -> Union[int, np.ndarray]:
+        """
+        Rent owed to the owner of a property (0 if it belongs to the bank). Mortgages are not checked.
+
+        Args:
+            state (GameState): Single or batched game state.
+            property_idx (Union[int, np.ndarray]): Property landed on; one per selected game for a batch.
+            dice (Union[int, np.ndarray]): Dice total of the move, used by utilities; scalar or one per game.
+            rows (Optional[np.ndarray]): For a batched state, the games `property_idx` refers to (all when None).
+
+        Returns:
+            Union[int, np.ndarray]: The rent as an int for a single game, int32[len(rows)] for a batch.
+        """
+        if state.batch_size is None:
+            return self.rent_one(state.owner.tolist(), int(property_idx), int(state.houses[property_idx]), int(dice))
+
+        prop = np.asarray(property_idx, dtype=np.intp)
+        if rows is None:
+            rows = np.arange(len(prop))
+        return self._lookup(state.owner[rows], prop, state.houses[rows, prop], np.asarray(dice))
+
+    def rent_one(self, owners: List[int], property_idx: int, houses: int, dice: int = 0) -> int:
+        """
+        Rent of one property of a single game, with list lookups only.
+
+        Args:
+            owners (List[int]): Owner of every property (`GameState.owner` as a list).
+            property_idx (int): Property landed on.
+            houses (int): Houses built on it.
+            dice (int): Dice total of the move, used by utilities.
+
+        Returns:
+            int: The rent, 0 if the property belongs to the bank.
+        """
+        owner = owners[property_idx]
+        if owner == NO_OWNER:
+            return 0
+        kind = self._kinds[property_idx]
+        if kind == STATION:
+            return self._station_rent[property_idx][sum(owners[idx] == owner for idx in self._stations)]
+        if kind == UTILITY:
+            return self._utility_multiplier[property_idx][sum(owners[idx] == owner for idx in self._utilities)] * dice
+        monopoly = all(owners[idx] == owner for idx in self._group_members[property_idx])
+        return self._street_rent[property_idx][houses][monopoly]
+
+    def _lookup(self, owners: np.ndarray, prop: np.ndarray, houses: np.ndarray, dice: np.ndarray) -> np.ndarray:
+        """Rent of `prop[i]` given the owner row `owners[i]` of its game and the houses built on it."""
+        owner = owners[np.arange(len(prop)), prop]
+        col = owner[:, None]
+        monopoly = (np.take_along_axis(owners, self.group_members[prop], axis=1) == col).all(axis=1)
+        stations = (owners[:, self.stations] == col).sum(axis=1)
+        utilities = (owners[:, self.utilities] == col).sum(axis=1)
+
+        rent = (self.street_rent[prop, houses, monopoly.astype(np.intp)]
+                + self.station_rent[prop, stations]
+                + self.utility_multiplier[prop, utilities] * dice.astype(np.int32))
+        return np.where(owner != NO_OWNER, rent, 0).astype(np.int32)
@@ -0,0 +1,140 @@
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+# Number of dice pairs / card draws generated at once
+BLOCK_SIZE = 1024
+
+SeedType = Union[int, np.random.SeedSequence, None]
+
+
+class RandomStream:
+    """
+    Dice and card randomness of one game, drawn from its own `numpy.random.Generator`.
+
+    Dice pairs and card draws are generated in blocks of `block_size` and consumed with a cursor, so a roll is a
+    list lookup instead of a call into the RNG. The dice and the cards use separate blocks, which keeps a game
+    bit-exact for a given seed whatever the order in which they are consumed.
+
+    Blocks are replaced, never modified, so `snapshot` only keeps references to them with the cursors and the
+    generator state captured at the last refill: it copies nothing, and `restore` replays exactly the same
+    values from that point.
+    """
+
+    def __init__(self, seed: SeedType = None, block_size: int = BLOCK_SIZE):
+        """
+        Args:
+            seed (SeedType): Seed of the generator; fresh OS entropy when None.
+            block_size (int): Number of values generated per block.
+        """
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, seed: SeedType = None) -> None:
+        """
+        Restarts the stream from a new seed and discards the pre-drawn blocks.
+
+        Args:
+            seed (SeedType): Seed of the generator; fresh OS entropy when None.
+        """
+        self.generator = np.random.default_rng(seed)
+        self._dice: List[List[int]] = []
+        self._dice_cursor = 0
+        self._cards: List[float] = []
+        self._cards_cursor = 0
+        self._generator_state = self.generator.bit_generator.state
+
+    def roll(self) -> Tuple[int, int]:
+        """Rolls two six-sided dice."""
+        if self._dice_cursor == len(self._dice):
+            self._dice = self.generator.integers(1, 7, size=(self.block_size, 2)).tolist()
+            self._dice_cursor = 0
+            self._generator_state = self.generator.bit_generator.state
+        die1, die2 = self._dice[self._dice_cursor]
+        self._dice_cursor += 1
+        return die1, die2
+
+    def draw(self, count: int) -> int:
+        """
+        Draws a uniform index, e.g. a card of a deck.
+
+        Args:
+            count (int): Number of choices.
+
+        Returns:
+            int: Index in `[0, count)`.
+        """
+        if self._cards_cursor == len(self._cards):
+            self._cards = self.generator.random(self.block_size).tolist()
+            self._cards_cursor = 0
+            self._generator_state = self.generator.bit_generator.state
+        value = self._cards[self._cards_cursor]
+        self._cards_cursor += 1
+        return int(value * count)
+
+    def choice(self, options: Sequence):
+        """Picks one element of a sequence uniformly."""
+        return options[self.draw(len(options))]
+
+    def snapshot(self) -> tuple:
+        """Position of the stream: the current blocks, their cursors and the generator state after them."""
+        return self._dice, self._dice_cursor, self._cards, self._cards_cursor, self._generator_state
+
+    def restore(self, snapshot: tuple) -> None:
+        """Moves the stream to a `snapshot` of this stream (or of another stream of the same game)."""
+        self._dice, self._dice_cursor, self._cards, self._cards_cursor, generator_state = snapshot
+        if generator_state is not self._generator_state:
+            self.generator.bit_generator.state = generator_state
+            self._generator_state = generator_state
+
+
+class BatchedDiceStream:
+    """
+    Dice of a batch of games, each slot drawing from its own `numpy.random.Generator`.
+
+    Every slot keeps a block of pre-drawn dice pairs and a cursor. A slot's sequence only depends on its own
+    seed, so games are reproducible individually whatever the other slots do (autoresets included).
+    """
+
+    def __init__(self, num_slots: int, block_size: int = 256):
+        """
+        Args:
+            num_slots (int): Number of games in the batch.
+            block_size (int): Dice pairs pre-drawn per slot.
+        """
+        self.num_slots = num_slots
+        self.block_size = block_size
+        self.generators = [np.random.default_rng() for _ in range(num_slots)]
+        self._dice = np.empty((num_slots, block_size, 2), dtype=np.int8)
+        self._cursor = np.full(num_slots, block_size, dtype=np.intp)
+
+    def seed(self, seed: SeedType = None, mask: Optional[np.ndarray] = None) -> None:
+        """
+        Gives every selected slot a new independent generator spawned from `seed`.
+
+        Args:
+            seed (SeedType): Root seed; slot `i` uses the `i`-th child of `SeedSequence(seed)`.
+            mask (Optional[np.ndarray]): bool[num_slots] selecting the slots to reseed; all when None.
+        """
+        children = np.random.SeedSequence(seed).spawn(self.num_slots)
+        slots = range(self.num_slots) if mask is None else np.flatnonzero(mask)
+        for slot in slots:
+            self.generators[slot] = np.random.default_rng(children[slot])
+            self._cursor[slot] = self.block_size
+
+    def roll(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Rolls two dice in each of the given games.
+
+        Args:
+            rows (np.ndarray): Indices of the games rolling (each at most once).
+
+        Returns:
+            np.ndarray: int64[2, len(rows)], the two dice of every game.
+        """
+        cursor = self._cursor
+        for slot in rows[cursor[rows] == self.block_size]:
+            self._dice[slot] = self.generators[slot].integers(1, 7, size=(self.block_size, 2))
+            cursor[slot] = 0
+        dice = self._dice[rows, cursor[rows]]
+        cursor[rows] += 1
+        return dice.T.astype(np.int64)
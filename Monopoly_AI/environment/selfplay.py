@@ -0,0 +1,173 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from environment.engine import DecisionPolicy, MonopolyEngine
+from environment.state import NUM_PLAYERS
+from utils.logger import EVENTS, EventLog
+
+# Games played by a worker per task; large enough to amortize the round trip, small enough to stream
+GAMES_PER_TASK = 32
+# Tasks submitted ahead per worker
+TASKS_IN_FLIGHT = 4
+
+# Engine of the current worker process, built once by `_init_worker`
+_worker_engine: Optional[MonopolyEngine] = None
+
+
+def game_seed(seed: int, game: int) -> np.random.SeedSequence:
+    """
+    Seed of one game of a run: the `game`-th child of `SeedSequence(seed)`.
+
+    A game therefore plays the same whatever the number of workers and the way games are split into tasks.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(game,))
+
+
+def _make_engine(policies: Union[DecisionPolicy, Sequence[DecisionPolicy], None], num_players: int,
+                 max_turns: int, record: bool) -> MonopolyEngine:
+    log = EventLog(EVENTS) if record else None
+    return MonopolyEngine(policies, num_players=num_players, max_turns=max_turns, log=log)
+
+
+def _init_worker(policies, num_players: int, max_turns: int, record: bool) -> None:
+    """Builds the engine of a worker process."""
+    global _worker_engine
+    _worker_engine = _make_engine(policies, num_players, max_turns, record)
+
+
+def _play_games(engine: MonopolyEngine, seed: int, games: range) -> List[Dict[str, Any]]:
+    """Plays a range of games of a run and returns their results, with their events when recorded."""
+    results = []
+    log = engine.log
+    record = log.level >= EVENTS
+    for game in games:
+        if record:
+            log.clear()
+        result = engine.play_game(seed=game_seed(seed, game))
+        result["game"] = game
+        if record:
+            result["events"] = log.events()
+        results.append(result)
+    return results
+
+
+def _play_task(seed: int, start: int, stop: int) -> List[Dict[str, Any]]:
+    """Task run by a worker process on its engine."""
+    return _play_games(_worker_engine, seed, range(start, stop))
+
+
+class SelfPlayRunner:
+    """
+    Plays complete headless games in parallel on a pool of worker processes.
+
+    Every worker builds one `MonopolyEngine` when it starts and reuses it for all its games; tasks only carry
+    a seed and a range of game indices, and results are the compact dicts of `MonopolyEngine.play_game` (plus
+    the game index and, with `record=True`, the game's `EVENT_DTYPE` event records as its trajectory). Game
+    `i` of a run seeded with `seed` is seeded with `game_seed(seed, i)`, so results do not depend on the
+    number of workers.
+
+    Usage:
+        with SelfPlayRunner(num_workers=8) as runner:
+            for result in runner.run(10_000, seed=0):
+                ...
+    """
+
+    def __init__(self, policies: Union[DecisionPolicy, Sequence[DecisionPolicy], None] = None,
+                 num_workers: Optional[int] = None, num_players: int = NUM_PLAYERS, max_turns: int = 1000,
+                 record: bool = False, games_per_task: int = GAMES_PER_TASK, mp_context: Any = None):
+        """
+        Args:
+            policies: Policies of the seats, as for `MonopolyEngine`; they are pickled to every worker.
+            num_workers (Optional[int]): Worker processes; all the CPUs when None, 0 to play in this process.
+            num_players (int): Seats at the table.
+            max_turns (int): Player turns after which a game stops without a winner.
+            record (bool): Whether results carry the events of their game.
+            games_per_task (int): Games played by a worker per task.
+            mp_context: `multiprocessing` context of the pool (e.g. `get_context("spawn")`).
+        """
+        self.num_workers = (os.cpu_count() or 1) if num_workers is None else num_workers
+        self.games_per_task = games_per_task
+        self._engine_args = (policies, num_players, max_turns, record)
+        self._mp_context = mp_context
+        self._executor: Optional[Executor] = None
+        self._local_engine: Optional[MonopolyEngine] = None
+
+    def _start(self) -> None:
+        """Starts the worker pool (or the in-process engine) on first use."""
+        if self.num_workers == 0:
+            if self._local_engine is None:
+                self._local_engine = _make_engine(*self._engine_args)
+        elif self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_workers, mp_context=self._mp_context,
+                                                 initializer=_init_worker, initargs=self._engine_args)
+
+    def _tasks(self, num_games: int, first_game: int) -> List[Tuple[int, int]]:
+        """Splits the game indices of a run into task ranges."""
+        stop = first_game + num_games
+        return [(start, min(start + self.games_per_task, stop))
+                for start in range(first_game, stop, self.games_per_task)]
+
+    def run(self, num_games: int, seed: int = 0, first_game: int = 0,
+            ordered: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Plays games and yields their results as the tasks complete.
+
+        Args:
+            num_games (int): Number of games.
+            seed (int): Seed of the run.
+            first_game (int): Index of the first game, to continue a run in several calls.
+            ordered (bool): Whether to yield the results by game index rather than in completion order.
+
+        Yields:
+            Dict[str, Any]: Result of one game ("game", "winner", "turns", "money", "bankrupt" and, when
+                            recording, "events").
+        """
+        self._start()
+        tasks = self._tasks(num_games, first_game)
+        if self._executor is None:
+            for start, stop in tasks:
+                yield from _play_games(self._local_engine, seed, range(start, stop))
+            return
+
+        # Keep a bounded number of tasks in flight so that long runs stream without queueing every task
+        task_iter = iter(tasks)
+        in_flight: Dict[Future, int] = {}
+        pending: Dict[int, List[Dict[str, Any]]] = {}
+        starts = iter(start for start, _ in tasks)
+        next_start = next(starts, None)
+        while True:
+            while len(in_flight) < TASKS_IN_FLIGHT * self.num_workers:
+                task = next(task_iter, None)
+                if task is None:
+                    break
+                in_flight[self._executor.submit(_play_task, seed, *task)] = task[0]
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = in_flight.pop(future)
+                if not ordered:
+                    yield from future.result()
+                    continue
+                # Yield each task once every earlier task has been yielded
+                pending[start] = future.result()
+                while next_start in pending:
+                    yield from pending.pop(next_start)
+                    next_start = next(starts, None)
+
+    def play(self, num_games: int, seed: int = 0, first_game: int = 0) -> List[Dict[str, Any]]:
+        """Plays games and returns their results ordered by game index."""
+        return list(self.run(num_games, seed, first_game, ordered=True))
+
+    def close(self) -> None:
+        """Shuts the worker pool down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "SelfPlayRunner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,341 @@
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import gymnasium as gym
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+from environment.actions import DiscreteActions
+from environment.board import get_board
+from environment.gameV3 import MonopolyRLEnv, make_action_space, make_flat_observation_space, make_observation_space
+
+# Commands sent to the workers, and their replies
+RESET = b"r"
+STEP = b"s"
+CLOSE = b"c"
+DONE = b"k"
+ERROR = b"e"
+
+# Alignment of every array in the shared block
+ALIGNMENT = 64
+
+# Leaf of a layout: (path in the nested space, per-env shape, dtype, byte offset in the block)
+Leaf = Tuple[Tuple[str, ...], Tuple[int, ...], np.dtype, int]
+
+
+class SharedLayout:
+    """
+    Placement of batched arrays in one shared-memory block, derived from gymnasium spaces.
+
+    Every leaf of a (nested) `Dict` space becomes an array of shape `(num_envs,) + space.shape`: Box and
+    MultiBinary keep their dtype, Discrete becomes an int64 scalar per env. Extra flat arrays (rewards,
+    dones, seeds...) are appended with `add`. The layout is a plain picklable description, so the workers
+    rebuild the same views on their side of the block.
+    """
+
+    def __init__(self, num_envs: int):
+        self.num_envs = num_envs
+        self.leaves: List[Leaf] = []
+        self.size = 0
+
+    def add(self, path: Tuple[str, ...], shape: Tuple[int, ...], dtype: Any) -> None:
+        """Appends an array of shape `(num_envs,) + shape` to the block."""
+        dtype = np.dtype(dtype)
+        offset = -(-self.size // ALIGNMENT) * ALIGNMENT
+        self.leaves.append((path, tuple(shape), dtype, offset))
+        self.size = offset + self.num_envs * int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+
+    def add_space(self, prefix: Tuple[str, ...], space: gym.Space) -> None:
+        """Appends every leaf of a space under `prefix`."""
+        if isinstance(space, gym.spaces.Dict):
+            for key, subspace in space.spaces.items():
+                self.add_space(prefix + (key,), subspace)
+        elif isinstance(space, gym.spaces.Discrete):
+            self.add(prefix, (), np.int64)
+        else:
+            self.add(prefix, space.shape, space.dtype)
+
+    def views(self, buffer: memoryview) -> Dict[Tuple[str, ...], np.ndarray]:
+        """Arrays of every leaf, backed by the shared buffer."""
+        return {
+            path: np.ndarray((self.num_envs,) + shape, dtype=dtype, buffer=buffer, offset=offset)
+            for path, shape, dtype, offset in self.leaves
+        }
+
+    @staticmethod
+    def nest(views: Dict[Tuple[str, ...], np.ndarray], root: str) -> Dict[str, Any]:
+        """Rebuilds the nested dictionary of the leaves under `root`."""
+        nested: Dict[str, Any] = {}
+        for path, array in views.items():
+            if path[0] != root:
+                continue
+            node = nested
+            for key in path[1:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = array
+        return nested
+
+
+def _write_tree(views: Dict[Tuple[str, ...], np.ndarray], prefix: Tuple[str, ...], tree: Any,
+                row: int) -> None:
+    """Copies a (nested) observation dictionary, or a flat observation, into row `row` of the shared arrays."""
+    if not isinstance(tree, dict):
+        views[prefix][row] = tree
+        return
+    for key, value in tree.items():
+        path = prefix + (key,)
+        if isinstance(value, dict):
+            _write_tree(views, path, value, row)
+        else:
+            views[path][row] = value
+
+
+def _worker(pipe, shm_name: str, layout: SharedLayout, start: int, stop: int, max_steps: Optional[int],
+            env_kwargs: Dict[str, Any]) -> None:
+    """
+    Worker process: steps the environments of rows `[start, stop)` on command.
+
+    Actions, seeds and reset masks are read from the shared block and observations, rewards and dones are
+    written back into it; only one command byte and one reply byte go through the pipe (plus the message
+    of an exception, if any).
+    """
+    shm = SharedMemory(name=shm_name)
+    try:
+        _serve(pipe, layout.views(shm.buf), range(start, stop), max_steps, env_kwargs)
+    finally:
+        # The views are released with `_serve`'s frame, so the block can be closed
+        shm.close()
+
+
+def _serve(pipe, views: Dict[Tuple[str, ...], np.ndarray], rows: range, max_steps: Optional[int],
+           env_kwargs: Dict[str, Any]) -> None:
+    """Command loop of a worker, until `CLOSE`."""
+    envs = {row: MonopolyRLEnv(copy_obs=False, **env_kwargs) for row in rows}
+    steps = dict.fromkeys(rows, 0)
+    needs_reset = dict.fromkeys(rows, False)
+    actions = SharedLayout.nest(views, "action")
+    flat_action = views.get(("action",))
+    action_mask = views.get(("action_mask",))
+    reward, terminated, truncated = views[("reward",)], views[("terminated",)], views[("truncated",)]
+    seeds, has_seed, reset_mask = views[("seed",)], views[("has_seed",)], views[("reset_mask",)]
+
+    def reset(row: int, seed: Optional[int]) -> None:
+        obs, info = envs[row].reset(seed=seed)
+        _write_tree(views, ("obs",), obs, row)
+        if action_mask is not None:
+            action_mask[row] = info["action_mask"]
+        reward[row] = 0.0
+        terminated[row] = truncated[row] = False
+        steps[row] = 0
+        needs_reset[row] = False
+
+    while True:
+        command = pipe.recv_bytes()
+        if command == CLOSE:
+            pipe.send_bytes(DONE)
+            return
+        try:
+            if command == RESET:
+                for row in rows:
+                    if reset_mask[row]:
+                        reset(row, int(seeds[row]) if has_seed[row] else None)
+            elif command == STEP:
+                for row in rows:
+                    if needs_reset[row]:
+                        # Game finished on the previous step: restart it instead (`AutoresetMode.NEXT_STEP`)
+                        reset(row, None)
+                        continue
+                    if flat_action is not None:
+                        action = int(flat_action[row])
+                    else:
+                        action = {key: value[row] for key, value in actions.items()}
+                    obs, reward[row], done, _, info = envs[row].step(action)
+                    _write_tree(views, ("obs",), obs, row)
+                    if action_mask is not None:
+                        action_mask[row] = info["action_mask"]
+                    steps[row] += 1
+                    terminated[row] = done
+                    truncated[row] = not done and max_steps is not None and steps[row] >= max_steps
+                    needs_reset[row] = terminated[row] or truncated[row]
+            pipe.send_bytes(DONE)
+        except Exception as error:
+            pipe.send_bytes(ERROR + repr(error).encode())
+
+
+class SharedMemoryVectorEnv(VectorEnv):
+    """
+    Multiprocess vector env of `MonopolyRLEnv` exchanging all batch data through shared memory.
+
+    One `multiprocessing.shared_memory` block holds the batched observation (laid out from
+    `observation_space`, action masks included), the batched action, rewards, terminated/truncated flags,
+    seeds and reset masks. Each worker process owns a contiguous slice of the environments: it reads its
+    actions from the block and writes its observations and results straight into it. Only a command byte
+    and a reply byte cross the pipes, instead of the pickled nested observations of
+    `gymnasium.vector.AsyncVectorEnv`.
+
+    With `copy=False`, `reset`/`step` return arrays that view the shared block: no copy is made, and they
+    are overwritten by the next call. Infos are empty. Finished games are reset on the following step
+    (`AutoresetMode.NEXT_STEP`), as in `MonopolyVectorEnv`.
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(self, num_envs: int, num_workers: Optional[int] = None, max_steps: Optional[int] = None,
+                 copy: bool = False, env_kwargs: Optional[Dict[str, Any]] = None, mp_context: Any = None):
+        """
+        Allocates the shared block and starts the workers.
+
+        Args:
+            num_envs (int): Number of environments.
+            num_workers (Optional[int]): Worker processes, each stepping `num_envs / num_workers` envs; one
+                                         per CPU (at most `num_envs`) when None.
+            max_steps (Optional[int]): Steps after which a game is truncated, or None for no limit.
+            copy (bool): Whether `reset`/`step` return copies instead of views of the shared block.
+            env_kwargs (Optional[Dict[str, Any]]): Extra arguments of `MonopolyRLEnv` (`copy_obs` is forced
+                                                   to False).
+            mp_context: `multiprocessing` context of the workers (e.g. `get_context("spawn")`).
+        """
+        self.num_envs = num_envs
+        self.copy = copy
+        env_kwargs = dict(env_kwargs or {})
+        landing_features = env_kwargs.get("landing_features", False)
+        if env_kwargs.get("obs_mode", "dict") == "flat":
+            self.single_observation_space = make_flat_observation_space(env_kwargs.get("flat_dtype", np.float32),
+                                                                        landing_features)
+        else:
+            self.single_observation_space = make_observation_space(landing_features)
+        discrete = env_kwargs.get("action_mode", "dict") == "discrete"
+        self.single_action_space = DiscreteActions(get_board()).space if discrete else make_action_space()
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        layout = SharedLayout(num_envs)
+        layout.add_space(("obs",), self.single_observation_space)
+        layout.add_space(("action",), self.single_action_space)
+        layout.add(("reward",), (), np.float32)
+        layout.add(("terminated",), (), np.bool_)
+        layout.add(("truncated",), (), np.bool_)
+        layout.add(("seed",), (), np.int64)
+        layout.add(("has_seed",), (), np.bool_)
+        layout.add(("reset_mask",), (), np.bool_)
+        if discrete:
+            # Legal flat actions of the next player of every env, returned as info["action_mask"]
+            layout.add(("action_mask",), (self.single_action_space.n,), np.bool_)
+        self._layout = layout
+        self._shm = SharedMemory(create=True, size=max(layout.size, 1))
+        self._views = layout.views(self._shm.buf)
+        self._obs = SharedLayout.nest(self._views, "obs")
+        if not isinstance(self.single_observation_space, gym.spaces.Dict):
+            self._obs = self._views[("obs",)]
+        self._actions = SharedLayout.nest(self._views, "action")
+        self._discrete = discrete
+
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+        num_workers = max(1, min(num_workers, num_envs))
+        context = mp_context if mp_context is not None else mp.get_context()
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._pipes = []
+        self._processes = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                args=(child, self._shm.name, layout, int(start), int(stop), max_steps, dict(env_kwargs or {})),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._pipes.append(parent)
+            self._processes.append(process)
+        self._closed = False
+
+    def _command(self, command: bytes) -> None:
+        """Sends a command to every worker and waits for all of them."""
+        for pipe in self._pipes:
+            pipe.send_bytes(command)
+        errors = []
+        for pipe in self._pipes:
+            reply = pipe.recv_bytes()
+            if reply != DONE:
+                errors.append(reply[1:].decode())
+        if errors:
+            raise RuntimeError(f"Worker error: {'; '.join(errors)}")
+
+    def _result(self, tree: Any) -> Any:
+        """Returns the shared arrays, or copies of them."""
+        if not self.copy:
+            return tree
+        if isinstance(tree, np.ndarray):
+            return tree.copy()
+        return {key: self._result(value) if isinstance(value, dict) else value.copy() for key, value in tree.items()}
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None) -> Tuple[Dict, Dict]:
+        """
+        Resets every environment, or only those selected by `options["reset_mask"]`.
+
+        Args:
+            seed (Optional[int]): Environment `i` is seeded with `seed + i`.
+            options (Optional[dict]): May contain "reset_mask", a bool[num_envs] array of envs to reset.
+
+        Returns:
+            Tuple[Dict, Dict]: Batched observation and info ("action_mask" in discrete action mode).
+        """
+        views = self._views
+        mask = None if options is None else options.get("reset_mask")
+        views[("reset_mask",)][:] = True if mask is None else mask
+        views[("has_seed",)][:] = seed is not None
+        if seed is not None:
+            views[("seed",)][:] = seed + np.arange(self.num_envs)
+        self._command(RESET)
+        return self._result(self._obs), self._info()
+
+    def step(self, actions: Dict[str, Any]) -> Tuple[Dict, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Steps every environment with a batched action.
+
+        Returns:
+            observation, reward, terminated, truncated and info (see `reset`), as views of the shared block
+            when `copy` is False.
+        """
+        if self._discrete:
+            actions = {"action": actions}
+        for key, value in self._actions.items():
+            np.copyto(value, np.asarray(actions[key]).reshape(value.shape), casting="unsafe")
+        self._command(STEP)
+        views = self._views
+        reward, terminated, truncated = views[("reward",)], views[("terminated",)], views[("truncated",)]
+        if self.copy:
+            reward, terminated, truncated = reward.copy(), terminated.copy(), truncated.copy()
+        return self._result(self._obs), reward, terminated, truncated, self._info()
+
+    def _info(self) -> Dict[str, Any]:
+        """Legal flat actions of every env in discrete action mode, an empty info otherwise."""
+        if not self._discrete:
+            return {}
+        action_mask = self._views[("action_mask",)]
+        return {"action_mask": action_mask.copy() if self.copy else action_mask}
+
+    def close_extras(self, **kwargs: Any) -> None:
+        """Stops the workers and releases the shared block."""
+        if self._closed:
+            return
+        self._closed = True
+        for pipe in self._pipes:
+            try:
+                pipe.send_bytes(CLOSE)
+                pipe.recv_bytes()
+            except (BrokenPipeError, EOFError, ConnectionResetError):
+                pass
+            pipe.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._obs = self._actions = self._views = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Observations returned without `copy` still view the block; it is freed once they are gone
+            pass
+        self._shm.unlink()
@@ -0,0 +1,265 @@
+import numpy as np  # Import the numpy library, used to store the game state as flat arrays.
+from typing import Dict, Iterable, Optional  # Import typing hints for better code readability.
+
+# Number of purchasable squares (properties, stations and utilities) on the board
+NUM_PROPERTIES = 28
+# Default number of seats at the table
+NUM_PLAYERS = 4
+# Money each player starts the game with
+STARTING_MONEY = 1500
+# Value stored in `GameState.owner` for properties still held by the bank
+NO_OWNER = -1
+# Bit of each property index in an ownership mask (bit i set = property i owned)
+PROPERTY_BITS = np.left_shift(np.int64(1), np.arange(NUM_PROPERTIES, dtype=np.int64))
+
+
+def mask_to_indices(mask: int) -> np.ndarray:
+    """
+    Returns the property indices set in an ownership mask, in board order.
+
+    Args:
+        mask (int): Ownership mask (bit i set = property i).
+
+    Returns:
+        np.ndarray: Indices of the set bits.
+    """
+    return np.flatnonzero(PROPERTY_BITS & mask)
+
+
+def indices_to_mask(indices: Iterable[int]) -> int:
+    """
+    Returns the ownership mask of a set of property indices.
+
+    Args:
+        indices (Iterable[int]): Property indices.
+
+    Returns:
+        int: Mask with bit i set for every index i.
+    """
+    mask = 0
+    for idx in indices:
+        mask |= 1 << int(idx)
+    return mask
+
+
+def state_dtype(num_properties: int = NUM_PROPERTIES, num_players: int = NUM_PLAYERS) -> np.dtype:
+    """
+    Structured dtype of the record holding one game (see `GameState.record`), widest fields first.
+
+    Args:
+        num_properties (int): Purchasable squares.
+        num_players (int): Seats at the table.
+
+    Returns:
+        np.dtype: Aligned record with one subarray field per state array.
+    """
+    return np.dtype([
+        ("owner_mask", np.int64, (num_players,)),
+        ("money", np.int32, (num_players,)),
+        ("owner", np.int8, (num_properties,)),
+        ("houses", np.int8, (num_properties,)),
+        ("mortgaged", np.bool_, (num_properties,)),
+        ("position", np.int8, (num_players,)),
+        ("bankrupt", np.bool_, (num_players,)),
+        ("jail_turns", np.int8, (num_players,)),
+    ], align=True)
+
+
+class GameState:
+    """
+    Struct-of-arrays container for all the mutable state of a Monopoly game.
+
+    Static data (names, prices, rents...) stays on the `Board`. Everything that changes during a game
+    lives here in flat numpy arrays indexed either by property index (position in `Board.property_order`)
+    or by player index, so ownership, rent and action-mask queries become array lookups instead of scans
+    over per-player lists.
+
+    With `batch_size` set, every array gets a leading batch axis and the state holds that many independent
+    games side by side (used by the vectorized environment). The per-player helpers below are meant for a
+    single game.
+
+    Attributes:
+        property_names (tuple): Names of the purchasable squares, in property index order.
+        property_index (Dict[str, int]): Mapping from property name to property index.
+        batch_size (Optional[int]): Number of games stored, or None for a single game.
+        owner (np.ndarray): int8[num_properties], index of the owning player or `NO_OWNER` for the bank.
+        houses (np.ndarray): int8[num_properties], number of houses built on each property (5 = hotel).
+        mortgaged (np.ndarray): bool[num_properties], whether each property is mortgaged.
+        money (np.ndarray): int32[num_players], cash held by each player.
+        position (np.ndarray): int8[num_players], board square of each player.
+        bankrupt (np.ndarray): bool[num_players], whether each player is bankrupt.
+        jail_turns (np.ndarray): int8[num_players], failed attempts of each player to leave jail.
+        owner_mask (np.ndarray): int64[num_players], properties owned by each player as a bitmask (bit i set =
+                                 property i). It mirrors `owner` and is kept in sync by `transfer`,
+                                 `release_properties` and `reset`; code writing `owner` directly must update it
+                                 too (or call `sync_owner_mask`).
+        record (np.ndarray): The storage of all the arrays above, one `state_dtype` record per game (a 0-d
+                             array for a single game); `snapshot` and `restore` copy it whole.
+        nbytes (int): Size of `record`, i.e. of a snapshot.
+    """
+
+    def __init__(self, property_names: Iterable[str] = (), num_players: int = NUM_PLAYERS,
+                 starting_money: int = STARTING_MONEY, batch_size: Optional[int] = None):
+        """
+        Allocates the state arrays and puts them in their start-of-game configuration.
+
+        Args:
+            property_names (Iterable[str]): Names of the purchasable squares in board order.
+            num_players (int): Number of seats at the table.
+            starting_money (int): Money given to every player by `reset`.
+            batch_size (Optional[int]): Number of games to hold side by side, or None for a single game.
+        """
+        self.property_names = tuple(property_names)
+        self.property_index: Dict[str, int] = {name: idx for idx, name in enumerate(self.property_names)}
+        self.num_players = num_players
+        self.starting_money = starting_money
+        self.batch_size = batch_size
+
+        batch = () if batch_size is None else (batch_size,)
+        num_properties = len(self.property_names) or NUM_PROPERTIES
+        # Every field is a view into one record per game, so that a whole game is copied at once
+        self.dtype = state_dtype(num_properties, num_players)
+        self.record = np.empty(batch, dtype=self.dtype)
+        for name in self.dtype.names:
+            setattr(self, name, self.record[name])
+        self.nbytes = self.record.nbytes
+        self._raw = self.record.reshape(-1).view(np.uint8)
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """
+        Restores the start-of-game configuration in place (no reallocation).
+
+        Args:
+            mask (Optional[np.ndarray]): For a batched state, bool[batch_size] selecting the games to reset.
+                                         All games are reset when None.
+        """
+        if mask is None:
+            mask = Ellipsis
+        self.owner[mask] = NO_OWNER
+        self.houses[mask] = 0
+        self.mortgaged[mask] = False
+        self.money[mask] = self.starting_money
+        self.position[mask] = 0
+        self.bankrupt[mask] = False
+        self.jail_turns[mask] = 0
+        self.owner_mask[mask] = 0
+
+    def snapshot(self) -> bytes:
+        """
+        Copies the whole state, e.g. to branch a search from the current position.
+
+        Returns:
+            bytes: The `nbytes` bytes of `record`; equal snapshots mean equal states.
+        """
+        return self.record.tobytes()
+
+    def restore(self, snapshot: bytes, offset: int = 0) -> None:
+        """
+        Puts the state back to a snapshot, in place (the arrays stay the same objects).
+
+        Args:
+            snapshot (bytes): Blob starting with the bytes returned by `snapshot`, at `offset`.
+            offset (int): Position of the state in the blob.
+        """
+        self._raw[:] = np.frombuffer(snapshot, np.uint8, self.nbytes, offset)
+
+    def sync_owner_mask(self) -> None:
+        """Rebuilds `owner_mask` from `owner`, after `owner` was written directly."""
+        owner = self.owner[..., None, :] == np.arange(self.num_players)[:, None]
+        bits = PROPERTY_BITS[:owner.shape[-1]]
+        self.owner_mask[...] = np.where(owner, bits, 0).sum(axis=-1)
+
+    def owned_by(self, player_idx: int) -> np.ndarray:
+        """
+        Returns a boolean vector flagging the properties owned by a player.
+
+        Args:
+            player_idx (int): Index of the player.
+
+        Returns:
+            np.ndarray: bool[num_properties], True where `player_idx` is the owner.
+        """
+        return self.owner == player_idx
+
+    def properties_of(self, player_idx: int) -> np.ndarray:
+        """
+        Returns the indices of the properties owned by a player, in board order.
+
+        Args:
+            player_idx (int): Index of the player.
+
+        Returns:
+            np.ndarray: Property indices owned by the player.
+        """
+        return mask_to_indices(self.owner_mask[player_idx])
+
+    def property_count(self, player_idx: int) -> int:
+        """
+        Returns the number of properties owned by a player.
+
+        Args:
+            player_idx (int): Index of the player.
+
+        Returns:
+            int: Number of owned properties.
+        """
+        return int(self.owner_mask[player_idx]).bit_count()
+
+    def transfer(self, property_idx: int, new_owner: int) -> None:
+        """
+        Changes the owner of a property. Buildings and mortgage status follow the property.
+
+        Args:
+            property_idx (int): Index of the property.
+            new_owner (int): Index of the new owner, or `NO_OWNER` to give it back to the bank.
+        """
+        bit = 1 << property_idx
+        old_owner = self.owner[property_idx]
+        if old_owner != NO_OWNER:
+            self.owner_mask[old_owner] &= ~bit
+        self.owner[property_idx] = new_owner
+        if new_owner != NO_OWNER:
+            self.owner_mask[new_owner] |= bit
+        else:
+            # The bank always holds properties unbuilt and unmortgaged
+            self.houses[property_idx] = 0
+            self.mortgaged[property_idx] = False
+
+    def release_properties(self, player_idx: int, creditor: Optional[int] = None) -> None:
+        """
+        Hands every property of a player to a creditor, or back to the bank.
+
+        Args:
+            player_idx (int): Index of the player giving up their properties.
+            creditor (Optional[int]): Index of the receiving player, or None for the bank.
+        """
+        owned = self.owner == player_idx
+        if creditor is None:
+            self.owner[owned] = NO_OWNER
+            self.houses[owned] = 0
+            self.mortgaged[owned] = False
+        else:
+            self.owner[owned] = creditor
+            self.owner_mask[creditor] |= self.owner_mask[player_idx]
+        self.owner_mask[player_idx] = 0
+
+    def transfer_mask(self, mask: int, new_owner: int) -> None:
+        """
+        Changes the owner of a set of properties at once, e.g. both sides of a trade.
+
+        Args:
+            mask (int): Ownership mask of the properties to move.
+            new_owner (int): Index of the new owner, or `NO_OWNER` to give them back to the bank.
+        """
+        for idx in mask_to_indices(mask):
+            self.transfer(int(idx), new_owner)
+
+    def active_players(self) -> np.ndarray:
+        """
+        Returns the indices of the players who are not bankrupt.
+
+        Returns:
+            np.ndarray: Indices of the active players, in seat order.
+        """
+        return np.flatnonzero(~self.bankrupt)
@@ -0,0 +1,126 @@
+from typing import Any, Optional, Union
+import numpy as np
+from environment.board import Board
+from environment.rent import MAX_HOUSES, RentTable
+from environment.state import NO_OWNER, NUM_PLAYERS
+
+# Dice total assumed for the rent of a utility (mean of 2d6)
+EXPECTED_DICE = 7
+
+
+class PropertyValuation:
+    """
+    Expected-value tables of the properties, built once from `Board.property_data` and the long-run landing
+    frequencies of `Board.landing`; every query is then a NumPy gather, for one property or a batch.
+
+    Incomes are expected rents collected per opponent turn (rent x stops per turn); multiply by the number of
+    opponents for the income per round. Paybacks are in opponent turns.
+
+    Attributes:
+        price, mortgage_value, house_cost (np.ndarray): int64[P], columns of `Board.property_data`.
+        frequency (np.ndarray): float64[P], long-run stops per turn on each property.
+        street_income (np.ndarray): float64[P, MAX_HOUSES + 1, 2], income of a street by houses and monopoly
+                                    flag (as `RentTable.street_rent`); 0 for stations and utilities.
+        station_income (np.ndarray): float64[P, num_stations + 1], income of a station by stations owned.
+        utility_income (np.ndarray): float64[P, num_utilities + 1], income of a utility by utilities owned, at
+                                     `EXPECTED_DICE`.
+        base_income (np.ndarray): float64[P], income of the property owned alone and unbuilt.
+        investment (np.ndarray): int64[P, MAX_HOUSES + 1], price plus the houses built up to each level.
+        payback (np.ndarray): float64[P, MAX_HOUSES + 1], turns for `investment` to be paid back: streets on a
+                              complete color group, stations and utilities owned alone (level 0 only); inf
+                              where the level does not apply.
+        house_roi (np.ndarray): float64[P, MAX_HOUSES + 1], marginal income of the next house per unit of house
+                                cost, by current level on a complete color group; 0 for hotels and non-streets.
+    """
+
+    def __init__(self, board: Board, frequency: Optional[np.ndarray] = None):
+        """
+        Builds the tables.
+
+        Args:
+            board (Board): Board providing the prices, rents and landing model.
+            frequency (Optional[np.ndarray]): Stops per turn on each property; `board.landing_probabilities`
+                                              when None (e.g. pass `LandingModel.property_landings` for a
+                                              short horizon).
+        """
+        rents = RentTable(board)
+        self.rents = rents
+        self.frequency = np.asarray(board.landing_probabilities if frequency is None else frequency, np.float64)
+        data = board.property_data.astype(np.int64)
+        self.price = data[:, 0]
+        self.mortgage_value = data[:, 7]
+        self.house_cost = data[:, 8]
+        num_properties = len(self.price)
+        self._properties = np.arange(num_properties)
+
+        self.street_income = rents.street_rent * self.frequency[:, None, None]
+        self.station_income = rents.station_rent * self.frequency[:, None]
+        self.utility_income = rents.utility_multiplier * (EXPECTED_DICE * self.frequency[:, None])
+        self.base_income = self.street_income[:, 0, 0] + self.station_income[:, 1] + self.utility_income[:, 1]
+
+        levels = np.arange(MAX_HOUSES + 1)
+        self.investment = self.price[:, None] + self.house_cost[:, None] * levels
+        income = self.street_income[:, :, 1].copy()
+        income[~rents.is_street] = 0.0
+        income[~rents.is_street, 0] = self.base_income[~rents.is_street]
+        self.payback = np.where(income > 0, self.investment / np.where(income > 0, income, 1.0), np.inf)
+
+        self.house_roi = np.zeros((num_properties, MAX_HOUSES + 1))
+        gain = np.diff(self.street_income[:, :, 1], axis=1)
+        self.house_roi[rents.is_street, :MAX_HOUSES] = (gain / self.house_cost[:, None])[rents.is_street]
+
+        for array in (self.frequency, self.street_income, self.station_income, self.utility_income,
+                      self.base_income, self.investment, self.payback, self.house_roi):
+            array.flags.writeable = False
+
+    def next_house_roi(self, property_idx: Union[int, np.ndarray], houses: Union[int, np.ndarray]) -> Any:
+        """
+        Marginal ROI of building on streets (assumed on a complete color group).
+
+        Args:
+            property_idx (Union[int, np.ndarray]): Street(s).
+            houses (Union[int, np.ndarray]): Houses currently built on each of them.
+
+        Returns:
+            float, or float64 array with the shape of `property_idx`.
+        """
+        return self.house_roi[property_idx, houses]
+
+    def income(self, owner: np.ndarray, houses: np.ndarray, mortgaged: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Expected income of every property in the current position of one game or a batch of games (leading axes),
+        e.g. from the `owner`, `houses` and `mortgaged` fields of a `GameState`.
+
+        Args:
+            owner (np.ndarray): int[..., P], owner of every property.
+            houses (np.ndarray): int[..., P], houses of every property.
+            mortgaged (Optional[np.ndarray]): bool[..., P]; mortgaged properties earn nothing.
+
+        Returns:
+            np.ndarray: float64[..., P], income per opponent turn; 0 for the bank's properties.
+        """
+        rents = self.rents
+        owner = np.asarray(owner)
+        col = owner[..., :, None]
+        monopoly = (owner[..., rents.group_members] == col).all(axis=-1)
+        stations = (owner[..., None, rents.stations] == col).sum(axis=-1)
+        utilities = (owner[..., None, rents.utilities] == col).sum(axis=-1)
+        props = self._properties
+        income = (self.street_income[props, np.asarray(houses, dtype=np.intp), monopoly.astype(np.intp)]
+                  + self.station_income[props, stations] + self.utility_income[props, utilities])
+        earning = owner != NO_OWNER
+        if mortgaged is not None:
+            earning &= ~np.asarray(mortgaged)
+        return np.where(earning, income, 0.0)
+
+    def player_income(self, owner: np.ndarray, houses: np.ndarray, mortgaged: Optional[np.ndarray] = None,
+                      num_players: int = NUM_PLAYERS) -> np.ndarray:
+        """
+        Expected income of each player per opponent turn.
+
+        Returns:
+            np.ndarray: float64[..., num_players].
+        """
+        income = self.income(owner, houses, mortgaged)
+        owner = np.asarray(owner)
+        return ((owner[..., None, :] == np.arange(num_players)[:, None]) * income[..., None, :]).sum(axis=-1)
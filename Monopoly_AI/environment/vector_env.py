@@ -0,0 +1,583 @@
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+import gymnasium as gym
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+from environment.actions import DiscreteActions
+from environment.bitboard import ColorGroupMasks
+from environment.board import get_board
+from environment.gameV3 import ENV_PHASE, NUM_CASE, NUM_PROPERTIES, make_action_space, make_observation_space
+from environment.observation import FlatObservation
+from environment.opponents import OPPONENTS, BatchedPolicy
+from environment.rent import RentTable
+from environment.rng import BatchedDiceStream
+from environment.state import GameState, NO_OWNER, PROPERTY_BITS
+
+# Money received when passing the start square
+GO_SALARY = 200
+# Seats at the table (the observation layout assumes 4)
+NUM_PLAYERS = 4
+# Marker for an empty "other player" slot; never equal to a value of `GameState.owner`
+NO_PLAYER = -2
+
+
+class MonopolyVectorEnv(VectorEnv):
+    """
+    Batched Monopoly environment stepping `num_envs` games at once.
+
+    All games are stored as `(num_envs, ...)` arrays in a batched `GameState`, and every phase of a step
+    (management action, dice, movement, pass-Go, tax, purchase, rent, bankruptcy, next player) is applied
+    to the whole batch with NumPy operations instead of one Python-level `MonopolyRLEnv.step` per game.
+
+    Each step, the current player of every game:
+      1. performs the management action (same action space and legality rules as `MonopolyRLEnv`),
+      2. rolls two dice and moves, collecting `GO_SALARY` when passing the start square,
+      3. resolves the landing square: buys an unowned property if affordable, pays rent to its owner,
+         pays taxes or goes to jail,
+      4. goes bankrupt if their money is negative, giving their properties back to the bank.
+    The reward is the management reward of `MonopolyRLEnv.step` plus its state reward, computed after the
+    turn. Finished games are reset individually on the following step (`AutoresetMode.NEXT_STEP`).
+
+    By default every seat is played by the actions passed to `step`. With `opponents`, only `learner_seat`
+    is: after its turn, the other seats play their turns with `BatchedPolicy` decisions (management,
+    purchases, raising funds) for the whole batch until it is the learner's turn again, so every observation
+    is the learner's. Opponent turns give no reward; the game ends for the learner when they go bankrupt.
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(self, num_envs: int, max_steps: Optional[int] = None, copy: bool = True, obs_mode: str = "dict",
+                 flat_dtype: Any = np.float32, action_mode: str = "dict", landing_features: bool = False,
+                 opponents: Union[BatchedPolicy, str, Sequence[Any], None] = None, learner_seat: int = 0):
+        """
+        Builds the static board tables and allocates the batched game state and observation buffers.
+
+        Args:
+            num_envs (int): Number of games stepped together.
+            max_steps (Optional[int]): Steps after which a game is truncated, or None for no limit.
+            copy (bool): Whether `reset`/`step` return copies of the observation buffers. When False, the
+                         returned arrays are overwritten by the next call.
+            obs_mode (str): "dict", or "flat" for one `(num_envs, size)` array laid out as `flat_spec` (see
+                            `MonopolyRLEnv`).
+            flat_dtype: dtype of the flat observation, `np.float32` or `np.int16`.
+            action_mode (str): "dict", or "discrete" for one flat action per game (see `MonopolyRLEnv`); the
+                               info then carries the bool[num_envs, K] legal actions as "action_mask".
+            landing_features (bool): Whether observations include the next-turn landing probabilities of the
+                                     players (see `make_observation_space`).
+            opponents: Policy of the seats other than `learner_seat`: a `BatchedPolicy`, the name of a built-in
+                       one (`environment.opponents.OPPONENTS`), or one per seat (the learner's entry is
+                       ignored). None for every seat to be played by `step`'s actions.
+            learner_seat (int): Seat played by `step`'s actions when there are opponents.
+        """
+        if obs_mode not in ("dict", "flat"):
+            raise ValueError(f"Unknown observation mode {obs_mode!r}")
+        if action_mode not in ("dict", "discrete"):
+            raise ValueError(f"Unknown action mode {action_mode!r}")
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.copy = copy
+
+        self.board = get_board()
+        self.state = GameState(self.board.property_order, num_players=NUM_PLAYERS, batch_size=num_envs)
+        self._init_board_tables()
+
+        self.obs_mode = obs_mode
+        self.flat_obs: Optional[FlatObservation] = None
+        self.landing_features = landing_features
+        self.single_observation_space = make_observation_space(landing_features)
+        if obs_mode == "flat":
+            self.flat_obs = FlatObservation(self.single_observation_space, flat_dtype, batch_size=num_envs)
+            self.flat_spec = self.flat_obs.spec
+            self.single_observation_space = self.flat_obs.space
+        self.action_mode = action_mode
+        self.discrete_actions: Optional[DiscreteActions] = None
+        self.single_action_space = make_action_space()
+        if action_mode == "discrete":
+            self.discrete_actions = DiscreteActions(self.board)
+            self.single_action_space = self.discrete_actions.space
+            self._legal = np.zeros((num_envs, self.discrete_actions.size), dtype=np.bool_)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        self.current_player = np.zeros(num_envs, dtype=np.intp)
+        self._step_count = np.zeros(num_envs, dtype=np.int64)
+        self._autoreset = np.zeros(num_envs, dtype=np.bool_)
+        self._rows = np.arange(num_envs)
+        # Every game rolls from its own generator, seeded by `reset`
+        self._dice = BatchedDiceStream(num_envs)
+        self._init_obs_buffers()
+        self._init_opponents(opponents, learner_seat)
+
+    def _init_board_tables(self) -> None:
+        """Turns the board description into the flat lookup arrays used by the step kernel."""
+        board = self.board
+        data = board.property_data
+        self._rent_table = RentTable(board)
+
+        # Price, mortgage value and house cost of every property, read-only (also used by `BatchedPolicy`)
+        self.price = data[:, 0].astype(np.int32)
+        self.mortgage_value = data[:, 7].astype(np.int32)
+        self.house_cost = self.price // 2
+        for array in (self.price, self.mortgage_value, self.house_cost):
+            array.flags.writeable = False
+        self._is_street = self._rent_table.is_street
+        # Color groups as bitmasks, tested against `GameState.owner_mask`; the group mask of each street
+        self.group_masks = ColorGroupMasks(self.board)
+        self._property_group_mask = self.group_masks.property_group_mask
+
+        # Seat tables indexed by `current player << NUM_PLAYERS | bankrupt seats bitmask`: the other active
+        # players in seat order (as `MonopolyRLEnv._get_other_players`), and the next active player.
+        num_keys = NUM_PLAYERS << NUM_PLAYERS
+        self._others_table = np.full((num_keys, 3), NO_PLAYER, dtype=np.int8)
+        self._others_count_table = np.zeros(num_keys, dtype=np.intp)
+        self._next_player_table = np.zeros(num_keys, dtype=np.intp)
+        for key in range(num_keys):
+            current, bankrupt_bits = divmod(key, 1 << NUM_PLAYERS)
+            active = [seat for seat in range(NUM_PLAYERS) if not bankrupt_bits & (1 << seat)]
+            others = [seat for seat in active if seat != current][:3]
+            self._others_table[key, :len(others)] = others
+            self._others_count_table[key] = len(others)
+            following = [(current + shift) % NUM_PLAYERS for shift in range(1, NUM_PLAYERS + 1)]
+            self._next_player_table[key] = next((seat for seat in following if seat in active), current)
+        self._active_count_table = np.array([NUM_PLAYERS - bin(bits).count("1") for bits in range(1 << NUM_PLAYERS)])
+
+        # Square-indexed tables
+        self._square_property = board.square_to_property.astype(np.intp)
+        self._square_tax = np.zeros(NUM_CASE, dtype=np.int32)
+        self._square_go_to_jail = np.zeros(NUM_CASE, dtype=np.bool_)
+        for square, case in enumerate(board.board):
+            if case["type"] == "tax":
+                self._square_tax[square] = case["price"]
+            elif case["type"] == "go_to_jail":
+                self._square_go_to_jail[square] = True
+        self._jail_square = board.get_position("Prison/Simple visite")
+
+        self._property_data_norm = board.property_data_norm
+
+    def _init_opponents(self, opponents: Any, learner_seat: int) -> None:
+        """Resolves the policies of the scripted seats and allocates the batch of their actions."""
+        self.learner_seat = learner_seat
+        # Distinct policies, and the index of each seat's policy in them (-1 for seats played by `step`)
+        self.opponents = []
+        self._seat_policy = np.full(NUM_PLAYERS, -1, dtype=np.intp)
+        if opponents is None:
+            return
+        if not 0 <= learner_seat < NUM_PLAYERS:
+            raise ValueError(f"Invalid learner seat {learner_seat}")
+        if isinstance(opponents, (str, BatchedPolicy)):
+            opponents = [opponents] * NUM_PLAYERS
+        if len(opponents) != NUM_PLAYERS:
+            raise ValueError(f"Expected one opponent per seat, got {len(opponents)}")
+        for seat, policy in enumerate(opponents):
+            if seat == learner_seat:
+                continue
+            if isinstance(policy, str):
+                if policy not in OPPONENTS:
+                    raise ValueError(f"Unknown opponent {policy!r}")
+                policy = OPPONENTS[policy]()
+            if policy not in self.opponents:
+                self.opponents.append(policy)
+            self._seat_policy[seat] = self.opponents.index(policy)
+        n = self.num_envs
+        self._opponent_actions = {
+            "action_type": np.zeros(n, dtype=np.int64),
+            "property_idx": np.zeros(n, dtype=np.int64),
+            "trade_partner": np.zeros(n, dtype=np.int64),
+            "trade_amount": np.zeros((n, 1), dtype=np.int32),
+        }
+
+    def _init_obs_buffers(self) -> None:
+        """Allocates the arrays the batched observation is written into."""
+        n = self.num_envs
+        self._own = np.zeros((n, NUM_PROPERTIES), dtype=np.bool_)
+        self._mortgageable = np.zeros((n, NUM_PROPERTIES), dtype=np.bool_)
+        self._buildable = np.zeros((n, NUM_PROPERTIES), dtype=np.bool_)
+        self._others_owned = np.zeros((n, 3, NUM_PROPERTIES), dtype=np.bool_)
+        self._active = np.zeros((n, NUM_PLAYERS), dtype=np.bool_)
+        self._can_trade = np.zeros((n, 1), dtype=np.bool_)
+        # Bool buffers are exposed through zero-copy int8 views
+        self._obs = {
+            "self_money": np.zeros((n, 1), dtype=np.int32),
+            "self_position": np.zeros(n, dtype=np.int64),
+            "self_properties": self._own.view(np.int8),
+            "self_houses": np.zeros((n, NUM_PROPERTIES), dtype=np.int8),
+            "action_masks": {
+                "mortgage": self._mortgageable.view(np.int8),
+                "build": self._buildable.view(np.int8),
+                "can_trade": self._can_trade.view(np.int8),
+            },
+            "others_money": np.zeros((n, 3), dtype=np.int32),
+            "others_properties": self._others_owned.view(np.int8),
+            "others_positions": np.zeros((n, 3), dtype=np.int32),
+            "others_houses": np.zeros((n, 3, NUM_PROPERTIES), dtype=np.int8),
+            "active_players": self._active.view(np.int8),
+            # Static: a read-only broadcast of the normalized property data, shared by every game
+            "all_properties": np.broadcast_to(self._property_data_norm, (n,) + self._property_data_norm.shape),
+        }
+        if self.landing_features:
+            # Next-turn property landings from each square, from the board's Markov landing model
+            self._landing_table = self.board.landing.property_landings(1, np.arange(NUM_CASE)).astype(np.float32)
+            self._obs["self_landing"] = np.zeros((n, NUM_PROPERTIES), dtype=np.float32)
+            self._obs["others_landing"] = np.zeros((n, 3, NUM_PROPERTIES), dtype=np.float32)
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None) -> Tuple[Dict, Dict]:
+        """
+        Resets every game, or only those selected by `options["reset_mask"]`.
+
+        Args:
+            seed (Optional[int]): Root seed of the dice generators; game `i` is seeded with the `i`-th child of
+                                  `SeedSequence(seed)`. Unseeded games keep their current generator.
+            options (Optional[dict]): May contain "reset_mask", a bool[num_envs] array of games to reset.
+
+        Returns:
+            Tuple[Dict, Dict]: Batched observation and info.
+        """
+        super().reset(seed=seed)
+        mask = None if options is None else options.get("reset_mask")
+        if seed is not None:
+            self._dice.seed(seed, mask)
+        self._reset_games(mask)
+        if self.opponents:
+            self._play_opponents()
+        return self._get_obs(), self._get_info()
+
+    def load_snapshot(self, snapshot: bytes, mask: Optional[np.ndarray] = None) -> Tuple[Dict, Dict]:
+        """
+        Puts games in the position of a single game, e.g. to run many playouts from it at once.
+
+        Args:
+            snapshot (bytes): `MonopolyRLEnv.snapshot` (or any blob of a `GameState` record followed by
+                              `ENV_PHASE`) of a 4-player game.
+            mask (Optional[np.ndarray]): bool[num_envs] selecting the games to overwrite; all when None.
+
+        Returns:
+            Tuple[Dict, Dict]: Batched observation and info, as `reset`. With opponents, they first play until
+                               it is the learner's turn, so a game may already be over.
+        """
+        state = self.state
+        selected = Ellipsis if mask is None else mask
+        state.record[selected] = np.frombuffer(snapshot, state.dtype, 1)[0]
+        self.current_player[selected], = ENV_PHASE.unpack_from(snapshot, state.dtype.itemsize)
+        self._step_count[selected] = 0
+        self._autoreset[selected] = False
+        if self.opponents:
+            self._play_opponents()
+        return self._get_obs(), self._get_info()
+
+    def _reset_games(self, mask: Optional[np.ndarray]) -> None:
+        """Puts the selected games (all of them when None) back to their initial state."""
+        self.state.reset(mask)
+        selected = Ellipsis if mask is None else mask
+        self.current_player[selected] = 0
+        self._step_count[selected] = 0
+        self._autoreset[selected] = False
+
+    def step(self, actions: Dict[str, Any]) -> Tuple[Dict, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Plays one step of every game.
+
+        Args:
+            actions: Batched management action, one entry per game for each key of the single action space.
+
+        Returns:
+            observation: Batched observation for the next player of each game
+            reward: float32[num_envs] rewards of the players who just acted
+            terminated: bool[num_envs], games with at most one player left
+            truncated: bool[num_envs], games that reached `max_steps`
+            info: Current player of each game
+        """
+        state = self.state
+        rows = self._rows
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        if self.discrete_actions is not None:
+            actions = self.discrete_actions.decode_batch(actions)
+
+        # Games that finished on the previous step restart instead of playing this one
+        live = ~self._autoreset
+        if not live.all():
+            self._reset_games(self._autoreset.copy())
+        live_rows = np.flatnonzero(live)
+
+        errored = self._apply_management(actions, live, rewards)
+        self._play_turn(live_rows)
+
+        # State reward of the player who acted, as in `MonopolyRLEnv._calculate_reward`
+        cur = self.current_player
+        owned = state.owner == cur.astype(np.int8)[:, None]
+        state_reward = (state.money[rows, cur] * 0.01
+                        + owned.sum(axis=1) * 5
+                        + (owned * state.houses).sum(axis=1) * 10
+                        - state.bankrupt[rows, cur] * 1000)
+        scored = live & ~errored
+        rewards[scored] += state_reward[scored]
+
+        # Move to the next active player
+        bankrupt_bits = self._bankrupt_bits()
+        next_player = self._next_player_table[(cur << NUM_PLAYERS) | bankrupt_bits]
+        self.current_player = np.where(live, next_player, cur)
+
+        terminated = live & (self._active_count_table[bankrupt_bits] <= 1)
+        if self.opponents:
+            terminated |= live & state.bankrupt[rows, cur]
+        self._step_count += live
+        if self.max_steps is None:
+            truncated = np.zeros(self.num_envs, dtype=np.bool_)
+        else:
+            truncated = live & ~terminated & (self._step_count >= self.max_steps)
+        self._autoreset = terminated | truncated
+        if self.opponents:
+            terminated |= self._play_opponents()
+
+        return self._get_obs(), rewards, terminated, truncated, self._get_info()
+
+    def _play_opponents(self) -> np.ndarray:
+        """
+        Plays the scripted seats of every running game until it is the learner's turn again.
+
+        Returns:
+            np.ndarray: bool[num_envs], games ended by the opponents' turns (they are then reset next step).
+        """
+        state = self.state
+        actions = self._opponent_actions
+        ended = np.zeros(self.num_envs, dtype=np.bool_)
+        scratch = np.zeros(self.num_envs, dtype=np.float32)
+        pending = ~self._autoreset & (self.current_player != self.learner_seat)
+        while pending.any():
+            rows = np.flatnonzero(pending)
+            actions["action_type"][:] = -1
+            for policy, sub, seats in self._by_policy(rows, self.current_player[rows]):
+                for key, value in policy.start_turn(self, sub, seats).items():
+                    actions[key][sub] = np.reshape(value, actions[key][sub].shape)
+            self._apply_management(actions, pending, scratch)
+            self._play_turn(rows)
+
+            bankrupt_bits = self._bankrupt_bits()[rows]
+            cur = self.current_player[rows]
+            self.current_player[rows] = self._next_player_table[(cur << NUM_PLAYERS) | bankrupt_bits]
+            over = self._active_count_table[bankrupt_bits] <= 1
+            ended[rows[over]] = True
+            self._autoreset[rows[over]] = True
+            pending = ~self._autoreset & (self.current_player != self.learner_seat)
+        return ended
+
+    def _by_policy(self, rows: np.ndarray, seats: np.ndarray):
+        """Splits games whose current seat is scripted by policy: yields (policy, rows, seats)."""
+        index = self._seat_policy[seats]
+        for k, policy in enumerate(self.opponents):
+            selected = index == k
+            if selected.any():
+                yield policy, rows[selected], seats[selected]
+
+    def other_players(self, rows: np.ndarray) -> np.ndarray:
+        """int8[len(rows), 3], other active players of the current player of the given games (`NO_PLAYER` pads)."""
+        cur = self.current_player[rows]
+        return self._others_table[(cur << NUM_PLAYERS) | self._bankrupt_bits()[rows]]
+
+    def _apply_management(self, actions: Dict[str, Any], live: np.ndarray, rewards: np.ndarray) -> np.ndarray:
+        """
+        Applies the management action of the current player of every live game.
+
+        Returns:
+            np.ndarray: bool[num_envs], games whose action raised an error in `MonopolyRLEnv.step`
+                        (they get -10 and no state reward).
+        """
+        state = self.state
+        cur = self.current_player
+        owner, houses, mortgaged, money = state.owner, state.houses, state.mortgaged, state.money
+        owner_mask, bits = state.owner_mask, PROPERTY_BITS
+
+        action_type = np.where(live, np.asarray(actions["action_type"]), -1)
+        prop_all = np.asarray(actions["property_idx"]).astype(np.intp)
+        errored = np.zeros(self.num_envs, dtype=np.bool_)
+
+        # Mortgage
+        rows = np.flatnonzero(action_type == 0)
+        prop, player = prop_all[rows], cur[rows]
+        ok = (owner[rows, prop] == player) & ~mortgaged[rows, prop]
+        rewards[rows] += np.where(ok, 5, -2)
+        rows, prop, player = rows[ok], prop[ok], player[ok]
+        mortgaged[rows, prop] = True
+        money[rows, player] += self.mortgage_value[prop]
+
+        # Build
+        rows = np.flatnonzero(action_type == 1)
+        prop, player = prop_all[rows], cur[rows]
+        group = self._property_group_mask[prop]
+        monopoly = owner_mask[rows, player] & group == group
+        ok = (self._is_street[prop] & ~mortgaged[rows, prop] & monopoly
+              & (money[rows, player] >= self.house_cost[prop]))
+        rewards[rows] += np.where(ok, 10, -2)
+        rows, prop, player = rows[ok], prop[ok], player[ok]
+        houses[rows, prop] = np.minimum(houses[rows, prop] + 1, 5)
+        money[rows, player] -= self.house_cost[prop]
+
+        # Trades need the other active players of the current player, in seat order
+        rows = np.flatnonzero((action_type == 2) | (action_type == 3))
+        if len(rows):
+            key = (cur[rows] << NUM_PLAYERS) | self._bankrupt_bits()[rows]
+            slot = np.asarray(actions["trade_partner"])[rows].astype(np.intp)
+            valid = slot < self._others_count_table[key]
+            rows, key, slot = rows[valid], key[valid], slot[valid]
+            partner = self._others_table[key, np.minimum(slot, 2)].astype(np.intp)
+            kind, prop, player = action_type[rows], prop_all[rows], cur[rows]
+
+            # Money for property
+            buy = kind == 2
+            amount = np.asarray(actions["trade_amount"]).reshape(self.num_envs)[rows[buy]].astype(np.int32)
+            r, p, c, o = rows[buy], prop[buy], player[buy], partner[buy]
+            ok = (owner[r, p] == o) & (money[r, c] >= amount)
+            rewards[r] += np.where(ok, 15, -2)
+            r, p, c, o, amount = r[ok], p[ok], c[ok], o[ok], amount[ok]
+            owner[r, p] = c
+            owner_mask[r, o] &= ~bits[p]
+            owner_mask[r, c] |= bits[p]
+            money[r, c] -= amount
+            money[r, o] += amount
+
+            # Property for property: the player's first property against the partner's `prop`-th one
+            swap = ~buy
+            r, p, c, o = rows[swap], prop[swap], player[swap], partner[swap]
+            own_player = owner[r] == c[:, None]
+            own_partner = owner[r] == o[:, None]
+            partner_rank = np.cumsum(own_partner, axis=1)
+            ok = own_player.any(axis=1) & (p < partner_rank[:, -1])
+            rewards[r] += np.where(ok, 15, -10)
+            errored[r[~ok]] = True
+            first = own_player.argmax(axis=1)[ok]
+            target = (own_partner & (partner_rank == p[:, None] + 1)).argmax(axis=1)[ok]
+            r, c, o = r[ok], c[ok], o[ok]
+            owner[r, first] = o
+            owner[r, target] = c
+            swapped = bits[first] | bits[target]
+            owner_mask[r, c] ^= swapped
+            owner_mask[r, o] ^= swapped
+
+        # Do nothing
+        rewards[action_type == 4] -= 1
+        return errored
+
+    def _play_turn(self, rows: np.ndarray) -> None:
+        """Rolls the dice and resolves the move of the current player of the given games."""
+        state = self.state
+        owner, money = state.owner, state.money
+        cur = self.current_player[rows]
+
+        dice = self._dice.roll(rows)
+        roll = dice[0] + dice[1]
+        position = state.position[rows, cur] + roll
+        money[rows, cur] += (position >= NUM_CASE) * GO_SALARY
+        position %= NUM_CASE
+        position[self._square_go_to_jail[position]] = self._jail_square
+        state.position[rows, cur] = position
+
+        # Taxes
+        money[rows, cur] -= self._square_tax[position]
+
+        # Purchasable squares
+        prop = self._square_property[position]
+        on_prop = prop >= 0
+        r, c, p, roll = rows[on_prop], cur[on_prop], prop[on_prop], roll[on_prop]
+        prop_owner = owner[r, p]
+
+        buy = (prop_owner == NO_OWNER) & (money[r, c] >= self.price[p])
+        if self.opponents:
+            for policy, sub, seats in self._by_policy(np.flatnonzero(buy), c[buy]):
+                buy[sub] = policy.buy_property(self, r[sub], seats, p[sub])
+        owner[r[buy], p[buy]] = c[buy]
+        state.owner_mask[r[buy], c[buy]] |= PROPERTY_BITS[p[buy]]
+        money[r[buy], c[buy]] -= self.price[p[buy]]
+
+        pay = (prop_owner != NO_OWNER) & (prop_owner != c) & ~state.mortgaged[r, p]
+        r, c, p, roll = r[pay], c[pay], p[pay], roll[pay]
+        creditor = prop_owner[pay].astype(np.intp)
+        rent = self._rent_table.rent(state, p, roll, rows=r)
+        money[r, c] -= rent
+        money[r, creditor] += rent
+
+        # Bankruptcy: properties go back to the bank
+        broke = money[rows, cur] < 0
+        if self.opponents and broke.any():
+            for policy, sub, seats in self._by_policy(np.flatnonzero(broke), cur[broke]):
+                policy.raise_funds(self, rows[sub], seats)
+            broke = money[rows, cur] < 0
+        if broke.any():
+            r, c = rows[broke], cur[broke]
+            state.bankrupt[r, c] = True
+            money[r, c] = 0
+            released = owner[r] == c[:, None]
+            owner[r] = np.where(released, NO_OWNER, owner[r])
+            state.owner_mask[r, c] = 0
+            state.houses[r] = np.where(released, 0, state.houses[r])
+            state.mortgaged[r] &= ~released
+
+    def _bankrupt_bits(self) -> np.ndarray:
+        """Bankrupt seats of every game packed as a 4-bit mask (bit i = seat i)."""
+        # Each bool is one byte of a little-endian uint32; fold bytes 1-3 down next to bit 0
+        word = self.state.bankrupt.view(np.uint32)[:, 0]
+        return ((word | (word >> 7) | (word >> 14) | (word >> 21)) & 0xF).astype(np.intp)
+
+    def _get_obs(self) -> Dict[str, Any]:
+        """Batched observation for the current player of every game."""
+        state = self.state
+        obs = self._obs
+        rows = self._rows
+        cur = self.current_player
+        houses = state.houses
+
+        np.equal(state.owner, cur.astype(np.int8)[:, None], out=self._own)
+        obs["self_money"][:, 0] = state.money[rows, cur]
+        obs["self_position"][:] = state.position[rows, cur]
+        np.multiply(self._own, houses, out=obs["self_houses"])
+
+        # Action masks
+        np.logical_and(self._own, ~state.mortgaged, out=self._mortgageable)
+        monopolies = self.group_masks.monopolies(state.owner_mask[rows, cur])
+        monopoly = monopolies[:, None] & PROPERTY_BITS != 0
+        np.logical_and(self._mortgageable, monopoly, out=self._buildable)
+        self._buildable &= self.house_cost <= obs["self_money"]
+        self._can_trade[:, 0] = self._own.any(axis=1)
+
+        # Other players
+        others = self._others_table[(cur << NUM_PLAYERS) | self._bankrupt_bits()]
+        valid = others != NO_PLAYER
+        seats = np.where(valid, others, 0)
+        for slot in range(3):
+            np.equal(state.owner, others[:, slot, None], out=self._others_owned[:, slot])
+            np.multiply(self._others_owned[:, slot], houses, out=obs["others_houses"][:, slot])
+        np.multiply(state.money[rows[:, None], seats], valid, out=obs["others_money"])
+        np.multiply(state.position[rows[:, None], seats], valid, out=obs["others_positions"])
+        if self.landing_features:
+            table = self._landing_table
+            obs["self_landing"][:] = table[obs["self_position"]]
+            np.multiply(table[obs["others_positions"]], valid[..., None], out=obs["others_landing"])
+        np.logical_not(state.bankrupt, out=self._active)
+
+        if self.flat_obs is not None:
+            flat = self.flat_obs.write(obs)
+            return flat.copy() if self.copy else flat
+        if not self.copy:
+            return obs
+        copied = {key: value.copy() for key, value in obs.items() if key not in ("action_masks", "all_properties")}
+        copied["action_masks"] = {key: value.copy() for key, value in obs["action_masks"].items()}
+        copied["all_properties"] = obs["all_properties"]
+        return copied
+
+    def _get_info(self) -> Dict[str, Any]:
+        """Current player of every game, and their legal flat actions in discrete action mode."""
+        info = {"current_player": self.current_player.copy(),
+                "_current_player": np.ones(self.num_envs, dtype=np.bool_)}
+        if self.discrete_actions is not None:
+            # The mortgage and build masks of the current players were just computed by `_get_obs`
+            state, cur = self.state, self.current_player
+            partners = self.other_players(self._rows)
+            self.discrete_actions.legal_mask(self._mortgageable, self._buildable, state.owner, cur,
+                                             state.money[self._rows, cur], partners, out=self._legal)
+            info["action_mask"] = self._legal.copy() if self.copy else self._legal
+            info["_action_mask"] = info["_current_player"]
+        return info
+
+
+gym.register(
+    id="MonopolyVector-v0",
+    vector_entry_point="environment.vector_env:MonopolyVectorEnv",
+)
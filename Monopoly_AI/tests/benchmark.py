@@ -0,0 +1,370 @@
+"""
+Throughput benchmarks of the environments and the game engine.
+
+Run from the `Monopoly_AI` directory:
+
+    python -m tests.benchmark                                  # run everything, print a table
+    python -m tests.benchmark --output results.json            # also save the results
+    python -m tests.benchmark --baseline baseline.json         # fail (exit 1) on a regression
+    python -m tests.benchmark --baseline baseline.json --save-baseline
+
+Each benchmark times single operations with `perf_counter_ns` and reports ops/sec plus the p50/p99 latency.
+A separate pass under `tracemalloc` measures the memory allocated per operation: the net number of blocks
+still alive after the operation and the peak of transient allocations. A benchmark regresses when its ops/sec
+drops by more than `--threshold` (a fraction) below the baseline.
+
+The file is not named `test_*.py`, so pytest does not collect it.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from environment.board import get_board
+from environment.engine import MonopolyEngine
+from environment.gameV3 import MonopolyRLEnv, NUM_PROPERTIES
+from environment.recorder import TrajectoryRecorder
+from environment.rent import RentTable
+from environment.state import GameState, NO_OWNER
+from environment.vector_env import MonopolyVectorEnv
+
+# Default regression threshold: fraction of the baseline ops/sec that may be lost
+THRESHOLD = 0.2
+# Engine turns played before the state is copied into the benchmarked environments, so that properties are
+# owned, built and mortgaged as in the middle of a real game
+MIDGAME_TURNS = 150
+
+
+def midgame_state(seed: int = 0) -> GameState:
+    """Plays a headless game for `MIDGAME_TURNS` turns and returns its state."""
+    engine = MonopolyEngine(seed=seed)
+    for _ in range(MIDGAME_TURNS):
+        if engine.num_active <= 1:
+            break
+        engine.play_turn()
+    return engine.state
+
+
+def load_state(env: MonopolyRLEnv, state: GameState) -> None:
+    """Restores a game state into an environment (`GameState.snapshot`) and rebuilds its incremental buffers."""
+    env.state.restore(state.snapshot())
+    env._refresh_buffers()
+
+
+def random_masked_action(env: MonopolyRLEnv, rng: np.random.Generator) -> Dict[str, Any]:
+    """Draws a management action, picking mortgage/build targets among the legal ones when there are any."""
+    player_idx = env.current_player_idx
+    action_type = int(rng.integers(5))
+    property_idx = int(rng.integers(NUM_PROPERTIES))
+    if action_type in (0, 1):
+        mask = env.action_masks.mortgage if action_type == 0 else env.action_masks.build
+        legal = np.flatnonzero(mask[player_idx])
+        if len(legal):
+            property_idx = int(rng.choice(legal))
+        else:
+            action_type = 4
+    return {
+        "action_type": action_type,
+        "property_idx": property_idx,
+        "trade_partner": int(rng.integers(3)),
+        "trade_amount": np.array([rng.integers(0, 500)], dtype=np.int32),
+    }
+
+
+# Each setup returns the operation to time, called without arguments
+
+def setup_reset(seed: int) -> Callable[[], Any]:
+    env = MonopolyRLEnv()
+    env.reset(seed=seed)
+    return env.reset
+
+
+def setup_step(seed: int) -> Callable[[], Any]:
+    return setup_step_no_copy(seed, copy_obs=True)
+
+
+def setup_step_no_copy(seed: int, copy_obs: bool = False, **env_kwargs: Any) -> Callable[[], Any]:
+    env = MonopolyRLEnv(copy_obs=copy_obs, **env_kwargs)
+    env.reset(seed=seed)
+    state = midgame_state(seed)
+    load_state(env, state)
+    rng = np.random.default_rng(seed)
+
+    def step():
+        _, _, terminated, truncated, _ = env.step(random_masked_action(env, rng))
+        if terminated or truncated:
+            load_state(env, state)
+    return step
+
+
+def setup_step_flat(seed: int) -> Callable[[], Any]:
+    return setup_step_no_copy(seed, obs_mode="flat")
+
+
+def setup_step_recorded(seed: int) -> Callable[[], Any]:
+    directory = tempfile.TemporaryDirectory()
+    env = TrajectoryRecorder(MonopolyRLEnv(copy_obs=False, obs_mode="flat"), directory.name)
+    env.reset(seed=seed)
+    state = midgame_state(seed)
+    load_state(env.unwrapped, state)
+    rng = np.random.default_rng(seed)
+
+    def step():
+        _, _, terminated, truncated, _ = env.step(random_masked_action(env.unwrapped, rng))
+        if terminated or truncated:
+            env.reset()
+            load_state(env.unwrapped, state)
+    # The recording lives as long as the closure
+    step.directory = directory
+    return step
+
+
+def setup_observation(seed: int) -> Callable[[], Any]:
+    env = MonopolyRLEnv()
+    env.reset(seed=seed)
+    load_state(env, midgame_state(seed))
+    player = env.players[0]
+    return lambda: env._get_obs_for_player(player)
+
+
+def setup_snapshot_restore(seed: int) -> Callable[[], Any]:
+    env = MonopolyRLEnv()
+    env.reset(seed=seed)
+    load_state(env, midgame_state(seed))
+    return lambda: env.restore(env.snapshot())
+
+
+def setup_masks_refresh(seed: int) -> Callable[[], Any]:
+    env = MonopolyRLEnv()
+    env.reset(seed=seed)
+    load_state(env, midgame_state(seed))
+    return env.action_masks.refresh
+
+
+def setup_masks_update(seed: int) -> Callable[[], Any]:
+    env = MonopolyRLEnv()
+    env.reset(seed=seed)
+    load_state(env, midgame_state(seed))
+    properties = iter(np.random.default_rng(seed).integers(NUM_PROPERTIES, size=1 << 20).tolist())
+    return lambda: env._on_property_changed(next(properties))
+
+
+def setup_rent(seed: int) -> Callable[[], Any]:
+    state = midgame_state(seed)
+    rent_table = RentTable(get_board())
+    owned = np.flatnonzero(state.owner != NO_OWNER)
+    rng = np.random.default_rng(seed)
+    properties = iter(rng.choice(owned, size=1 << 20).tolist())
+    dice = iter(rng.integers(2, 13, size=1 << 20).tolist())
+    return lambda: rent_table.rent(state, next(properties), next(dice))
+
+
+def setup_engine_rent(seed: int) -> Callable[[], Any]:
+    engine = MonopolyEngine(seed=seed)
+    for _ in range(MIDGAME_TURNS):
+        if engine.num_active <= 1:
+            break
+        engine.play_turn()
+    owned = np.flatnonzero(engine.state.owner != NO_OWNER)
+    rng = np.random.default_rng(seed)
+    properties = iter(rng.choice(owned, size=1 << 20).tolist())
+    dice = iter(rng.integers(2, 13, size=1 << 20).tolist())
+    return lambda: engine.rent(next(properties), next(dice))
+
+
+def setup_vector_step(seed: int, **env_kwargs: Any) -> Callable[[], Any]:
+    env = MonopolyVectorEnv(num_envs=256, max_steps=500, copy=False, **env_kwargs)
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+    actions = [env.action_space.sample() for _ in range(64)]
+    cycle = iter(actions * (1 << 14))
+    return lambda: env.step(next(cycle))
+
+
+def setup_vector_step_flat(seed: int) -> Callable[[], Any]:
+    return setup_vector_step(seed, obs_mode="flat")
+
+
+def setup_vector_opponents(seed: int) -> Callable[[], Any]:
+    # One learner step plus the turns of three scripted opponents
+    return setup_vector_step(seed, opponents="greedy_builder")
+
+
+def setup_full_game(seed: int) -> Callable[[], Any]:
+    engine = MonopolyEngine()
+    seeds = iter(range(seed, seed + (1 << 20)))
+    return lambda: engine.play_game(seed=next(seeds))
+
+
+# name -> (setup, timed operations, operations per timed call)
+BENCHMARKS: Dict[str, tuple] = {
+    "reset": (setup_reset, 5000, 1),
+    "step": (setup_step, 5000, 1),
+    "step_no_copy": (setup_step_no_copy, 5000, 1),
+    "step_flat": (setup_step_flat, 5000, 1),
+    "step_recorded": (setup_step_recorded, 5000, 1),
+    "observation": (setup_observation, 20000, 1),
+    "snapshot_restore": (setup_snapshot_restore, 50000, 1),
+    "masks_refresh": (setup_masks_refresh, 20000, 1),
+    "masks_update": (setup_masks_update, 20000, 1),
+    "rent": (setup_rent, 20000, 1),
+    "engine_rent": (setup_engine_rent, 50000, 1),
+    "vector_step_256": (setup_vector_step, 500, 256),
+    "vector_step_flat_256": (setup_vector_step_flat, 500, 256),
+    "vector_opponents_256": (setup_vector_opponents, 500, 256),
+    "full_game": (setup_full_game, 30, 1),
+}
+
+
+def time_operation(operation: Callable[[], Any], iterations: int, warmup: int) -> np.ndarray:
+    """Times `iterations` calls of an operation, after `warmup` untimed calls; returns nanoseconds per call."""
+    for _ in range(warmup):
+        operation()
+    timings = np.empty(iterations, dtype=np.int64)
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        start = clock()
+        operation()
+        timings[i] = clock() - start
+    return timings
+
+
+def measure_allocations(operation: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """
+    Measures the memory allocated by an operation under `tracemalloc`.
+
+    Returns:
+        Dict[str, float]: Mean net blocks left allocated per call, and mean peak of traced bytes per call.
+    """
+    tracemalloc.start()
+    try:
+        peaks = 0
+        blocks_before = sys.getallocatedblocks()
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks += peak - base
+        blocks_after = sys.getallocatedblocks()
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_blocks_per_op": (blocks_after - blocks_before) / iterations,
+        "alloc_peak_bytes_per_op": peaks / iterations,
+    }
+
+
+def run_benchmark(name: str, seed: int = 0, scale: float = 1.0) -> Dict[str, Any]:
+    """
+    Runs one benchmark of `BENCHMARKS`.
+
+    Args:
+        name (str): Name of the benchmark.
+        seed (int): Seed of the game states and actions.
+        scale (float): Multiplier of the number of timed operations.
+
+    Returns:
+        Dict[str, Any]: ops/sec, p50/p99 latency (µs per timed call) and allocation figures.
+    """
+    setup, iterations, ops_per_call = BENCHMARKS[name]
+    iterations = max(5, int(iterations * scale))
+    timings = time_operation(setup(seed), iterations, warmup=max(1, iterations // 10))
+    result = {
+        "ops_per_sec": ops_per_call * iterations / (timings.sum() / 1e9),
+        "p50_us": float(np.percentile(timings, 50)) / 1e3,
+        "p99_us": float(np.percentile(timings, 99)) / 1e3,
+        "iterations": iterations,
+        "ops_per_call": ops_per_call,
+    }
+    result.update(measure_allocations(setup(seed), max(5, iterations // 10)))
+    return result
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float = THRESHOLD) -> List[str]:
+    """
+    Compares results against a baseline.
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): Results by benchmark name.
+        baseline (Dict[str, Any]): Saved output of a previous run.
+        threshold (float): Tolerated relative loss of ops/sec.
+
+    Returns:
+        List[str]: One description per regressed benchmark.
+    """
+    regressions = []
+    reference = baseline.get("results", baseline)
+    for name, result in results.items():
+        if name not in reference:
+            continue
+        before = reference[name]["ops_per_sec"]
+        ratio = result["ops_per_sec"] / before
+        result["baseline_ratio"] = ratio
+        if ratio < 1.0 - threshold:
+            regressions.append(f"{name}: {result['ops_per_sec']:.0f} ops/s vs {before:.0f} ops/s ({ratio:.2f}x)")
+    return regressions
+
+
+def format_table(results: Dict[str, Dict[str, Any]]) -> str:
+    """Formats results as a text table."""
+    lines = [f"{'benchmark':<22}{'ops/s':>14}{'p50 µs':>10}{'p99 µs':>10}{'blocks/op':>11}{'peak B/op':>11}"
+             f"{'vs base':>9}"]
+    for name, result in results.items():
+        ratio = result.get("baseline_ratio")
+        lines.append(f"{name:<22}{result['ops_per_sec']:>14.0f}{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}"
+                     f"{result['alloc_blocks_per_op']:>11.2f}{result['alloc_peak_bytes_per_op']:>11.0f}"
+                     f"{'' if ratio is None else f'{ratio:.2f}x':>9}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run (default: all of {list(BENCHMARKS)})")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite --baseline with these results")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Tolerated relative ops/sec loss before a benchmark counts as a regression")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier of the number of timed operations")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {unknown}")
+
+    results = {name: run_benchmark(name, args.seed, args.scale) for name in names}
+    regressions = []
+    if args.baseline and not args.save_baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+    print(format_table(results))
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "scale": args.scale,
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        print("\n".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,529 @@
+import json
+import os
+import pickle
+import gymnasium as gym
+import numpy as np
+import pytest
+from agents.agents import AgentPolicy
+from agents.mcts import BUY, MCTSPlanner
+from environment.actions import DO_NOTHING
+from environment.board import get_board
+from environment.dataset import TrajectoryDataset
+from environment.engine import DecisionPolicy, MonopolyEngine
+from environment.game import Game
+from environment.gameV3 import MonopolyGame, MonopolyRLEnv
+from environment.opponents import OPPONENTS, MortgageWhenShort
+from environment.player import Player
+from environment.recorder import META_FILE, TrajectoryRecorder
+from environment.rent import RentTable
+from environment.state import GameState
+from environment.valuation import EXPECTED_DICE
+from environment.vector_env import MonopolyVectorEnv
+from environment.shared_vector_env import SharedMemoryVectorEnv
+from tests.benchmark import load_state, midgame_state
+from utils.logger import EVENTS, EventKind, EventLog
+
+
+@pytest.mark.parametrize("game_class", [Game, MonopolyGame])
+def test_interactive_games_play_with_decision_policy(game_class):
+    game = game_class(decisions=DecisionPolicy(), seed=0, log=EventLog())
+    for turn in range(500):
+        active = [player for player in game.players if not player.bankrupt]
+        if len(active) <= 1:
+            break
+        game._handle_player_turn(active[turn % len(active)])
+    assert (game.state.owner >= -1).all()
+
+
+class DeclinesBuys(DecisionPolicy):
+    """Never buys when landing on a property, and raises auctions by 10 up to 400."""
+
+    def buy_property(self, game, player_idx, property_idx):
+        return False
+
+    def auction_bid(self, game, player_idx, property_idx, current_bid):
+        return current_bid + 10 if current_bid < 400 else 0
+
+
+def test_game_auctions_through_the_decision_policy(monkeypatch):
+    def closed_stdin(*args):
+        raise EOFError
+    monkeypatch.setattr("builtins.input", closed_stdin)
+    game = Game(decisions=DeclinesBuys(), seed=0, log=EventLog())
+    for turn in range(200):
+        active = [player for player in game.players if not player.bankrupt]
+        if len(active) <= 1:
+            break
+        game._handle_player_turn(active[turn % len(active)])
+    assert (game.state.owner != -1).any()
+
+
+def test_decision_policy_builds_and_mortgages_through_game_helpers():
+    for game in (Game(decisions=DecisionPolicy(), log=EventLog()),
+                 MonopolyGame(decisions=DecisionPolicy(), log=EventLog()), MonopolyEngine()):
+        state = game.state
+        group = game.group_masks.group_masks[0]
+        streets = [idx for idx in range(len(state.owner)) if int(group) >> idx & 1]
+        for idx in streets:
+            state.transfer(idx, 0)
+        state.money[0] = 2000
+        DecisionPolicy().start_turn(game, 0)
+        assert state.houses[streets].sum() > 0
+        assert state.money[0] >= DecisionPolicy.cash_reserve
+
+        state.money[0] = 0
+        DecisionPolicy().raise_funds(game, 0, 10)
+        assert state.mortgaged[streets].any() and state.money[0] >= 10
+        assert np.array_equal(game.mortgageable_properties(0),
+                              [idx for idx in streets if not state.mortgaged[idx]])
+
+
+def flatten(tree, prefix=()):
+    """Key paths and leaves of a nested observation."""
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            yield from flatten(value, prefix + (key,))
+        else:
+            yield prefix + (key,), value
+
+
+def lookup(tree, key):
+    """Leaf of a nested observation at a key path from `flatten`."""
+    for part in key:
+        tree = tree[part]
+    return tree
+
+
+def handler_masks(env, player_idx):
+    """Mortgage and build masks of a player, from the rules of `_handle_mortgage` and `_handle_build`."""
+    state = env.state
+    mortgage = np.array([state.owner[idx] == player_idx and not state.mortgaged[idx]
+                         for idx in range(len(state.owner))])
+    build = np.zeros(len(state.owner), dtype=np.bool_)
+    for idx, name in enumerate(env.property_order):
+        case = env.board.get_property(name)
+        if case["type"] != "property" or not mortgage[idx]:
+            continue
+        if all(env.players[player_idx].owns(other) for other in env._get_color_group(case["color_code"])):
+            build[idx] = state.money[player_idx] >= case["price"] // 2
+    return mortgage, build
+
+
+def test_incremental_masks_match_handler_rules():
+    env = MonopolyRLEnv(copy_obs=False)
+    rng = np.random.default_rng(0)
+    for episode in range(8):
+        env.reset(seed=episode)
+        env.state.owner[:] = rng.choice([-1, 0, 1, 2, 3], len(env.state.owner), p=[.1, .6, .1, .1, .1])
+        env.state.money[:] = rng.integers(0, 400, len(env.players))
+        env.state.sync_owner_mask()
+        env._refresh_buffers()
+        for _ in range(100):
+            action = env.action_space.sample()
+            action["action_type"] = rng.choice(5, p=[.3, .4, .1, .1, .1])
+            action["trade_amount"][:] = rng.integers(0, 300)
+            env.step(action)
+            masks = env.action_masks
+            for player_idx in range(len(env.players)):
+                mortgage, build = handler_masks(env, player_idx)
+                assert np.array_equal(masks.mortgage[player_idx], mortgage)
+                assert np.array_equal(masks.build[player_idx], build)
+                assert masks.mortgage_bits[player_idx] == sum(1 << int(idx) for idx in np.flatnonzero(mortgage))
+                assert masks.build_bits[player_idx] == sum(1 << int(idx) for idx in np.flatnonzero(build))
+
+
+def test_shared_memory_env_matches_single_envs():
+    num_envs, max_steps = 4, 30
+    shared = SharedMemoryVectorEnv(num_envs, num_workers=2, max_steps=max_steps, copy=True,
+                                   env_kwargs={"action_mode": "discrete"})
+    try:
+        envs = [MonopolyRLEnv(action_mode="discrete") for _ in range(num_envs)]
+        obs, info = shared.reset(seed=10)
+        single = [env.reset(seed=10 + i) for i, env in enumerate(envs)]
+        steps = [0] * num_envs
+        done = [False] * num_envs
+        rng = np.random.default_rng(0)
+        for _ in range(80):
+            masks = info["action_mask"]
+            actions = np.array([rng.choice(np.flatnonzero(mask)) for mask in masks])
+            obs, reward, terminated, truncated, info = shared.step(actions)
+            for i, env in enumerate(envs):
+                if done[i]:
+                    single[i] = env.reset()
+                    steps[i], done[i] = 0, False
+                    expected_reward, expected_terminated, expected_truncated = 0.0, False, False
+                else:
+                    observation, expected_reward, expected_terminated, _, env_info = env.step(int(actions[i]))
+                    single[i] = observation, env_info
+                    steps[i] += 1
+                    expected_truncated = not expected_terminated and steps[i] >= max_steps
+                    done[i] = expected_terminated or expected_truncated
+                observation, env_info = single[i]
+                assert reward[i] == np.float32(expected_reward)
+                assert terminated[i] == expected_terminated and truncated[i] == expected_truncated
+                assert np.array_equal(info["action_mask"][i], env_info["action_mask"])
+                for key, value in flatten(observation):
+                    assert np.array_equal(lookup(obs, key)[i], value), key
+    finally:
+        shared.close()
+
+
+def test_legal_action_mask_matches_step_errors():
+    env = MonopolyRLEnv(action_mode="discrete")
+    env.reset(seed=0)
+    actions = env.discrete_actions
+    fields = ("owner", "houses", "mortgaged", "money", "position", "bankrupt", "jail_turns", "owner_mask")
+    for seed in range(4):
+        load_state(env, midgame_state(seed))
+        env.current_player_idx = seed % 3
+        mask = env.legal_action_mask()
+        saved = {field: getattr(env.state, field).copy() for field in fields}
+        for action in range(actions.size):
+            player = env.players[env.current_player_idx]
+            try:
+                legal = env._apply_action(player, actions.decode(action)) > 0 or actions.action_type[action] == DO_NOTHING
+            except Exception:
+                legal = False
+            assert legal == mask[action], (seed, actions.decode(action))
+            for field in fields:
+                getattr(env.state, field)[...] = saved[field]
+            env._refresh_buffers()
+
+
+def test_engine_snapshot_replays_the_same_game():
+    engine = MonopolyEngine(seed=3)
+    for _ in range(60):
+        engine.play_turn()
+    snapshot = engine.snapshot()
+
+    def play(game, turns=500):
+        states = []
+        for _ in range(turns):
+            if game.num_active <= 1:
+                break
+            game.play_turn()
+            states.append(game.state.snapshot() + bytes(game.in_jail))
+        return states
+
+    first = play(engine)
+    engine.restore(snapshot)
+    assert play(engine) == first
+    clone = engine.clone()
+    clone.restore(snapshot)
+    assert play(clone) == first
+
+
+def test_env_snapshot_replays_the_same_steps():
+    env = MonopolyRLEnv(action_mode="discrete")
+    env.reset(seed=0)
+    load_state(env, midgame_state(0))
+    snapshot = env.snapshot()
+    rng = np.random.default_rng(0)
+    trajectory = []
+    for _ in range(50):
+        mask = env.legal_action_mask()
+        action = int(rng.choice(np.flatnonzero(mask)))
+        obs, reward, _, _, info = env.step(action)
+        trajectory.append((action, reward, obs, info["action_mask"].copy()))
+    env.restore(snapshot)
+    for action, reward, obs, mask in trajectory:
+        replayed, replayed_reward, _, _, info = env.step(action)
+        assert replayed_reward == reward
+        assert np.array_equal(info["action_mask"], mask)
+        for key, value in flatten(obs):
+            assert np.array_equal(lookup(replayed, key), value), key
+    clone = env.clone()
+    assert clone.snapshot() == env.snapshot()
+
+
+def test_markov_landing_model_matches_simulated_landings():
+    model = get_board().landing
+    assert np.allclose(model.transition.sum(axis=1), 1)
+    assert np.allclose(model.stationary @ model.transition, model.stationary)
+
+    class NeverPays(DecisionPolicy):
+        def leave_jail_by_paying(self, game, player_idx):
+            return False
+
+        def buy_property(self, game, player_idx, property_idx):
+            return False
+
+    engine = MonopolyEngine(NeverPays(), num_players=1, max_turns=10 ** 9)
+    engine.reset(seed=0)
+    counts = np.zeros(len(model.stationary))
+    turns = 100_000
+    for _ in range(turns):
+        engine.state.money[0] = 10 ** 6
+        engine.play_turn()
+        square = int(engine.state.position[0])
+        if engine.in_jail[0]:
+            square = 40 + int(engine.state.jail_turns[0])
+        counts[square] += 1
+    assert np.abs(counts / turns - model.stationary).max() < 0.005
+
+
+def test_player_without_state_can_buy_properties():
+    player = Player("Alice")
+    assert player.buy_property("Rue Lecourbe", 60)
+    assert player.owns("Rue Lecourbe") and player.money == 1440
+
+
+def test_scalar_rent_matches_batched_lookup():
+    board = get_board()
+    table = RentTable(board)
+    rng = np.random.default_rng(0)
+    batch = GameState(board.property_order, num_players=4, batch_size=2000)
+    batch.owner[:] = rng.integers(-1, 4, batch.owner.shape)
+    batch.houses[:] = rng.integers(0, 6, batch.houses.shape)
+    prop = rng.integers(0, len(board.property_order), 2000)
+    dice = rng.integers(2, 13, 2000)
+    expected = table.rent(batch, prop, dice)
+    engine = MonopolyEngine()
+    for game in range(2000):
+        owners, houses = batch.owner[game].tolist(), int(batch.houses[game, prop[game]])
+        assert table.rent_one(owners, int(prop[game]), houses, int(dice[game])) == expected[game]
+        engine.state.owner[:] = batch.owner[game]
+        engine.state.houses[:] = batch.houses[game]
+        assert engine.rent(int(prop[game]), int(dice[game])) == expected[game]
+
+
+def test_bankrupt_events_record_the_unpaid_amount():
+    log = EventLog(EVENTS)
+    engine = MonopolyEngine(log=log)
+    for seed in range(5):
+        engine.play_game(seed=seed)
+    events = log.events()
+    bankrupt = events[events["kind"] == EventKind.BANKRUPT]
+    assert len(bankrupt) and (bankrupt["a"] > 0).all()
+
+
+def test_profiled_env_survives_pickling():
+    env = MonopolyRLEnv(action_mode="discrete")
+    env.reset(seed=0)
+    env.enable_profiling(info=True)
+    env.step(0)
+    copy = pickle.loads(pickle.dumps(env))
+    assert copy.snapshot() == env.snapshot()
+    _, _, _, _, info = copy.step(0)
+    assert "profile" in info
+    assert copy.profile_report()["step"]["calls"] == 2
+
+
+def record(directory, steps=100, episode_steps=17, shard_steps=40, initial_rows=8):
+    """
+    Records random legal steps of short episodes, with shards small enough that the columns grow and roll over.
+    The last episode is cut by `close`.
+
+    Returns:
+        List of the episodes: (list of (flat observation, action, reward, terminated, truncated, mask),
+        final flat observation).
+    """
+    env = gym.wrappers.TimeLimit(MonopolyRLEnv(copy_obs=False, action_mode="discrete"), episode_steps)
+    recorder = TrajectoryRecorder(env, directory, shard_steps=shard_steps, initial_rows=initial_rows)
+    rng = np.random.default_rng(0)
+    obs, info = recorder.reset(seed=0)
+    episodes, current = [], []
+    for _ in range(steps):
+        action = int(rng.choice(np.flatnonzero(info["action_mask"])))
+        before = {".".join(key): np.copy(value) for key, value in flatten(obs)}
+        mask = info["action_mask"].copy()
+        obs, reward, terminated, truncated, info = recorder.step(action)
+        current.append((before, action, reward, terminated, truncated, mask))
+        if terminated or truncated:
+            episodes.append((current, {".".join(key): np.copy(value) for key, value in flatten(obs)}))
+            current = []
+            obs, info = recorder.reset()
+    episodes.append((current, {".".join(key): np.copy(value) for key, value in flatten(obs)}))
+    recorder.close()
+    return episodes
+
+
+def test_recorder_writes_shards_of_whole_episodes(tmp_path):
+    episodes = record(str(tmp_path))
+    shards = sorted(os.listdir(tmp_path))
+    assert len(shards) > 1
+    recorded = []
+    for name in shards:
+        with open(os.path.join(tmp_path, name, META_FILE)) as file:
+            meta = json.load(file)
+
+        def read(column):
+            data = np.fromfile(os.path.join(tmp_path, name, column["file"]), dtype=column["dtype"])
+            return data.reshape((column["length"],) + tuple(column["shape"]))
+        columns = {key: read(column) for key, column in meta["columns"].items()}
+        finals = {key: read(column) for key, column in meta["episode_columns"].items()}
+        assert all(len(column) == meta["steps"] for column in columns.values())
+        for e, (start, stop) in enumerate(finals["episodes"]):
+            steps = [({key[len("obs."):]: columns[key][row] for key in columns if key.startswith("obs.")},
+                      columns["action"][row], columns["reward"][row], columns["terminated"][row],
+                      columns["truncated"][row], columns["action_mask"][row]) for row in range(start, stop)]
+            final = {key[len("final_obs."):]: finals[key][e] for key in finals if key.startswith("final_obs.")}
+            recorded.append((steps, final))
+        # Shards are only closed at the end of an episode, once they hold `shard_steps` steps
+        assert meta["steps"] >= 40 or name == shards[-1]
+
+    assert len(recorded) == len(episodes)
+    for (steps, final), (expected_steps, expected_final) in zip(recorded, episodes):
+        assert len(steps) == len(expected_steps)
+        for step, expected in zip(steps, expected_steps):
+            assert step[0].keys() == expected[0].keys()
+            assert all(np.array_equal(step[0][key], expected[0][key]) for key in expected[0])
+            assert step[1] == expected[1] and step[2] == np.float32(expected[2])
+            assert (step[3], step[4]) == (expected[3], expected[4])
+            assert np.array_equal(step[5], expected[5])
+        assert all(np.array_equal(final[key], expected_final[key]) for key in expected_final)
+    # The running episode is cut at close, neither terminated nor truncated
+    assert not episodes[-1][0][-1][3] and not episodes[-1][0][-1][4]
+
+
+def test_dataset_reads_back_a_recording(tmp_path):
+    episodes = record(str(tmp_path))
+    dataset = TrajectoryDataset(str(tmp_path))
+    assert len(dataset.shards) > 1
+    assert dataset.num_episodes == len(episodes)
+    steps = [step for expected_steps, _ in episodes for step in expected_steps]
+    assert len(dataset) == len(steps)
+
+    # Next observation of every step: the following one in its episode, or the final one
+    next_obs, next_mask, ends = [], [], []
+    for expected_steps, final in episodes:
+        for t in range(len(expected_steps)):
+            last = t + 1 == len(expected_steps)
+            next_obs.append(final if last else expected_steps[t + 1][0])
+            next_mask.append(np.zeros_like(expected_steps[t][5]) if last else expected_steps[t + 1][5])
+            ends.append(last)
+
+    batch = dataset.batch(np.arange(len(dataset)))
+    for row, (obs, action, reward, terminated, truncated, mask) in enumerate(steps):
+        assert batch["action"][row] == action and batch["reward"][row] == np.float32(reward)
+        assert batch["terminated"][row] == terminated and batch["truncated"][row] == truncated
+        assert np.array_equal(batch["action_mask"][row], mask)
+        assert np.array_equal(batch["next_action_mask"][row], next_mask[row])
+        for key in obs:
+            assert np.array_equal(batch["obs." + key][row], obs[key])
+            assert np.array_equal(batch["next_obs." + key][row], next_obs[row][key])
+
+    n, gamma = 3, 0.9
+    targets = dataset.n_step(np.arange(len(dataset)), n=n, gamma=gamma)
+    start = 0
+    for expected_steps, final in episodes:
+        rewards = [np.float32(step[2]) for step in expected_steps]
+        for t in range(len(expected_steps)):
+            stop = min(t + n, len(expected_steps))
+            row = start + t
+            assert np.isclose(targets["return"][row], sum(gamma ** k * rewards[t + k] for k in range(stop - t)))
+            terminated = any(step[3] for step in expected_steps[t:stop])
+            assert targets["discount"][row] == (0.0 if terminated else gamma ** (stop - t))
+            bootstrap = final if stop == len(expected_steps) else expected_steps[stop][0]
+            for key in bootstrap:
+                assert np.array_equal(targets["next_obs." + key][row], bootstrap[key])
+        start += len(expected_steps)
+
+    episode = dataset.episode(dataset.num_episodes - 1)
+    assert len(episode["reward"]) == len(episodes[-1][0])
+    copy = pickle.loads(pickle.dumps(dataset))
+    sample = np.random.default_rng(0).integers(0, len(dataset), 32)
+    for key, value in dataset.batch(sample).items():
+        assert np.array_equal(copy.batch(sample)[key], value)
+
+
+def test_mortgage_when_short_mortgages_the_shortest_covering_prefix():
+    env = MonopolyVectorEnv(3)
+    env.reset(seed=0)
+    state = env.state
+    rng = np.random.default_rng(0)
+    state.owner[:] = rng.choice([-1, 0, 1, 2, 3], state.owner.shape, p=[.2, .2, .4, .1, .1])
+    state.mortgaged[:] = (state.owner != -1) & (rng.random(state.owner.shape) < .2)
+    state.sync_owner_mask()
+    rows, seats = np.arange(3), np.ones(3, dtype=np.intp)
+    state.money[rows, seats] = [-150, -1, -100_000]
+    mortgaged, money = state.mortgaged.copy(), state.money.copy()
+
+    MortgageWhenShort().raise_funds(env, rows, seats)
+
+    ranking = np.argsort(env.board.valuation.base_income / np.maximum(env.mortgage_value, 1), kind="stable")
+    for row in rows:
+        debt, raised = -int(money[row, 1]), 0
+        expected = mortgaged[row].copy()
+        for prop in ranking:
+            if raised >= debt:
+                break
+            if state.owner[row, prop] == 1 and not mortgaged[row, prop]:
+                expected[prop] = True
+                raised += int(env.mortgage_value[prop])
+        assert np.array_equal(state.mortgaged[row], expected)
+        assert state.money[row, 1] == raised - debt
+    assert state.money[0, 1] >= 0 and state.money[1, 1] >= 0
+    assert (state.mortgaged[2] == (state.owner[2] == 1) | mortgaged[2]).all()
+
+
+@pytest.mark.parametrize("name", sorted(OPPONENTS))
+def test_vector_env_plays_against_builtin_opponents(name):
+    env = MonopolyVectorEnv(4, max_steps=60, opponents=name, action_mode="discrete")
+    obs, info = env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    state = env.state
+    for _ in range(100):
+        actions = np.array([rng.choice(np.flatnonzero(mask)) for mask in info["action_mask"]])
+        obs, reward, terminated, truncated, info = env.step(actions)
+        running = ~(terminated | truncated)
+        # Every observation is the learner's, and the opponents leave a consistent state behind
+        assert (env.current_player[running] == env.learner_seat).all()
+        assert ((state.money >= 0) | state.bankrupt).all()
+        assert not (state.mortgaged & (state.owner == -1)).any()
+        owner_mask = state.owner_mask.copy()
+        state.sync_owner_mask()
+        assert np.array_equal(state.owner_mask, owner_mask)
+    assert (state.owner != -1).any()
+
+
+def test_mcts_planner_decides_without_touching_the_game():
+    engine = MonopolyEngine(seed=0)
+    for _ in range(40):
+        engine.play_turn()
+    group = engine.group_masks.group_masks[0]
+    for idx in range(len(engine.state.owner)):
+        if int(group) >> idx & 1:
+            engine.state.transfer(idx, 0)
+            engine.state.mortgaged[idx] = False
+            engine.state.houses[idx] = 0
+    engine.state.money[0] = 2000
+    snapshot = engine.snapshot()
+    planner = MCTSPlanner(node_budget=4, num_playouts=8, horizon=5, seed=0)
+
+    props = [engine.board.property_order[idx] for idx in engine.buildable_properties(0)]
+    choice = planner.choose_build_property(props, {"game": engine, "player": 0})
+    assert 0 <= choice < len(props)
+    unowned = int(np.flatnonzero(engine.state.owner == -1)[0])
+    assert planner.search(engine, 0, BUY, unowned) in (False, True)
+    assert engine.snapshot() == snapshot
+
+    # When the search stops, the heuristic choice is used rather than the first candidate
+    planner.search = lambda *args, **kwargs: None
+    heuristic = AgentPolicy().choose_build_property(props, {"self_houses": engine.state.houses})
+    assert planner.choose_build_property(props, {"game": engine, "player": 0}) == heuristic
+
+
+def test_valuation_tables_follow_rents_and_landing_frequencies():
+    board = get_board()
+    valuation, rents = board.valuation, RentTable(board)
+    streets = rents.is_street
+    finite = np.isfinite(valuation.payback)
+    assert finite[streets].all() and finite[:, 0].all()
+    assert np.allclose(valuation.payback[streets] * valuation.street_income[streets, :, 1],
+                       valuation.investment[streets])
+    assert np.allclose(valuation.payback[~streets, 0] * valuation.base_income[~streets], valuation.price[~streets])
+    assert not finite[~streets, 1:].any()
+    assert (valuation.house_roi[~streets] == 0).all() and (valuation.house_roi[:, -1] == 0).all()
+    assert np.allclose(valuation.house_roi[streets, 0] * valuation.house_cost[streets],
+                       valuation.street_income[streets, 1, 1] - valuation.street_income[streets, 0, 1])
+
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        owner = rng.choice([-1, 0, 1, 2, 3], len(board.property_order), p=[.2, .5, .1, .1, .1])
+        houses = np.where(streets & (owner != -1), rng.integers(0, 6, len(owner)), 0)
+        mortgaged = (owner != -1) & (rng.random(len(owner)) < .2)
+        expected = [0.0 if mortgaged[idx] else
+                    rents.rent_one(owner.tolist(), idx, int(houses[idx]), EXPECTED_DICE) * valuation.frequency[idx]
+                    for idx in range(len(owner))]
+        assert np.allclose(valuation.income(owner, houses, mortgaged), expected)
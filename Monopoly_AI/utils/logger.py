@@ -0,0 +1,261 @@
+from enum import IntEnum
+from typing import Any, Callable, List, Optional, Sequence
+import numpy as np
+
+# Log levels
+SILENT = 0   # Nothing is recorded; `enabled` and `verbose` stay False so callers skip the logging calls
+EVENTS = 1   # Typed events are recorded in the ring buffer
+VERBOSE = 2  # Events are also rendered as text and sent to the sink, along with free-form messages
+
+# Default number of events kept by the ring buffer
+CAPACITY = 1 << 16
+
+
+class EventKind(IntEnum):
+    """Types of game events. The meaning of `a`/`b` of each kind is given in `EVENT_DTYPE`."""
+    ROLL = 0
+    MOVE = 1
+    BUY = 2
+    RENT = 3
+    TAX = 4
+    CARD = 5
+    JAIL = 6
+    BANKRUPT = 7
+
+
+class JailEvent(IntEnum):
+    """Value of `a` for `EventKind.JAIL` events."""
+    SENT = 0        # Sent to jail
+    PAID = 1        # Paid the fine to leave
+    DOUBLES = 2     # Rolled doubles and left
+    MAX_TURNS = 3   # Released after the last failed attempt
+    STAYED = 4      # Failed attempt `b`
+
+
+# Chance and community chest, value of `b` for `EventKind.CARD` events
+CHANCE = 0
+COMMUNITY_CHEST = 1
+
+# One record of the ring buffer:
+#   ROLL      a = first die, b = second die
+#   MOVE      a = square left, b = square reached
+#   BUY       a = property index, b = price paid
+#   RENT      a = property index, b = amount, other = owner
+#   TAX       a = square, b = amount
+#   CARD      a = card index in its deck, b = deck (CHANCE / COMMUNITY_CHEST)
+#   JAIL      a = `JailEvent`, b = failed attempts
+#   BANKRUPT  a = amount owed and left unpaid, other = creditor (-1 for the bank)
+EVENT_DTYPE = np.dtype([
+    ("game", np.int32),
+    ("turn", np.int32),
+    ("kind", np.int8),
+    ("player", np.int8),
+    ("other", np.int8),
+    ("a", np.int32),
+    ("b", np.int32),
+])
+
+
+class EventRenderer:
+    """Turns event records into the sentences shown to human players."""
+
+    def __init__(self, board: Any, player_names: Optional[Sequence[str]] = None):
+        """
+        Args:
+            board (Board): Board providing the square names and the property order.
+            player_names (Optional[Sequence[str]]): Name of each seat; "Player i" when None.
+        """
+        self.squares = [case["name"] for case in board.board]
+        self.properties = list(board.property_order)
+        self.player_names = list(player_names) if player_names is not None else None
+
+    def player(self, idx: int) -> str:
+        """Name of a seat."""
+        if idx < 0:
+            return "the bank"
+        if self.player_names is None:
+            return f"Player {idx + 1}"
+        return self.player_names[idx]
+
+    def __call__(self, event: np.void) -> str:
+        """
+        Renders one event.
+
+        Args:
+            event (np.void): Record of `EVENT_DTYPE`.
+
+        Returns:
+            str: Human-readable description of the event.
+        """
+        kind, a, b = int(event["kind"]), int(event["a"]), int(event["b"])
+        name = self.player(int(event["player"]))
+        if kind == EventKind.ROLL:
+            return f"{name} rolled {a} and {b} ({a + b})."
+        if kind == EventKind.MOVE:
+            return f"{name} moves to '{self.squares[b]}'."
+        if kind == EventKind.BUY:
+            return f"{name} now owns {self.properties[a]} (paid {b}€)."
+        if kind == EventKind.RENT:
+            return f"{name} pays {b}€ rent to {self.player(int(event['other']))} for {self.properties[a]}."
+        if kind == EventKind.TAX:
+            return f"{name} pays {b}€ in taxes ({self.squares[a]})."
+        if kind == EventKind.CARD:
+            deck = "chance" if b == CHANCE else "community chest"
+            return f"{name} draws a {deck} card."
+        if kind == EventKind.JAIL:
+            if a == JailEvent.SENT:
+                return f"{name} is sent to jail!"
+            if a == JailEvent.PAID:
+                return f"{name} pays the fine and leaves jail."
+            if a == JailEvent.DOUBLES:
+                return f"{name} rolled doubles and is released from jail!"
+            if a == JailEvent.MAX_TURNS:
+                return f"{name} didn't roll doubles in {b} attempts and is released from jail."
+            return f"{name} didn't roll doubles and stays in jail (attempt {b})."
+        if kind == EventKind.BANKRUPT:
+            creditor = int(event["other"])
+            if creditor < 0:
+                return f"{name} is bankrupt! Their properties are returned to the market."
+            return f"{name} is bankrupt! Their assets are transferred to {self.player(creditor)}."
+        return f"{name}: event {kind} ({a}, {b})"
+
+
+class EventLog:
+    """
+    Structured event sink of a game.
+
+    Typed events are written into a preallocated ring buffer of `EVENT_DTYPE` records that keeps the last
+    `capacity` events. At the `VERBOSE` level each event is also rendered and passed to `sink` (e.g. `print`
+    for the interactive game), as are the free-form `message`s.
+
+    The `enabled` and `verbose` flags tell whether the current game is being recorded / rendered. Hot loops
+    check `enabled` before building an event, so a `SILENT` log costs a single attribute test. With
+    `sample_every=N`, only one game in N is recorded (in full); the others behave as `SILENT`.
+    """
+
+    def __init__(self, level: int = SILENT, capacity: int = CAPACITY, sample_every: int = 1,
+                 sink: Optional[Callable[[str], Any]] = None,
+                 renderer: Optional[Callable[[np.void], str]] = None):
+        """
+        Args:
+            level (int): `SILENT`, `EVENTS` or `VERBOSE`.
+            capacity (int): Number of events kept by the ring buffer.
+            sample_every (int): Record one game in `sample_every` (see `start_game`).
+            sink (Optional[Callable[[str], Any]]): Receives the rendered lines at the `VERBOSE` level; `print`
+                                                   when None.
+            renderer (Optional[Callable[[np.void], str]]): Renders an event record, e.g. an `EventRenderer`.
+        """
+        self.capacity = capacity
+        self.sample_every = max(1, sample_every)
+        self.sink = sink if sink is not None else print
+        self.renderer = renderer
+        self.game = 0
+        self.turn = 0
+        self._cursor = 0
+        self._count = 0
+        self._buffer = np.zeros(0, dtype=EVENT_DTYPE)
+        self.set_level(level)
+
+    def set_level(self, level: int) -> None:
+        """Changes the level; the ring buffer is only allocated once events are recorded."""
+        self.level = level
+        if level >= EVENTS and len(self._buffer) == 0:
+            self._buffer = np.zeros(self.capacity, dtype=EVENT_DTYPE)
+        self._update_flags()
+
+    def _update_flags(self) -> None:
+        sampled = self.game % self.sample_every == 0
+        self.enabled = self.level >= EVENTS and sampled
+        self.verbose = self.level >= VERBOSE and sampled
+
+    def start_game(self) -> bool:
+        """
+        Starts a new game and decides whether it is recorded.
+
+        Returns:
+            bool: Whether the events of this game are recorded.
+        """
+        self.game += 1
+        self.turn = 0
+        self._update_flags()
+        return self.enabled
+
+    def emit(self, kind: int, player: int, a: int = 0, b: int = 0, other: int = -1) -> None:
+        """
+        Records an event (see `EVENT_DTYPE` for the meaning of the fields of each kind).
+
+        Args:
+            kind (int): `EventKind` of the event.
+            player (int): Seat of the acting player.
+            a (int): First value.
+            b (int): Second value.
+            other (int): Other player involved, -1 if none.
+        """
+        if not self.enabled:
+            return
+        index = self._cursor
+        self._buffer[index] = (self.game, self.turn, kind, player, other, a, b)
+        self._cursor = index + 1 if index + 1 < self.capacity else 0
+        self._count += 1
+        if self.verbose and self.renderer is not None:
+            self.sink(self.renderer(self._buffer[index]))
+
+    def roll(self, player: int, die1: int, die2: int) -> None:
+        self.emit(EventKind.ROLL, player, die1, die2)
+
+    def move(self, player: int, start: int, end: int) -> None:
+        self.emit(EventKind.MOVE, player, start, end)
+
+    def buy(self, player: int, property_idx: int, price: int) -> None:
+        self.emit(EventKind.BUY, player, property_idx, price)
+
+    def rent(self, player: int, owner: int, property_idx: int, amount: int) -> None:
+        self.emit(EventKind.RENT, player, property_idx, amount, owner)
+
+    def tax(self, player: int, square: int, amount: int) -> None:
+        self.emit(EventKind.TAX, player, square, amount)
+
+    def card(self, player: int, deck: int, card_idx: int) -> None:
+        self.emit(EventKind.CARD, player, card_idx, deck)
+
+    def jail(self, player: int, event: int, attempts: int = 0) -> None:
+        self.emit(EventKind.JAIL, player, event, attempts)
+
+    def bankrupt(self, player: int, creditor: Optional[int] = None, amount: int = 0) -> None:
+        self.emit(EventKind.BANKRUPT, player, amount, 0, -1 if creditor is None else creditor)
+
+    def message(self, text: str, *args: Any) -> None:
+        """
+        Sends a free-form line to the sink at the `VERBOSE` level. It is not recorded.
+
+        Args:
+            text (str): Line, or a `str.format` template formatted with `args` only when it is shown.
+            *args: Values of the template.
+        """
+        if self.verbose:
+            self.sink(text.format(*args) if args else text)
+
+    def events(self) -> np.ndarray:
+        """
+        Returns the recorded events, oldest first.
+
+        Returns:
+            np.ndarray: Copy of the last `min(count, capacity)` records.
+        """
+        if self._count <= self.capacity:
+            return self._buffer[:self._count].copy()
+        return np.concatenate((self._buffer[self._cursor:], self._buffer[:self._cursor]))
+
+    def render(self, events: Optional[np.ndarray] = None) -> List[str]:
+        """Renders recorded events (all of them when None) with the renderer."""
+        events = self.events() if events is None else events
+        render = self.renderer if self.renderer is not None else repr
+        return [render(event) for event in events]
+
+    def clear(self) -> None:
+        """Forgets the recorded events."""
+        self._cursor = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)